@@ -0,0 +1,166 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RevisionCache:
+    """
+    A least recently used cache of values derived from some revision of an object, keyed
+    by (object id, revision), that holds at most max_bytes worth of values.
+
+    Since the revision is part of the key, a value for an old revision is never served
+    once the revision has changed, and invalidating only frees the memory. Cached values
+    are shared between threads, so they must not be modified.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        :param max_bytes: The most bytes of values to hold, as measured by _size.
+        """
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, object_id, revision):
+        """Give the cached value, or None if it is not cached."""
+        key = (object_id, revision)
+
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            self._entries.move_to_end(key)
+
+            return self._entries[key][0]
+
+    def put(self, object_id, revision, value):
+        key = (object_id, revision)
+        size = self._size(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+
+            # A value larger than the whole cache would only evict everything else.
+            if size > self._max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+
+            while self._total_bytes > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def invalidate(self, object_id):
+        """Drop the value of every cached revision of the object with :param object_id."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == object_id]:
+                self._total_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def _size(self, value):
+        return len(value)
+
+
+class ProfileCache(RevisionCache):
+    """
+    Decoded StyleProfiles, keyed by (student id, profile revision). Profiles are
+    measured with their nbytes attribute.
+    """
+
+    def _size(self, profile):
+        return profile.nbytes
+
+
+class ReportCache(RevisionCache):
+    """
+    Rendered detailed reports as the bytes of their docx files, keyed by (submission id,
+    profile revision).
+    """
+
+
+class JWKSCache:
+    """
+    The public keys of a JSON Web Key Set, parsed and keyed by their kid. The set is
+    fetched again once it is older than ttl seconds, and when a key that is not in it is
+    asked for, since that is how a rotated key first shows up.
+    """
+
+    def __init__(self, url, ttl=600, min_refresh_interval=30, timeout=5):
+        """
+        :param url: The url of the JSON Web Key Set.
+        :param ttl: The most seconds to keep using a fetched set for.
+        :param min_refresh_interval: The fewest seconds between fetches for unknown
+        kids, so that tokens with made up kids cannot make every request fetch the set.
+        :param timeout: The longest time in seconds to wait for the set.
+        """
+        self._url = url
+        self._ttl = ttl
+        self._min_refresh_interval = min_refresh_interval
+        self._timeout = timeout
+        self._keys = {}
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    def get(self, kid):
+        """Give the public key with :param kid, or None if the set does not have it."""
+        # The lock is held while fetching, so that threads that find the set stale at
+        # the same time wait for a single fetch rather than each making their own.
+        with self._lock:
+            age = None if self._fetched_at is None else time.monotonic() - self._fetched_at
+
+            if age is None or age >= self._ttl:
+                self._refresh()
+            elif kid not in self._keys and age >= self._min_refresh_interval:
+                self._refresh()
+
+            return self._keys.get(kid)
+
+    def clear(self):
+        with self._lock:
+            self._keys = {}
+            self._fetched_at = None
+
+    def _refresh(self):
+        try:
+            response = requests.get(self._url, timeout=self._timeout)
+            response.raise_for_status()
+            jwks = response.json()
+        except (requests.RequestException, ValueError):
+            if not self._keys:
+                raise
+
+            # The keys that were fetched last are still the best there is, and the set
+            # is fetched again after min_refresh_interval rather than on every call.
+            logger.warning(f"Fetching the key set from {self._url} failed.", exc_info=True)
+            self._fetched_at = time.monotonic() - self._ttl + self._min_refresh_interval
+            return
+
+        self._keys = {
+            jwk['kid']: jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
+            for jwk in jwks['keys'] if jwk.get('kty') == 'RSA' and 'kid' in jwk
+        }
+        self._fetched_at = time.monotonic()
+
+
+profile_cache = ProfileCache(settings.PROFILE_CACHE_BYTES)
+report_cache = ReportCache(settings.REPORT_CACHE_BYTES)
+jwks_cache = JWKSCache(f"{settings.AUTH0_ISSUER}.well-known/jwks.json", ttl=settings.JWKS_CACHE_SECONDS)
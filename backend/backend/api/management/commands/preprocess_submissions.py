@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from backend.api.models.classroom import Submission
+from backend.api.processing import preprocess_submission, TRANSIENT_ERRORS
+
+
+class Command(BaseCommand):
+    help = (
+        "Preprocess the submissions that are still processing, such as those that were "
+        "waiting when the server stopped. Submissions that a running server is working on "
+        "are skipped until their claims expire."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help="Keep preprocessing the submissions that are still processing every INTERVAL "
+                 "seconds, so that those left behind by a worker that stopped are preprocessed "
+                 "once their claims expire.")
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        while True:
+            try:
+                preprocessed = self.preprocess_unfinished()
+            except TRANSIENT_ERRORS as error:
+                if interval is None:
+                    raise
+                self.stderr.write(f"Finding unfinished submissions failed: {error!r}")
+            else:
+                self.stdout.write(f"Preprocessed {preprocessed} submissions.")
+
+            if interval is None:
+                return
+
+            # Note: A connection held between rounds may be closed by the database.
+            connection.close()
+            time.sleep(interval)
+
+    def preprocess_unfinished(self):
+        unfinished = Submission.objects.filter(status=Submission.PROCESSING).values_list('id', flat=True)
+        preprocessed = 0
+
+        for submission_id in list(unfinished):
+            try:
+                preprocessed += preprocess_submission(submission_id)
+            except Exception as error:
+                self.stderr.write(f"Preprocessing submission {submission_id} failed: {error!r}")
+
+        return preprocessed
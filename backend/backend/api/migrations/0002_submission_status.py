@@ -0,0 +1,29 @@
+from django.db import migrations, models
+import backend.api.models.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        # Submissions saved before this migration were preprocessed when they were
+        # saved, so they start out ready.
+        migrations.AddField(
+            model_name='submission',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='processing', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='preprocessed_text',
+            field=backend.api.models.fields.NBField(null=True),
+        ),
+    ]
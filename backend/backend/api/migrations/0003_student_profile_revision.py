@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_submission_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='profile_revision',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_student_profile_revision'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredReport',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile_revision', models.PositiveIntegerField()),
+                ('authorship_probability', models.FloatField()),
+                ('flag', models.BooleanField()),
+                ('sentence_flags', models.JSONField()),
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='report', to='api.submission')),
+            ],
+        ),
+    ]
@@ -6,5 +6,5 @@ from django.contrib.auth.models import AbstractUser
 
 
 from backend.api.models.user import User, Instructor, Student
-from backend.api.models.classroom import Classroom, Assignment, Submission
+from backend.api.models.classroom import Classroom, Assignment, Submission, StoredReport
 from backend.api.models.dummy import Dummy, AfterDummy
@@ -1,11 +1,18 @@
-from django.db import models
+from functools import partial
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.db import models, transaction
 from docx import Document
 
 from backend.api.models.user import Instructor, Student
 from backend.api.models.essay import Essay
 from backend.api.models.fields import NBField
-from backend.api.utils import make_docx
-from notebooks import StyleProfile, PreprocessedText, TextProcessor
+from backend.api import processing
+from backend.api.cache import report_cache
+from notebooks import report_many
+from notebooks.reconstruction import WordReconstructable, DocumentText, PARAGRAPH_SEPARATOR, \
+    annotate_paragraphs
 from io import BytesIO
 
 
@@ -37,45 +44,219 @@ class Submission(models.Model):
     file = models.FileField()
     title = models.CharField(max_length=50)
 
-    # TODO: Override save so that preprocessed_text is automatically generated from
-    #       docx_file.
-    docx_file = models.FileField()
-    preprocessed_text = NBField()
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [(PROCESSING, "Processing"), (READY, "Ready"), (FAILED, "Failed")]
 
-    processor = TextProcessor()
+    docx_file = models.FileField()
+    # preprocessed_text is generated from docx_file by a background worker after the
+    # submission is saved, and is null until status is ready.
+    preprocessed_text = NBField(null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PROCESSING)
+    # When a worker last claimed the submission for preprocessing, or null when no
+    # worker holds a claim on it, and how many times it has been claimed.
+    claimed_at = models.DateTimeField(null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
 
     def save(self, *args, **kwargs):
-        document = Document(self.docx_file)
-        self.preprocessed_text = self.processor(document_text(document))
+        adding = self._state.adding
 
         super(Submission, self).save(*args, **kwargs)
 
+        # The worker has to wait for the commit, otherwise it may not see the row yet.
+        if adding and self.status == self.PROCESSING:
+            transaction.on_commit(partial(processing.enqueue_submission, self.id))
+
+    def preprocess(self, processor):
+        """Generate preprocessed_text from docx_file with :param processor."""
+        # The sentences are kept from crossing paragraphs, and their offsets in the text
+        # tie each of them to its paragraphs for the detailed report.
+        text = DocumentText(Document(self.docx_file))
+        self.preprocessed_text = processor(text.text, boundaries=text.paragraph_starts)
+        self.status = self.READY
+
+        self.save(update_fields=["preprocessed_text", "status"])
+
+    @property
+    def is_ready(self):
+        return self.status == self.READY
+
     def contrast_report(self):
         """Generate the contrast report for this submission."""
-        style_profile = self.student.profile
-
-        # Score this submission based on the style profile.
-        authorship_probability = style_profile.score(self.preprocessed_text)
-        flag = style_profile.flag(self.preprocessed_text)
+        report = self.stored_report()
 
-        return {'authorship_probability': authorship_probability, 'flag': flag}
+        return {'authorship_probability': report.authorship_probability, 'flag': report.flag}
 
     def detailed_report(self):
-        """Generate the contrast report for this submission."""
-        style_profile = self.student.profile
+        """
+        Generate the detailed report for this submission, which is the submitted
+        document with the flagged sentences highlighted in its own paragraphs.
+        """
+        report = self.stored_report()
+
+        reconstructable = WordReconstructable(Document(self.docx_file))
+        starts = self.preprocessed_text.sentence_starts
+
+        if starts is not None:
+            annotated_paragraphs = annotate_paragraphs(
+                reconstructable.paragraphs,
+                self.preprocessed_text.sentences,
+                report.sentence_flags,
+                separator=PARAGRAPH_SEPARATOR,
+                starts=starts,
+            )
+        else:
+            # Texts preprocessed before sentence offsets were kept were split from the
+            # paragraphs joined with nothing in between, and their sentences are found
+            # in that text instead.
+            annotated_paragraphs = annotate_paragraphs(
+                reconstructable.paragraphs,
+                self.preprocessed_text.sentences,
+                report.sentence_flags,
+            )
+        reconstructable.highlight(annotated_paragraphs)
+
+        return reconstructable.document
+
+    def detailed_report_file(self):
+        """
+        Give the detailed report rendered as an open docx file, positioned at its start.
+        Reports are cached by the revision of the student's profile they were made for,
+        so they are only rendered again once the profile changes. Small reports are
+        rendered in memory and larger ones are spooled to a temporary file.
+        """
+        cached = report_cache.get(self.id, self.student.profile_revision)
+        if cached is not None:
+            return BytesIO(cached)
+
+        report_file = SpooledTemporaryFile(max_size=settings.REPORT_SPOOL_BYTES)
+        self.detailed_report().save(report_file)
+
+        # Reports that still fit in memory are cheap to keep. They are cached by the
+        # revision they were made for, which is newer than the one checked above if the
+        # profile was fed in the meantime.
+        if report_file.tell() <= settings.REPORT_SPOOL_BYTES:
+            report_file.seek(0)
+            report_cache.put(self.id, self.report.profile_revision, report_file.read())
+
+        report_file.seek(0)
+
+        return report_file
+
+    def stored_report(self):
+        """
+        Give the StoredReport for this submission, which is only computed again when the
+        student's profile has changed since it was stored.
+        """
+        revision = self.student.profile_revision
+
+        try:
+            report = self.report
+            if report.profile_revision == revision:
+                return report
+        except StoredReport.DoesNotExist:
+            pass
+
+        # Score this submission based on the style profile, evaluating it only once for
+        # every part of the report.
+        style_profile = self.student.get_profile()
+        computed = style_profile.report(self.preprocessed_text)
 
-        # Score this submission based on the style profile.
-        detailed = style_profile.detailed(self.preprocessed_text)
-        return make_docx(*detailed)
+        # get_profile moves the student to the revision of the profile it loaded, which
+        # may be newer than the one the report was checked against.
+        report, _ = StoredReport.objects.update_or_create(submission=self, defaults={
+            'profile_revision': self.student.profile_revision,
+            'authorship_probability': computed['score'],
+            'flag': computed['flag'],
+            'sentence_flags': computed['sentence_flags'],
+        })
+        self.report = report
+
+        return report
+
+    @classmethod
+    def stored_reports(cls, submissions):
+        """
+        Give the StoredReport of each ready submission in :param submissions by its id,
+        like stored_report would, leaving out submissions by students whose profiles
+        have not been fed yet. Reports that are out of date are computed together in
+        one batch, and saved with a query for the new ones and one for the updated ones.
+
+        The submissions should be fetched with select_related('student', 'report'), and
+        may defer 'student__profile' and 'preprocessed_text' since neither is used.
+        """
+        submissions = [submission for submission in submissions if submission.is_ready]
+        reports = {}
+        stale = []
+
+        for submission in submissions:
+            report = getattr(submission, 'report', None)
+
+            if report is not None and report.profile_revision == submission.student.profile_revision:
+                reports[submission.id] = report
+            else:
+                stale.append(submission)
+
+        if not stale:
+            return reports
+
+        profiles = Student.get_profiles([submission.student for submission in stale])
+
+        # Students who have not had an essay accepted yet have nothing to be scored
+        # against, so their submissions are left without a report.
+        scored = [(submission, profile) for submission, profile in zip(stale, profiles) if profile.is_ready]
+
+        if not scored:
+            return reports
+
+        stale = [submission for submission, _ in scored]
+        profiles = [profile for _, profile in scored]
+
+        texts = dict(cls.objects.filter(id__in=[submission.id for submission in stale]).values_list(
+            'id', 'preprocessed_text'))
+
+        computed = report_many(profiles, [texts[submission.id] for submission in stale])
+
+        new_reports = []
+        updated_reports = []
+
+        for submission, values in zip(stale, computed):
+            report = getattr(submission, 'report', None)
+
+            if report is None:
+                report = StoredReport(submission=submission)
+                new_reports.append(report)
+            else:
+                updated_reports.append(report)
+
+            report.profile_revision = submission.student.profile_revision
+            report.authorship_probability = values['score']
+            report.flag = values['flag']
+            report.sentence_flags = values['sentence_flags']
+
+            submission.report = report
+            reports[submission.id] = report
+
+        with transaction.atomic():
+            # Another request may have stored one of the reports in the meantime, which
+            # is as good as this one.
+            StoredReport.objects.bulk_create(new_reports, ignore_conflicts=True)
+            StoredReport.objects.bulk_update(
+                updated_reports, ['profile_revision', 'authorship_probability', 'flag', 'sentence_flags'])
+
+        return reports
 
     def preprocessed(self):
         return self.preprocessed_text
 
 
-def document_text(document):
-    text = ""
-
-    for paragraph in document.paragraphs:
-        text += paragraph.text
+class StoredReport(models.Model):
+    """The contrast report for a submission, as of a revision of the student's profile."""
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, related_name="report")
 
-    return text
+    profile_revision = models.PositiveIntegerField()
+    authorship_probability = models.FloatField()
+    flag = models.BooleanField()
+    sentence_flags = models.JSONField()
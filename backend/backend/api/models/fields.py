@@ -1,7 +1,7 @@
 from django.db import models
 from io import BytesIO
 
-from notebooks import PreprocessedText, StyleProfile
+from notebooks import PreprocessedText, StyleProfile, serialization
 
 
 # TODO: Refactor classes from the notebooks library so that they implement a saveable
@@ -11,20 +11,23 @@ class NBField(models.BinaryField):
         if value is None:
             return value
 
-        # The bytes to save the object with are appended with either 0 or 1, based on
-        # whether we are saving a PreprocessedText object or a StyleProfile object.
-        if value[0] == b'\x00':
-            bytes_io = BytesIO(value[1:])
-            return PreprocessedText(bytes_io)
-
-        if value[0] == b'\x01':
-            bytes_io = BytesIO(value[1:])
-            return StyleProfile(bytes_io)
+        return self.to_python(value)
 
     def to_python(self, value):
         if isinstance(value, PreprocessedText) or isinstance(value, StyleProfile) or value is None:
             return value
 
+        # Objects are saved in the notebooks serialization format, which records what
+        # kind of object was saved. The arrays in the object are read straight from
+        # value without copying it.
+        if serialization.is_serialized(value):
+            if serialization.kind_of(value) == "PreprocessedText":
+                return PreprocessedText(value)
+
+            return StyleProfile(value)
+
+        # Objects saved before were pickled, and prefixed with either 0 or 1, based on
+        # whether we are saving a PreprocessedText object or a StyleProfile object.
         if value[0] == 0:
             bytes_io = BytesIO(value[1:])
             return PreprocessedText(bytes_io)
@@ -34,10 +37,7 @@ class NBField(models.BinaryField):
             return StyleProfile(bytes_io)
 
     def get_prep_value(self, value):
-        binary = value.binary.getvalue()
-
-        if isinstance(value, PreprocessedText):
-            return b"\x00" + binary
+        if value is None:
+            return value
 
-        if isinstance(value, StyleProfile):
-            return b"\x01" + binary
+        return value.binary.getvalue()
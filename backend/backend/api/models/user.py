@@ -1,7 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.files import File
-from django.db import models
+from django.db import models, transaction
 
+from backend.api.cache import profile_cache
 from backend.api.models.fields import NBField
 from notebooks import StyleProfile
 
@@ -57,11 +58,79 @@ class Instructor(models.Model):
 class Student(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
 
+    # Decoding the profile is expensive, so querysets that only need it through
+    # get_profile should defer it.
     profile = NBField()
+    # Incremented whenever the profile changes, so that cached copies of the previous
+    # profile are not used.
+    profile_revision = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.user.username
 
+    def get_profile(self):
+        """
+        Give the student's profile, from the process-wide cache if it has been decoded
+        before. The profile is shared with other requests and must not be modified, use
+        feed_profile instead.
+        """
+        profile = profile_cache.get(self.id, self.profile_revision)
+
+        if profile is None:
+            if 'profile' in self.get_deferred_fields():
+                # The revision is read along with the profile, since the profile may have
+                # been fed since this student was loaded, and caching it under the older
+                # revision would serve it as that revision from then on.
+                self.profile_revision, self.profile = Student.objects.values_list(
+                    'profile_revision', 'profile').get(id=self.id)
+
+            profile = self.profile
+            profile_cache.put(self.id, self.profile_revision, profile)
+
+        return profile
+
+    @classmethod
+    def get_profiles(cls, students):
+        """
+        Give the profile of each of :param students like get_profile would, but load all
+        of the profiles that are not cached with a single query. The revision of each
+        student is updated to that of the profile that was loaded for it.
+        """
+        profiles = {student.id: profile_cache.get(student.id, student.profile_revision) for student in students}
+
+        missing = [student for student in students if profiles[student.id] is None]
+
+        if missing:
+            revisions = {}
+            loaded = cls.objects.filter(id__in=[student.id for student in missing]).values_list(
+                'id', 'profile_revision', 'profile')
+
+            for student_id, revision, profile in loaded:
+                profile_cache.put(student_id, revision, profile)
+                profiles[student_id] = profile
+                revisions[student_id] = revision
+
+            for student in missing:
+                student.profile_revision = revisions[student.id]
+
+        return [profiles[student.id] for student in students]
+
+    def feed_profile(self, preprocessed_text):
+        """Feed :param preprocessed_text to the student's profile and save it."""
+        with transaction.atomic():
+            # The profile is decoded again rather than taken from the cache, since the
+            # cached one may be in use by other requests.
+            student = Student.objects.select_for_update().get(id=self.id)
+            student.profile.feed(preprocessed_text)
+            student.profile_revision += 1
+            student.save(update_fields=["profile", "profile_revision"])
+
+        self.profile = student.profile
+        self.profile_revision = student.profile_revision
+
+        profile_cache.invalidate(self.id)
+        profile_cache.put(self.id, self.profile_revision, self.profile)
+
 
 def post_user_create(instance, created, raw, **kwargs):
     if instance.user_type() == "student":
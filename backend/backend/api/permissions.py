@@ -38,8 +38,10 @@ class IsClassMember(BasePermission):
     def has_object_permission(self, request, view, obj):
         user = request.user
 
-        is_student = user.role == "student" and user.student in obj.students
-        is_instructor = user.role == "instructor" and user.instructor == obj.instructor
+        # The ids are compared through the classroom, which views load along with its
+        # instructor and students, so that checking takes no further queries.
+        is_student = user.role == "student" and any(student.user_id == user.id for student in obj.students.all())
+        is_instructor = user.role == "instructor" and obj.instructor.user_id == user.id
 
         return is_student or is_instructor
 
@@ -0,0 +1,157 @@
+"""
+Runs submission preprocessing on a pool of background threads, so that posting a
+submission only has to store the docx file.
+
+Submissions are queued through the database: a submission is created with the
+processing status, and the worker that preprocesses it marks it ready (or failed)
+when it is done. Workers claim a submission in the database before preprocessing it,
+so that no submission is preprocessed by two workers at once. Submissions that were
+still processing when the server stopped, or whose worker stopped, are preprocessed by
+the preprocess_submissions management command once their claims expire.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, InterfaceError, OperationalError
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor = None
+_text_processor = None
+
+# Errors that preprocessing the same submission again may not run into.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, OSError)
+
+
+def text_processor():
+    """
+    Give the TextProcessor shared by every worker. This is a client of the featurization
+    server when FEATURIZATION_SOCKET is set, so that web processes never load the
+    models themselves. Otherwise a local TextProcessor is loaded on first use.
+    """
+    global _text_processor
+
+    with _lock:
+        if _text_processor is None:
+            if settings.FEATURIZATION_SOCKET:
+                from notebooks.server import FeaturizationClient
+
+                # A server that hangs times out with an OSError, which is retried.
+                _text_processor = FeaturizationClient(
+                    settings.FEATURIZATION_SOCKET, timeout=settings.FEATURIZATION_TIMEOUT_SECONDS)
+            else:
+                from notebooks import TextProcessor
+
+                _text_processor = TextProcessor()
+
+        return _text_processor
+
+
+def enqueue_submission(submission_id):
+    """Preprocess the submission with :param submission_id on a background worker."""
+    return _get_executor().submit(_preprocess_submission, submission_id)
+
+
+def preprocess_submission(submission_id, processor=None):
+    """
+    Claim the submission with :param submission_id and preprocess it with
+    :param processor, or the shared text_processor if not given. Gives False without
+    doing anything if the submission is not processing or another worker has claimed
+    it, and True once it is ready.
+
+    Errors that may not happen again, like losing the connection to the database or
+    the featurization server, release the claim so that the submission can be tried
+    again, until it has been tried PREPROCESSING_ATTEMPTS times. Any other error marks
+    the submission as failed. The error is raised either way.
+    """
+    from backend.api.models.classroom import Submission
+
+    if not _claim(submission_id):
+        return False
+
+    try:
+        submission = Submission.objects.get(id=submission_id)
+        submission.preprocess(processor if processor is not None else text_processor())
+    except Submission.DoesNotExist:
+        return False
+    except TRANSIENT_ERRORS:
+        # The submission is out of attempts if it was claimed as many times as allowed.
+        Submission.objects.filter(id=submission_id, attempts__gte=settings.PREPROCESSING_ATTEMPTS).update(
+            status=Submission.FAILED)
+        Submission.objects.filter(id=submission_id).update(claimed_at=None)
+        raise
+    except Exception:
+        Submission.objects.filter(id=submission_id).update(status=Submission.FAILED, claimed_at=None)
+        raise
+
+    return True
+
+
+def _claim(submission_id):
+    """
+    Claim the submission with :param submission_id if it is processing and no other
+    worker, in this process or any other, holds a claim on it. Claims older than
+    PREPROCESSING_CLAIM_SECONDS are taken to be left behind by a worker that stopped.
+    """
+    from backend.api.models.classroom import Submission
+
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.PREPROCESSING_CLAIM_SECONDS)
+
+    # The update only changes the row if it is unclaimed when the database gets to it,
+    # so exactly one of the workers racing for a submission claims it.
+    claimed = Submission.objects.filter(
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=expired), id=submission_id, status=Submission.PROCESSING,
+    ).update(claimed_at=now, attempts=F('attempts') + 1)
+
+    return claimed == 1
+
+
+def _get_executor():
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            # Note: The default of one worker is deliberate when processing locally,
+            #       since every worker shares one spaCy pipeline. With a featurization
+            #       server, more workers let the server batch texts from several
+            #       submissions.
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PREPROCESSING_WORKERS,
+                thread_name_prefix="preprocessing",
+            )
+
+        return _executor
+
+
+def _preprocess_submission(submission_id):
+    from backend.api.models.classroom import Submission
+
+    try:
+        preprocess_submission(submission_id)
+    except TRANSIENT_ERRORS:
+        logger.warning(f"Preprocessing submission {submission_id} failed, it may be retried.", exc_info=True)
+
+        try:
+            retry = Submission.objects.filter(id=submission_id, status=Submission.PROCESSING).exists()
+        except TRANSIENT_ERRORS:
+            # Without the database there is no knowing, so the submission is left for
+            # the preprocess_submissions command once its claim expires.
+            retry = False
+
+        if retry:
+            timer = threading.Timer(settings.PREPROCESSING_RETRY_SECONDS, enqueue_submission, [submission_id])
+            timer.daemon = True
+            timer.start()
+    except Exception:
+        logger.exception(f"Preprocessing submission {submission_id} failed.")
+    finally:
+        # Each worker thread opens its own database connection, which Django only
+        # closes by itself at the end of a request.
+        connection.close()
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, HyperlinkedModelSerializer
 
@@ -15,6 +16,20 @@ class ClassroomSerializer(ModelSerializer):
         depth = 1
         read_only_fields = ["instructor", "students", "assignments"]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Load everything the serializer reads for the classrooms in :param queryset along
+        with them, so that listing classrooms takes the same few queries however many
+        there are.
+        """
+        # Students are loaded with their users for their names, and without their
+        # profiles, which are expensive to decode and not serialized.
+        students = Student.objects.select_related('user').defer('profile')
+
+        return queryset.select_related('instructor').prefetch_related(
+            Prefetch('students', queryset=students), 'assignments')
+
 
 class JoinedClassroomSerializer(ModelSerializer):
     students = serializers.PrimaryKeyRelatedField(many=True, read_only=False, queryset=Student.objects.all())
@@ -46,4 +61,27 @@ class AssignmentSerializer(serializers.ModelSerializer):
 class SubmissionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Submission
-        fields = ["docx_file", 'id', "title", 'assignment', 'student', 'date']
+        fields = ["docx_file", 'id', "title", 'assignment', 'student', 'date', 'status']
+        read_only_fields = ['status']
+
+
+class InstructorSubmissionSerializer(SubmissionSerializer):
+    """
+    Serializer for submissions listed to instructors, with the authorship probability
+    and flag of each ready submission, which are null for submissions that have no
+    report. The StoredReports are given in the 'reports' context by submission id, so
+    that they can be computed for the whole list at once.
+    """
+    authorship_probability = serializers.SerializerMethodField()
+    flag = serializers.SerializerMethodField()
+
+    class Meta(SubmissionSerializer.Meta):
+        fields = SubmissionSerializer.Meta.fields + ['authorship_probability', 'flag']
+
+    def get_authorship_probability(self, submission):
+        report = self.context['reports'].get(submission.id)
+        return None if report is None else report.authorship_probability
+
+    def get_flag(self, submission):
+        report = self.context['reports'].get(submission.id)
+        return None if report is None else report.flag
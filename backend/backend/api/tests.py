@@ -1,3 +1,628 @@
-from django.test import TestCase
+import json
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import docx
+import jwt
+import numpy as np
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from backend.api import processing
+from backend.api.cache import JWKSCache, RevisionCache, ProfileCache, profile_cache, report_cache
+from backend.api.models import User, Student, Classroom, Assignment, Submission, StoredReport
+from notebooks import PreprocessedText
+
+
+def make_jwk(kid):
+    """Give a new RSA private key and the JSON Web Key of its public key."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=kid, use='sig', alg='RS256')
+
+    return private_key, jwk
+
+
+class JWKSServer(ThreadingHTTPServer):
+    """A local stand-in for the identity provider, which serves jwks and counts fetches."""
+
+    def __init__(self):
+        self.jwks = {'keys': []}
+        self.fetches = 0
+
+        super().__init__(('127.0.0.1', 0), JWKSHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/.well-known/jwks.json"
+
+
+class JWKSHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.fetches += 1
+        body = json.dumps(self.server.jwks).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class JWKSCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.server = JWKSServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.private_key, jwk = make_jwk('first')
+        self.server.jwks['keys'].append(jwk)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keys_should_be_fetched_once(self):
+        cache = JWKSCache(self.server.url)
+        token = jwt.encode({'sub': 'user'}, self.private_key, algorithm='RS256', headers={'kid': 'first'})
+
+        for _ in range(3):
+            payload = jwt.decode(token, cache.get('first'), algorithms=['RS256'])
+
+        self.assertEqual(payload, {'sub': 'user'})
+        self.assertEqual(self.server.fetches, 1)
+
+    def test_unknown_kid_should_fetch_the_rotated_keys(self):
+        cache = JWKSCache(self.server.url, min_refresh_interval=0)
+        cache.get('first')
+
+        _, jwk = make_jwk('second')
+        self.server.jwks['keys'].append(jwk)
+
+        self.assertIsNotNone(cache.get('second'))
+        self.assertEqual(self.server.fetches, 2)
+
+    def test_unknown_kids_should_not_fetch_within_the_refresh_interval(self):
+        cache = JWKSCache(self.server.url, min_refresh_interval=60)
+
+        for _ in range(3):
+            self.assertIsNone(cache.get('made up'))
+
+        self.assertEqual(self.server.fetches, 1)
+
+    def test_expired_keys_should_be_fetched_again(self):
+        cache = JWKSCache(self.server.url, ttl=0)
+
+        cache.get('first')
+        cache.get('first')
+
+        self.assertEqual(self.server.fetches, 2)
+
+    def test_stale_keys_should_be_kept_when_fetching_fails(self):
+        cache = JWKSCache(self.server.url, ttl=0)
+        cache.get('first')
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        with self.assertLogs('backend.api.cache', level='WARNING'):
+            self.assertIsNotNone(cache.get('first'))
+
+
+class QueryBudgetTests(APITestCase):
+    """
+    The number of queries each endpoint makes, which should not grow with the number of
+    classrooms, students, assignments or submissions it returns.
+    """
+
+    def setUp(self):
+        self.instructor_user = User.create('instructor', username='instructor')
+        self.student_users = [User.create('student', username=f'student{i}') for i in range(3)]
+
+        self.classroom = self.add_classroom('Classroom')
+        self.assignment = self.classroom.assignments.first()
+        self.submissions = [
+            Submission.objects.create(
+                assignment=self.assignment, student=user.student, date=timezone.now(), title='essay.docx',
+                status=Submission.READY)
+            for user in self.student_users
+        ]
+
+        # Reports that are up to date are served without scoring the submissions again.
+        for submission in self.submissions:
+            StoredReport.objects.create(
+                submission=submission, profile_revision=submission.student.profile_revision,
+                authorship_probability=0.5, flag=False, sentence_flags=[False])
+
+    def add_classroom(self, title):
+        classroom = Classroom.objects.create(instructor=self.instructor_user.instructor, title=title)
+        classroom.students.add(*[user.student for user in self.student_users])
+
+        for i in range(2):
+            Assignment.objects.create(classroom=classroom, title=f'Assignment {i}', description='',
+                                      due_date=timezone.now())
+
+        return classroom
+
+    def assert_queries(self, user, url, num):
+        # Each request authenticates a user without any of its relations loaded yet.
+        self.client.force_authenticate(User.objects.get(id=user.id))
+
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200, response.content)
+
+        return response
+
+    def test_classroom_list_should_not_query_each_classroom(self):
+        for i in range(3):
+            self.add_classroom(f'Classroom {i}')
+
+        # The classrooms, their students with their users, and their assignments.
+        response = self.assert_queries(self.instructor_user, '/instructor/classrooms', 3)
+
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(len(response.data[0]['students']), 3)
+        self.assertEqual(len(response.data[0]['assignments']), 2)
+
+    def test_classroom_should_be_a_single_fetch(self):
+        self.assert_queries(self.instructor_user, f'/instructor/classrooms/{self.classroom.id}', 3)
+
+    def test_students_should_be_listed_with_one_query(self):
+        url = f'/classrooms/{self.classroom.id}/students'
+
+        # The classroom, whether the user belongs to it, and its students.
+        self.assert_queries(self.instructor_user, url, 3)
+        self.assert_queries(self.student_users[0], url, 3)
+
+    def test_student_should_be_fetched_with_its_user(self):
+        student = self.student_users[1].student
+        url = f'/classrooms/{self.classroom.id}/students/{student.id}'
+
+        response = self.assert_queries(self.instructor_user, url, 3)
+
+        self.assertEqual(response.data['id'], student.id)
+
+    def test_instructor_assignments_should_be_a_single_query(self):
+        classroom_url = f'/instructor/classrooms/{self.classroom.id}/assignments'
+
+        response = self.assert_queries(self.instructor_user, classroom_url, 1)
+        self.assertEqual(len(response.data), 2)
+
+        self.assert_queries(self.instructor_user, f'{classroom_url}/{self.assignment.id}', 1)
+
+    def test_student_submissions_should_be_a_single_query(self):
+        submissions_url = f'/student/classrooms/{self.classroom.id}/assignments/{self.assignment.id}/submissions'
+        submission = self.submissions[0]
+
+        response = self.assert_queries(self.student_users[0], submissions_url, 1)
+        self.assertEqual([data['id'] for data in response.data], [submission.id])
+
+        self.assert_queries(self.student_users[0], f'{submissions_url}/{submission.id}', 1)
+
+    def test_instructor_submissions_should_be_a_single_query(self):
+        submissions_url = f'/instructor/classrooms/{self.classroom.id}/assignments/{self.assignment.id}/submissions'
+        submission = self.submissions[0]
+
+        response = self.assert_queries(self.instructor_user, submissions_url, 1)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data[0]['authorship_probability'], 0.5)
+
+        self.assert_queries(self.instructor_user, f'{submissions_url}/{submission.id}', 1)
+        self.assert_queries(self.instructor_user, f'{submissions_url}/{submission.id}/report', 1)
+
+    def test_other_instructors_should_not_find_the_submissions(self):
+        other_user = User.create('instructor', username='other')
+        self.client.force_authenticate(other_user)
+
+        url = (f'/instructor/classrooms/{self.classroom.id}/assignments/{self.assignment.id}/submissions/'
+               f'{self.submissions[0].id}')
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+def make_docx_file(*paragraphs):
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+
+    docx_bytes = BytesIO()
+    document.save(docx_bytes)
+
+    return SimpleUploadedFile('essay.docx', docx_bytes.getvalue())
+
+
+class StubProcessor:
+    """Gives each text one sentence with a single feature, or raises :param error."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.texts = []
+
+    def __call__(self, text, boundaries=None):
+        self.texts.append(text)
+
+        if self.error is not None:
+            raise self.error
+
+        return PreprocessedText(np.ones([1, 1]), [text], sentence_starts=[0])
+
+
+class ClassroomTestCase(APITestCase):
+    """Sets up an instructor's classroom with an assignment that students can submit to."""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media_root.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.instructor_user = User.create('instructor', username='instructor')
+        self.classroom = Classroom.objects.create(instructor=self.instructor_user.instructor, title='Classroom')
+        self.assignment = Assignment.objects.create(classroom=self.classroom, title='Assignment', description='',
+                                                    due_date=timezone.now())
+
+    def add_student(self, username):
+        user = User.create('student', username=username)
+        self.classroom.students.add(user.student)
+
+        return user.student
+
+    def submit(self, student, *paragraphs, status=Submission.PROCESSING):
+        # Submissions are not queued here, since the test transaction is never committed.
+        return Submission.objects.create(
+            assignment=self.assignment, student=student, date=timezone.now(), title='essay.docx',
+            docx_file=make_docx_file(*paragraphs), status=status)
+
+
+class ProcessingTests(ClassroomTestCase):
+    def setUp(self):
+        super().setUp()
+        self.submission = self.submit(self.add_student('student'), 'First paragraph.', 'Second one.')
+
+    def test_submission_should_only_be_claimed_once(self):
+        self.assertTrue(processing._claim(self.submission.id))
+        self.assertFalse(processing._claim(self.submission.id))
+
+        self.submission.refresh_from_db()
+        self.assertIsNotNone(self.submission.claimed_at)
+        self.assertEqual(self.submission.attempts, 1)
+
+    def test_expired_claims_should_be_claimed_again(self):
+        expired = timezone.now() - timedelta(seconds=2 * 600)
+        Submission.objects.filter(id=self.submission.id).update(claimed_at=expired)
+
+        with self.settings(PREPROCESSING_CLAIM_SECONDS=600):
+            self.assertTrue(processing._claim(self.submission.id))
+
+    def test_finished_submissions_should_not_be_claimed(self):
+        Submission.objects.filter(id=self.submission.id).update(status=Submission.READY)
+
+        self.assertFalse(processing._claim(self.submission.id))
+
+    def test_claimed_submission_should_be_preprocessed_once(self):
+        processor = StubProcessor()
+
+        self.assertTrue(processing.preprocess_submission(self.submission.id, processor))
+        self.assertFalse(processing.preprocess_submission(self.submission.id, processor))
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submission.READY)
+        self.assertEqual(processor.texts, ['First paragraph.\nSecond one.'])
+
+    @override_settings(PREPROCESSING_ATTEMPTS=2)
+    def test_transient_errors_should_be_retried_until_out_of_attempts(self):
+        processor = StubProcessor(error=ConnectionError('featurization server is down'))
+
+        with self.assertRaises(ConnectionError):
+            processing.preprocess_submission(self.submission.id, processor)
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submission.PROCESSING)
+        self.assertIsNone(self.submission.claimed_at)
+
+        with self.assertRaises(ConnectionError):
+            processing.preprocess_submission(self.submission.id, processor)
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submission.FAILED)
+
+    def test_other_errors_should_fail_the_submission(self):
+        with self.assertRaises(ValueError):
+            processing.preprocess_submission(self.submission.id, StubProcessor(error=ValueError('bad text')))
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submission.FAILED)
+
+    @mock.patch('backend.api.processing.connection')
+    @mock.patch('backend.api.processing.threading.Timer')
+    def test_worker_should_retry_transient_errors_later(self, timer, _):
+        processor = StubProcessor(error=ConnectionError('featurization server is down'))
+
+        with mock.patch('backend.api.processing.text_processor', return_value=processor), \
+                self.assertLogs('backend.api.processing', level='WARNING'):
+            processing._preprocess_submission(self.submission.id)
+
+        timer.assert_called_once_with(mock.ANY, processing.enqueue_submission, [self.submission.id])
+        timer.return_value.start.assert_called_once_with()
+
+    def test_starting_the_workers_should_not_touch_the_database(self):
+        with self.assertNumQueries(0):
+            processing._get_executor()
+
+    def test_command_should_preprocess_unclaimed_submissions(self):
+        claimed = self.submit(self.submission.student, 'Being preprocessed elsewhere.')
+        processing._claim(claimed.id)
+        processor = StubProcessor()
+
+        with mock.patch('backend.api.processing.text_processor', return_value=processor):
+            call_command('preprocess_submissions', stdout=StringIO())
+
+        self.assertEqual(processor.texts, ['First paragraph.\nSecond one.'])
+        self.assertEqual(Submission.objects.get(id=claimed.id).status, Submission.PROCESSING)
+
+
+    def test_command_should_keep_preprocessing_submissions_whose_claims_expire(self):
+        processing._claim(self.submission.id)
+        processor = StubProcessor()
+
+        def expire_claims(_):
+            if Submission.objects.filter(id=self.submission.id, status=Submission.READY).exists():
+                raise KeyboardInterrupt
+            expired = timezone.now() - timedelta(seconds=2 * 600)
+            Submission.objects.filter(id=self.submission.id).update(claimed_at=expired)
+
+        with mock.patch('backend.api.processing.text_processor', return_value=processor), \
+                mock.patch('backend.api.management.commands.preprocess_submissions.connection'), \
+                mock.patch('time.sleep', side_effect=expire_claims) as sleep, \
+                self.settings(PREPROCESSING_CLAIM_SECONDS=600), self.assertRaises(KeyboardInterrupt):
+            call_command('preprocess_submissions', interval=60, stdout=StringIO())
+
+        self.assertEqual(processor.texts, ['First paragraph.\nSecond one.'])
+        self.assertEqual(sleep.call_count, 2)
+
+    @override_settings(FEATURIZATION_SOCKET='/tmp/featurization.sock', FEATURIZATION_TIMEOUT_SECONDS=5)
+    def test_featurization_client_should_time_out(self):
+        from notebooks.server import FeaturizationClient
+
+        with mock.patch.object(processing, '_text_processor', None), \
+                mock.patch('notebooks.server.FeaturizationClient', wraps=FeaturizationClient) as client:
+            processing.text_processor()
+
+        client.assert_called_once_with('/tmp/featurization.sock', timeout=5)
+
+    def test_timeouts_should_be_retried(self):
+        with self.assertRaises(TimeoutError):
+            processing.preprocess_submission(self.submission.id, StubProcessor(error=TimeoutError('timed out')))
+
+        self.submission.refresh_from_db()
+        self.assertEqual(self.submission.status, Submission.PROCESSING)
+        self.assertIsNone(self.submission.claimed_at)
+
+
+class RevisionCacheTests(SimpleTestCase):
+    def test_least_recently_used_values_should_be_evicted(self):
+        cache = RevisionCache(max_bytes=6)
+        cache.put(1, 0, b'aa')
+        cache.put(2, 0, b'bb')
+        cache.put(3, 0, b'cc')
+
+        # Using the first value makes the second the least recently used.
+        self.assertEqual(cache.get(1, 0), b'aa')
+        cache.put(4, 0, b'dd')
+
+        self.assertIsNone(cache.get(2, 0))
+        self.assertEqual([cache.get(key, 0) for key in [1, 3, 4]], [b'aa', b'cc', b'dd'])
+        self.assertEqual(cache.total_bytes, 6)
+
+    def test_values_should_be_cached_by_revision(self):
+        cache = RevisionCache(max_bytes=10)
+        cache.put(1, 0, b'old')
+        cache.put(1, 1, b'new')
+
+        self.assertEqual(cache.get(1, 1), b'new')
+        self.assertIsNone(cache.get(1, 2))
+
+    def test_replacing_a_value_should_count_its_bytes_once(self):
+        cache = RevisionCache(max_bytes=10)
+        cache.put(1, 0, b'aaaa')
+        cache.put(1, 0, b'bb')
+
+        self.assertEqual(cache.total_bytes, 2)
+
+    def test_values_larger_than_the_cache_should_not_be_cached(self):
+        cache = RevisionCache(max_bytes=4)
+        cache.put(1, 0, b'aa')
+        cache.put(2, 0, b'aaaaa')
+
+        self.assertIsNone(cache.get(2, 0))
+        self.assertEqual(cache.get(1, 0), b'aa')
+
+    def test_invalidate_should_drop_every_revision_of_an_object(self):
+        cache = RevisionCache(max_bytes=10)
+        cache.put(1, 0, b'a')
+        cache.put(1, 1, b'b')
+        cache.put(2, 0, b'c')
+
+        cache.invalidate(1)
+
+        self.assertIsNone(cache.get(1, 0))
+        self.assertIsNone(cache.get(1, 1))
+        self.assertEqual(cache.get(2, 0), b'c')
+        self.assertEqual(cache.total_bytes, 1)
+
+    def test_profiles_should_be_measured_by_their_nbytes(self):
+        cache = ProfileCache(max_bytes=100)
+        cache.put(1, 0, mock.Mock(nbytes=60))
+        cache.put(2, 0, mock.Mock(nbytes=60))
+
+        self.assertIsNone(cache.get(1, 0))
+        self.assertEqual(cache.total_bytes, 60)
+
+
+class ProfileTests(TestCase):
+    def setUp(self):
+        profile_cache.clear()
+        self.addCleanup(profile_cache.clear)
+
+        self.student = User.create('student', username='student').student
+
+    def test_profile_fed_after_loading_should_be_cached_under_its_own_revision(self):
+        stale_student = Student.objects.defer('profile').get(id=self.student.id)
+
+        # Another request feeds the profile after this one loaded the student.
+        self.student.feed_profile(PreprocessedText(np.ones([4, 3])))
+        profile_cache.clear()
+
+        profile = stale_student.get_profile()
+
+        self.assertEqual(stale_student.profile_revision, 1)
+        self.assertIs(profile_cache.get(self.student.id, 1), profile)
+        self.assertIsNone(profile_cache.get(self.student.id, 0))
+
+
+class StoredReportTests(ClassroomTestCase):
+    def setUp(self):
+        super().setUp()
+        profile_cache.clear()
+        self.addCleanup(profile_cache.clear)
+
+        rng = np.random.default_rng(0)
+        self.student = self.add_student('student')
+        self.student.feed_profile(PreprocessedText(rng.normal(size=[20, 3])))
+
+        self.submission = self.submit(self.student, 'Essay.', status=Submission.READY)
+        self.submission.preprocessed_text = PreprocessedText(rng.normal(size=[4, 3]), ['Essay.'] * 4)
+        self.submission.save(update_fields=['preprocessed_text'])
+
+    def fetch_submission(self):
+        return Submission.objects.select_related('student', 'report').get(id=self.submission.id)
+
+    def test_report_should_be_stored_and_reused(self):
+        report = self.fetch_submission().stored_report()
+
+        self.assertEqual(report.profile_revision, 1)
+        self.assertEqual(len(report.sentence_flags), 4)
+
+        submission = self.fetch_submission()
+        with self.assertNumQueries(0):
+            self.assertEqual(submission.stored_report().id, report.id)
+
+    def test_report_should_be_computed_again_once_the_profile_changes(self):
+        self.fetch_submission().stored_report()
+        self.student.feed_profile(PreprocessedText(np.ones([5, 3])))
+
+        report = self.fetch_submission().stored_report()
+
+        self.assertEqual(report.profile_revision, 2)
+        self.assertEqual(StoredReport.objects.filter(submission=self.submission).count(), 1)
+
+
+class InstructorSubmissionsTests(ClassroomTestCase):
+    def setUp(self):
+        super().setUp()
+        profile_cache.clear()
+        self.addCleanup(profile_cache.clear)
+
+    def submit_text(self, student, data):
+        submission = self.submit(student, 'Essay.', status=Submission.READY)
+        submission.preprocessed_text = PreprocessedText(data, ['Essay.'] * len(data))
+        submission.save(update_fields=['preprocessed_text'])
+
+        return submission
+
+    def test_students_without_a_fed_profile_should_have_no_report(self):
+        rng = np.random.default_rng(0)
+        fed_student = self.add_student('fed')
+        fed_student.feed_profile(PreprocessedText(rng.normal(size=[20, 3])))
+        new_student = self.add_student('new')
+
+        fed_submission = self.submit_text(fed_student, rng.normal(size=[4, 3]))
+        new_submission = self.submit_text(new_student, rng.normal(size=[4, 3]))
+
+        self.client.force_authenticate(self.instructor_user)
+        response = self.client.get(
+            f'/instructor/classrooms/{self.classroom.id}/assignments/{self.assignment.id}/submissions')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        data = {submission['id']: submission for submission in response.data}
+        self.assertIsInstance(data[fed_submission.id]['authorship_probability'], float)
+        self.assertIsNone(data[new_submission.id]['authorship_probability'])
+        self.assertIsNone(data[new_submission.id]['flag'])
+        self.assertFalse(StoredReport.objects.filter(submission=new_submission).exists())
+
+
+class DetailedReportTests(ClassroomTestCase):
+    def setUp(self):
+        super().setUp()
+        profile_cache.clear()
+        report_cache.clear()
+        self.addCleanup(profile_cache.clear)
+        self.addCleanup(report_cache.clear)
+
+        self.student = self.add_student('student')
+        self.student.feed_profile(PreprocessedText(np.random.default_rng(0).normal(size=[20, 3])))
+
+        self.submission = self.submit(self.student, 'One. Two.', 'Three.', status=Submission.READY)
+        self.submission.preprocessed_text = PreprocessedText(
+            np.ones([3, 3]), ['One.', 'Two.', 'Three.'], sentence_starts=[0, 5, 10])
+        self.submission.save(update_fields=['preprocessed_text'])
+
+        # The report is stored with known flags, rather than whatever the profile gives.
+        self.fetch_submission().stored_report()
+        StoredReport.objects.filter(submission=self.submission).update(sentence_flags=[True, False, True])
+
+    def fetch_submission(self):
+        return Submission.objects.select_related('student', 'report').get(id=self.submission.id)
+
+    def test_flagged_sentences_should_be_highlighted_in_their_paragraphs(self):
+        document = docx.Document(self.fetch_submission().detailed_report_file())
+
+        runs = [[(run.text, run.font.highlight_color is not None) for run in paragraph.runs]
+                for paragraph in document.paragraphs]
+
+        self.assertEqual(runs, [[('One. ', True), ('Two.', False)], [('Three.', True)]])
+
+    def test_reports_should_be_rendered_again_only_once_the_profile_changes(self):
+        self.fetch_submission().detailed_report_file()
+
+        with mock.patch.object(Submission, 'detailed_report') as detailed_report:
+            self.fetch_submission().detailed_report_file()
+        detailed_report.assert_not_called()
+
+        self.student.feed_profile(PreprocessedText(np.ones([5, 3])))
+        self.fetch_submission().detailed_report_file()
+
+        self.assertIsNotNone(report_cache.get(self.submission.id, 2))
+
+    @override_settings(REPORT_SPOOL_BYTES=100)
+    def test_large_reports_should_be_spooled_and_not_cached(self):
+        report_file = self.fetch_submission().detailed_report_file()
+
+        self.assertEqual(len(docx.Document(report_file).paragraphs), 2)
+        self.assertIsNone(report_cache.get(self.submission.id, 1))
+        self.assertEqual(report_cache.total_bytes, 0)
+
+    def test_view_should_send_the_report_as_an_attachment(self):
+        self.client.force_authenticate(self.instructor_user)
+
+        response = self.client.get(
+            f'/instructor/classrooms/{self.classroom.id}/assignments/{self.assignment.id}/submissions/'
+            f'{self.submission.id}/detailed-report')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment; filename="detailed-report.docx"', response['Content-Disposition'])
+        document = docx.Document(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual([paragraph.text for paragraph in document.paragraphs], ['One. Two.', 'Three.'])
@@ -1,12 +1,8 @@
 from django.contrib.auth import authenticate
-import docx
-from docx.enum.text import WD_COLOR_INDEX
 from django.conf import settings
-
-import json
+from backend.api.cache import jwks_cache
 
 import jwt
-import requests
 
 
 # These are here for Auth0 stuff
@@ -19,11 +15,8 @@ def jwt_get_username_from_payload_handler(payload):
 
 def jwt_decode_token(token):
     header = jwt.get_unverified_header(token)
-    jwks = requests.get(f"{settings.AUTH0_ISSUER}.well-known/jwks.json").json()
-    public_key = None
-    for jwk in jwks['keys']:
-        if jwk['kid'] == header['kid']:
-            public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(jwk))
+    # The signing keys are fetched and parsed once rather than for every request.
+    public_key = jwks_cache.get(header.get('kid'))
 
     if public_key is None:
         raise Exception('Public key not found.')
@@ -36,15 +29,3 @@ def jwt_decode_token(token):
 def location(request, path):
     return '{scheme}://{host}'.format(scheme=request.scheme, host=request.get_host()) + path
 
-
-def make_docx(bool_list, string_list):
-    doc = docx.Document()
-    para = doc.add_paragraph("")
-    
-    for i in range(len(string_list)):
-        if i < len(bool_list) and bool_list[i] == True:
-            para.add_run(string_list[i] + " ").font.highlight_color = WD_COLOR_INDEX.GRAY_25
-        else:
-            para.add_run(string_list[i] + " ")
-
-    return doc
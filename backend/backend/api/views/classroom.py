@@ -16,21 +16,16 @@ from backend.api.models.essay import Essay
 from backend.api.models.user import Instructor, Student, User
 from backend.api.serializers import JoinedClassroomSerializer
 from backend.api.serializers.classroom import ClassroomSerializer, ClassroomStudentSerializer, AssignmentSerializer, \
-    SubmissionSerializer
-from backend.api.utils import location, make_docx
-from backend.api.views.utils import verify_user_type, post_serialize, put_serialize
+    SubmissionSerializer, InstructorSubmissionSerializer
+from backend.api.utils import location
+from backend.api.views.utils import verify_user_type, post_serialize, put_serialize, verify_submission_ready
 from backend.api.permissions import IsClassMember, IsClaimedInstructor, IsClassInstructorOrReadOnly, IsStudent, IsAssignmentStudent, IsAssignmentInstructorOrReadOnly
-from notebooks import TextProcessor
-from backend.api.models.classroom import document_text
 from io import BytesIO
 from django.core.files import File
 from docx import Document
-from notebooks import StyleProfile, PreprocessedText
 import mimetypes
 
 
-# TODO: (Refactoring) Learn how to use query sets and see if that cleans up any of this code.
-
 def download_file(request):
     # fill these variables with real values
     fl_path = '1.docx'
@@ -52,9 +47,11 @@ class ClassroomViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if user.role == "student":
-            return Classroom.objects.filter(students=user.student)
+            classrooms = Classroom.objects.filter(students__user=user)
         else:
-            return Classroom.objects.filter(instructor=user.instructor)
+            classrooms = Classroom.objects.filter(instructor__user=user)
+
+        return ClassroomSerializer.setup_eager_loading(classrooms)
 
     def perform_create(self, serializer):
         serializer.save(instructor=self.request.user.instructor)
@@ -79,11 +76,9 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         if user.role == "student":
-            classrooms = user.student.classrooms.all()
+            return Assignment.objects.filter(classroom__students__user=user)
         else:
-            classrooms = Classroom.objects.filter(instructor=user.instructor)
-
-        return Assignment.objects.filter(classroom__in=classrooms)
+            return Assignment.objects.filter(classroom__instructor__user=user)
 
 
 class ClassroomsView(APIView):
@@ -109,8 +104,7 @@ class ClassroomsView(APIView):
         """Return a list of all classrooms for the instructor who made this request."""
         verify_user_type(request, "instructor")
 
-        instructor = Instructor.objects.get(user=request.user)
-        classrooms = Classroom.objects.filter(instructor=instructor)
+        classrooms = ClassroomSerializer.setup_eager_loading(Classroom.objects.filter(instructor__user=request.user))
 
         serializer = ClassroomSerializer(classrooms, many=True)
 
@@ -125,7 +119,7 @@ class ClassroomView(APIView):
         """Retrieve the classroom specified by the instructor."""
         verify_user_type(request, "instructor")
 
-        classroom = self.get_object(request, pk)
+        classroom = self.get_object(request, pk, eager=True)
         serializer = ClassroomSerializer(classroom, context={"request": request})
         return Response(serializer.data)
 
@@ -134,7 +128,8 @@ class ClassroomView(APIView):
         verify_user_type(request, "instructor")
 
         classroom = self.get_object(request, pk)
-        request.data['instructor'] = Instructor.objects.get(user=request.user).id
+        # The classroom was only found if it belongs to this instructor.
+        request.data['instructor'] = classroom.instructor_id
         serializer = put_serialize(request, classroom, ClassroomSerializer)
         serializer.save()
         return Response(serializer.data)
@@ -143,7 +138,7 @@ class ClassroomView(APIView):
         """Delete the classroom specified by the instructor."""
         verify_user_type(request, "instructor")
 
-        classroom = self.get_object(request, pk)
+        classroom = self.get_object(request, pk, eager=True)
         serializer = ClassroomSerializer(classroom)
         # Getting the serializer data before the classroom has been deleted allows id to be included.
         data = serializer.data
@@ -152,12 +147,18 @@ class ClassroomView(APIView):
         return Response(data, status=status.HTTP_204_NO_CONTENT)
 
     @staticmethod
-    def get_object(request, pk):
-        try:
-            # We only want to return this classroom if it belongs to this instructor.
-            instructor = Instructor.objects.get(user=request.user)
+    def get_object(request, pk, eager=False):
+        """
+        :param eager: Whether to load everything ClassroomSerializer reads along with the
+        classroom.
+        """
+        # We only want to return this classroom if it belongs to this instructor.
+        classrooms = Classroom.objects.filter(instructor__user=request.user)
+        if eager:
+            classrooms = ClassroomSerializer.setup_eager_loading(classrooms)
 
-            return Classroom.objects.get(instructor=instructor, id=pk)
+        try:
+            return classrooms.get(id=pk)
         except Classroom.DoesNotExist:
             raise Http404
 
@@ -190,7 +191,7 @@ class ClassroomStudentsView(APIView):
 
         self.validate_user(classroom, request)
 
-        students = Student.objects.filter(classroom=classroom)
+        students = Student.objects.filter(classrooms=classroom).only('id')
         serializer = ClassroomStudentSerializer(students, many=True)
 
         return Response(serializer.data)
@@ -208,18 +209,12 @@ class ClassroomStudentsView(APIView):
 
     @staticmethod
     def assert_correct_instructor(request, classroom):
-        try:
-            instructor = Instructor.objects.get(user=request.user)
-            Classroom.objects.get(id=classroom.id, instructor=instructor)
-        except Classroom.DoesNotExist:
+        if not Classroom.objects.filter(id=classroom.id, instructor__user=request.user).exists():
             raise PermissionDenied(detail="Instructor does not own this classroom.")
 
     @staticmethod
     def assert_valid_student(request, classroom):
-        try:
-            student = Student.objects.get(user=request.user)
-            Classroom.objects.get(id=classroom.id, students=student)
-        except Classroom.DoesNotExist:
+        if not Classroom.objects.filter(id=classroom.id, students__user=request.user).exists():
             raise PermissionDenied(detail="Student is not within this classroom.")
 
 
@@ -230,7 +225,7 @@ class ClassroomStudentView(APIView):
     @staticmethod
     def get_object(classroom, pk):
         try:
-            return Student.objects.get(classrooms=classroom, id=pk)
+            return Student.objects.select_related('user').defer('profile').get(classrooms=classroom, id=pk)
         except Student.DoesNotExist:
             raise NotFound(detail="Student does not belong to this classroom.")
 
@@ -243,11 +238,9 @@ class ClassroomStudentView(APIView):
         student = self.get_object(classroom, pk)
         serializer = ClassroomStudentSerializer(student)
 
-        student_user = User.objects.get(student=student)
-
         data = serializer.data
-        data['first_name'] = student_user.first_name
-        data['last_name'] = student_user.last_name
+        data['first_name'] = student.user.first_name
+        data['last_name'] = student.user.last_name
 
         return Response(data)
 
@@ -290,11 +283,8 @@ class AssignmentsView(APIView):
         """View all the assignments within this classroom."""
         verify_user_type(request, 'instructor')
 
-        # TODO: (Refactoring) See if query sets can allow this to be done by only querying assignments.
         # TODO: (Bug) Return 400 level errors when instructors/classrooms are not found.
-        instructor = Instructor.objects.get(user=request.user)
-        classroom = Classroom.objects.get(instructor=instructor, id=classroom_pk)
-        assignments = Assignment.objects.filter(classroom=classroom)
+        assignments = Assignment.objects.filter(classroom__instructor__user=request.user, classroom=classroom_pk)
         serializer = AssignmentSerializer(assignments, many=True)
 
         return Response(serializer.data)
@@ -346,10 +336,7 @@ class AssignmentView(APIView):
     def get_object(request, classroom_pk, pk):
         try:
             # Don't return the assignment if this instructor does not own this class.
-            instructor = Instructor.objects.get(user=request.user)
-            classroom = Classroom.objects.get(instructor=instructor, id=classroom_pk)
-
-            return Assignment.objects.get(classroom=classroom, id=pk)
+            return Assignment.objects.get(classroom__instructor__user=request.user, classroom=classroom_pk, id=pk)
         except Assignment.DoesNotExist:
             raise NotFound(detail='Assignment does not exist.')
 
@@ -407,7 +394,6 @@ class SubmissionsView(APIView):
         request.data["title"] = os.path.basename(request.data["file"].name)
         request.data["docx_file"] = request.data["file"]
         # doc = Document(request.data["file"]) 
-        # preprocessed_text = processor(document_text(doc))
 
         # RECAP: (Bug) Django says file is empty here. When seeking to 0, saved files
         #        have no content
@@ -420,10 +406,12 @@ class SubmissionsView(APIView):
         request.data['student'] = student.id
         request.data['date'] = datetime.now(tz=pytz.UTC)
 
+        # Saving only stores the docx file, it is preprocessed in the background.
         serializer = post_serialize(request, SubmissionSerializer)
         submission = serializer.save()
 
-        response = Response({'date': submission.date, 'id': submission.id}, status=status.HTTP_201_CREATED)
+        response = Response({'date': submission.date, 'id': submission.id, 'status': submission.status},
+                            status=status.HTTP_201_CREATED)
         resource_path = f'/student/classrooms/{classroom_pk}/assignments/{assignment_pk}/submissions/{submission.id}'
         response['Location'] = location(request, resource_path)
 
@@ -435,8 +423,9 @@ class SubmissionsView(APIView):
         verify_user_type(request, 'student')
 
         # TODO: (Bug) Error check path
-        student = Student.objects.get(user=request.user)
-        submissions = Submission.objects.filter(student=student, assignment=assignment_pk)
+        # The preprocessed texts are expensive to decode and not serialized.
+        submissions = Submission.objects.filter(student__user=request.user, assignment=assignment_pk).defer(
+            'preprocessed_text')
 
         serializer = SubmissionSerializer(submissions, many=True)
 
@@ -460,10 +449,10 @@ class SubmissionView(APIView):
     def get_object(request, classroom_pk, assignment_pk, pk):
         # TODO: (Bug) make sure student is within class.
         try:
-            assignment = Assignment.objects.get(classroom=classroom_pk, id=assignment_pk)
-            return Submission.objects.get(assignment=assignment, id=pk)
-        except not Submission.DoesNotExist:
-            return NotFound(detail='Submission does not exist.')
+            return Submission.objects.defer('preprocessed_text').get(
+                assignment__classroom=classroom_pk, assignment=assignment_pk, id=pk)
+        except Submission.DoesNotExist:
+            raise NotFound(detail='Submission does not exist.')
 
 
 class InstructorSubmissionsView(APIView):
@@ -475,13 +464,15 @@ class InstructorSubmissionsView(APIView):
         """View all submissions for this assignment."""
         verify_user_type(request, 'instructor')
 
-        instructor = Instructor.objects.get(user=request.user)
-        classroom = Classroom.objects.get(instructor=instructor, id=classroom_pk)
-        assignment = Assignment.objects.get(classroom=classroom, id=assignment_pk)
+        # The reports of every submission are computed together, so neither the
+        # profiles nor the texts are loaded here.
+        submissions = list(Submission.objects.filter(
+            assignment__classroom__instructor__user=request.user, assignment__classroom=classroom_pk,
+            assignment=assignment_pk).select_related(
+            'student', 'report').defer('student__profile', 'preprocessed_text'))
+        reports = Submission.stored_reports(submissions)
 
-        submissions = Submission.objects.filter(assignment=assignment)
-
-        serializer = SubmissionSerializer(submissions, many=True)
+        serializer = InstructorSubmissionSerializer(submissions, many=True, context={'reports': reports})
 
         return Response(serializer.data)
 
@@ -502,13 +493,11 @@ class InstructorSubmissionView(APIView):
     @staticmethod
     def get_object(request, classroom_pk, assignment_pk, pk):
         try:
-            instructor = Instructor.objects.get(user=request.user)
-            classroom = Classroom.objects.get(instructor=instructor, id=classroom_pk)
-            assignment = Assignment.objects.get(classroom=classroom, id=assignment_pk)
-
-            return Submission.objects.get(assignment=assignment, id=pk)
+            return Submission.objects.defer('preprocessed_text').get(
+                assignment__classroom__instructor__user=request.user, assignment__classroom=classroom_pk,
+                assignment=assignment_pk, id=pk)
         except Submission.DoesNotExist:
-            return NotFound(detail='Submission does not exist.')
+            raise NotFound(detail='Submission does not exist.')
 
 
 class AcceptedSubmissionsView(APIView):
@@ -522,9 +511,10 @@ class AcceptedSubmissionsView(APIView):
 
         submission_pk = request.data['id']
 
-        classroom = Classroom.objects.get(id=classroom_pk)
-        assignment = Assignment.objects.get(classroom=classroom, id=assignment_pk)
-        submission = Submission.objects.get(assignment=assignment, id=submission_pk)
+        # feed_profile decodes its own copy of the profile.
+        submission = Submission.objects.select_related('student').defer('student__profile').get(
+            assignment__classroom=classroom_pk, assignment=assignment_pk, id=submission_pk)
+        verify_submission_ready(submission)
 
         # profile = StyleProfile(BytesIO(submission.student.profile.file.read()))
 
@@ -533,9 +523,7 @@ class AcceptedSubmissionsView(APIView):
         # newfilename = f"{submission.student.user.id}-profile.nb"
         # submission.student.profile.save(newfilename, BytesIO(profile.binary.read()))
 
-        submission.student.profile.feed(submission.preprocessed_text)
-
-        submission.student.save()
+        submission.student.feed_profile(submission.preprocessed_text)
 
         response = Response({}, status=status.HTTP_201_CREATED)
         # response['Location'] = location(request, f'/student/essays/{essay.id}')
@@ -550,9 +538,12 @@ class ReportView(APIView):
         """Retrieve contrast report."""
         verify_user_type(request, 'instructor')
 
-        classroom = Classroom.objects.get(id=classroom_pk)
-        assignment = Assignment.objects.get(classroom=classroom, id=assignment_pk)
-        submission = Submission.objects.get(assignment=assignment, id=submission_pk)
+        # The profile is read through the cache and the preprocessed text is only needed
+        # when the stored report is out of date, so neither is decoded here.
+        submission = Submission.objects.select_related('student', 'report').defer(
+            'student__profile', 'preprocessed_text').get(
+            assignment__classroom=classroom_pk, assignment=assignment_pk, id=submission_pk)
+        verify_submission_ready(submission)
 
         response = Response(submission.contrast_report())
 
@@ -564,20 +555,14 @@ class DetailedReportView(APIView):
 
     @staticmethod
     def get(request, classroom_pk, assignment_pk, submission_pk):
-        classroom = Classroom.objects.get(id=classroom_pk)
-        assignment = Assignment.objects.get(classroom=classroom, id=assignment_pk)
-        submission = Submission.objects.get(assignment=assignment, id=submission_pk)
+        # The profile is read through the cache, so there is no need to decode it here.
+        submission = Submission.objects.select_related('student', 'report').defer('student__profile').get(
+            assignment__classroom=classroom_pk, assignment=assignment_pk, id=submission_pk)
+        verify_submission_ready(submission)
 
-        doc = submission.detailed_report()
-
-        # fill these variables with real values
-        fl_path = 'detailed-report.docx'
         filename = 'detailed-report.docx'
+        mime_type, _ = mimetypes.guess_type(filename)
 
-        doc.save(fl_path)
-
-        fl = open(fl_path, 'rb')
-        mime_type, _ = mimetypes.guess_type(fl_path)
-        response = HttpResponse(fl, content_type=mime_type)
-        response['Content-Disposition'] = "attachment; filename=%s" % filename
-        return response
+        # FileResponse streams the report and closes it once it has been sent.
+        return FileResponse(submission.detailed_report_file(), as_attachment=True, filename=filename,
+                            content_type=mime_type)
@@ -2,13 +2,25 @@ from functools import wraps
 
 import jwt
 from django.http import Http404, JsonResponse
-from rest_framework.exceptions import PermissionDenied
+from rest_framework import status
+from rest_framework.exceptions import APIException, PermissionDenied
 
 
 def error404(request, exception):
     raise Http404
 
 
+class SubmissionNotReady(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Submission has not finished processing.'
+    default_code = 'submission_not_ready'
+
+
+def verify_submission_ready(submission):
+    if not submission.is_ready:
+        raise SubmissionNotReady(detail=f'Submission is not ready. Status: {submission.status}')
+
+
 def get_token_auth_header(request):
     """Obtains the Access Token from the Authorization Header
     """
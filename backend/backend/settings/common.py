@@ -25,6 +25,33 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 # AUTH0 variables
 AUTH0_AUDIENCE = env("DJANGO_AUTH0_AUDIENCE")
 AUTH0_ISSUER = env("DJANGO_AUTH0_ISSUER")
+# How long each process keeps using the Auth0 signing keys before fetching them again, in
+# seconds. Keys that are not known yet are fetched right away.
+JWKS_CACHE_SECONDS = env.int("DJANGO_JWKS_CACHE_SECONDS", default=600)
+
+# The number of background threads that preprocess submissions.
+PREPROCESSING_WORKERS = env.int("DJANGO_PREPROCESSING_WORKERS", default=1)
+# How many times a submission is tried when preprocessing it fails in a way that may not
+# happen again, such as losing the database connection, and how many seconds to wait
+# before trying again.
+PREPROCESSING_ATTEMPTS = env.int("DJANGO_PREPROCESSING_ATTEMPTS", default=3)
+PREPROCESSING_RETRY_SECONDS = env.int("DJANGO_PREPROCESSING_RETRY_SECONDS", default=30)
+# How many seconds a worker may hold a submission before it is taken to have stopped, and
+# the submission may be claimed by another one.
+PREPROCESSING_CLAIM_SECONDS = env.int("DJANGO_PREPROCESSING_CLAIM_SECONDS", default=600)
+# The Unix socket of a running notebooks.server to process submissions with. If this is
+# not set, each process loads its own TextProcessor the first time it needs one.
+FEATURIZATION_SOCKET = env("DJANGO_FEATURIZATION_SOCKET", default=None)
+# The longest time in seconds to wait for the featurization server to process a text,
+# which should be well under PREPROCESSING_CLAIM_SECONDS.
+FEATURIZATION_TIMEOUT_SECONDS = env.float("DJANGO_FEATURIZATION_TIMEOUT_SECONDS", default=120)
+# The most memory each process may spend caching decoded style profiles, in bytes.
+PROFILE_CACHE_BYTES = env.int("DJANGO_PROFILE_CACHE_BYTES", default=64 * 1024 * 1024)
+# The most memory each process may spend caching rendered detailed reports, in bytes.
+REPORT_CACHE_BYTES = env.int("DJANGO_REPORT_CACHE_BYTES", default=16 * 1024 * 1024)
+# Detailed reports larger than this many bytes are rendered to a temporary file rather
+# than in memory, and are not cached.
+REPORT_SPOOL_BYTES = env.int("DJANGO_REPORT_SPOOL_BYTES", default=1024 * 1024)
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.1/howto/deployment/checklist/
@@ -3,6 +3,10 @@ source .env.local
 
 ./cloud_sql_proxy -credential_file=service-key.json -instances=$SQL_CONNECTION_NAME=tcp:5432 &
 
+# Submissions that were waiting to be preprocessed when the server last stopped, and
+# those whose worker stopped, once their claims expire.
+python manage.py preprocess_submissions --interval=60 --settings=backend.settings.production &
+
 # Gunicorn listens on 127.0.0.1 by default, which isn't for docker (172.17.0.1).
 # Changing this to 0.0.0.0 allows it to serve all interfaces, including docker.
 gunicorn backend.wsgi -b 0.0.0.0:8000
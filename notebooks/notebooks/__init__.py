@@ -2,4 +2,31 @@ import os
 
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 
-from notebooks._real_init import *  # noqa: F401 E402 F403
+# The public classes are looked up in _real_init the first time they are used (PEP
+# 562), so importing notebooks, or any of its subpackages, does not import everything
+# that those classes depend on.
+__all__ = [
+    "PreprocessedText",
+    "StyleProfile",
+    "TextProcessor",
+    "report_many",
+    "score_many",
+]
+
+
+def __getattr__(name):
+    # Anything else may be a submodule, which is only found by the import system once
+    # this raises an AttributeError, as in "from notebooks import utils".
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from notebooks import _real_init
+
+    value = getattr(_real_init, name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
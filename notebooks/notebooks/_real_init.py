@@ -4,31 +4,58 @@
 # to write noqa after every import statement.
 
 from pathlib import Path
+from typing import List
 
 import os
 import numpy as np
-from pkg_resources import resource_stream
-from notebooks.feature_extractors import FeatureConcatenator, CommaCounter, WordCounter, FunctionWordCounter, POS2GramCounter, ComponentsExtractor, FeatureSelector
-from notebooks.profiles import EuclideanProfile, VotingProfile
+from importlib.resources import open_binary
+from notebooks.profiles import EuclideanProfile, VotingProfile, batch_sentence_flags
+from notebooks.structures import RaggedArray, segment_mean
+from notebooks import serialization
 from numpy import ndarray
 from io import BytesIO
-from notebooks.segmenters import Sentencizer
 import pickle
 
 
 class PreprocessedText:
-    def __init__(self, data: ndarray, sentences=None):
-        if isinstance(data, BytesIO):
-            state_dict = pickle.load(data)
+    def __init__(self, data: ndarray, sentences=None, dtype=None, sentence_starts=None):
+        """
+        :param data: The (num_sentences, feature_dim) features of the text, or a BytesIO
+        or bytes-like object holding a PreprocessedText's binary.
+        :param sentences: The sentences the features were extracted from.
+        :param sentence_starts: The character offset of each sentence in the text.
+        :param dtype: The dtype to keep the features in. The dtype of :param data is
+        kept if not given.
+        """
+        if isinstance(data, (BytesIO, bytes, bytearray, memoryview)):
+            buffer = serialization.as_buffer(data)
 
-            data_bytes = BytesIO(state_dict["data"])
-            data_bytes.seek(0)
-            self._data = np.load(data_bytes)
+            if serialization.is_serialized(buffer):
+                fields = serialization.loads(buffer, kind="PreprocessedText")
 
-            self._sentences = state_dict["sentences"]
+                self._data = fields["data"]
+                self._sentences = fields["sentences"]
+                # Binaries given before the offsets were kept do not have them.
+                self._sentence_starts = fields.get("sentence_starts")
+            else:
+                self._load_pickle(buffer)
         else:
-            self._data = data
+            self._data = data if dtype is None else np.asarray(data, dtype=dtype)
             self._sentences = sentences
+            if sentence_starts is not None:
+                sentence_starts = np.asarray(sentence_starts, dtype=np.int64)
+            self._sentence_starts = sentence_starts
+
+    def _load_pickle(self, buffer):
+        """Load from the pickled format binary used to give."""
+        state_dict = pickle.loads(buffer)
+
+        data_bytes = BytesIO(state_dict["data"])
+        data_bytes.seek(0)
+        self._data = np.load(data_bytes)
+
+        self._sentences = state_dict["sentences"]
+        self._sentence_starts = None
 
     @property
     def data(self) -> ndarray:
@@ -39,29 +66,36 @@ class PreprocessedText:
         return self._sentences
 
     @property
-    def binary(self) -> BytesIO:
-        data_bytes = BytesIO()
-
-        np.save(data_bytes, self._data)
-        data_bytes = data_bytes.getvalue()
+    def sentence_starts(self):
+        """The character offset of each sentence in the text, or None if not known."""
+        return self._sentence_starts
 
-        state_dict = {"data": data_bytes, "sentences": self._sentences}
-
-        state_bytes = BytesIO()
+    @property
+    def binary(self) -> BytesIO:
+        fields = {
+            "data": self._data,
+            "sentences": self._sentences,
+            "sentence_starts": self._sentence_starts,
+        }
 
-        pickle.dump(state_dict, state_bytes)
+        return BytesIO(serialization.dumps("PreprocessedText", fields))
 
-        state_bytes.seek(0)
 
-        return state_bytes
+# Features carry nowhere near the precision of float64, and float32 halves the memory
+# and stored size of texts and profiles.
+DEFAULT_DTYPE = np.float32
 
 
 class StyleProfile:
-    def __init__(self, bytesIO: BytesIO = None):
+    def __init__(self, bytesIO: BytesIO = None, dtype=DEFAULT_DTYPE):
+        """
+        :param bytesIO: The binary of a StyleProfile to load.
+        :param dtype: The dtype to keep the author's sentences in.
+        """
         if bytesIO is not None:
-            self._profile = VotingProfile(p=0.7, bytesIO=bytesIO)
+            self._profile = VotingProfile(p=0.7, bytesIO=bytesIO, dtype=dtype)
         else:
-            self._profile = VotingProfile(p=0.7)
+            self._profile = VotingProfile(p=0.7, dtype=dtype)
         self._threshold = 0.5
 
     def feed(self, text: PreprocessedText):
@@ -69,38 +103,132 @@ class StyleProfile:
 
     def flag(self, text: PreprocessedText) -> bool:
         distance = self._profile.distances(text.data)
-        return distance > self._threshold
+        return bool(distance > self._threshold)
 
     def score(self, text: PreprocessedText) -> float:
         return 1. - float(self._profile.distances(text.data))
 
     def detailed(self, text: PreprocessedText):
-        flags = self._profile.sentence_flags(text.data)[0].tolist()
+        flags = self._profile.sentence_flags(text.data).tolist()
 
         return flags, text.sentences
 
+    def report(self, text: PreprocessedText) -> dict:
+        """
+        Give the score, flag and sentence flags for :param text together, from a single
+        evaluation of the profile. Each is the same as the corresponding call to score,
+        flag or detailed would give.
+        """
+        sentence_flags = self._profile.sentence_flags(text.data)
+        # The distance of a text is the fraction of its sentences that are flagged.
+        distance = float(np.mean(sentence_flags))
+
+        return {
+            "score": 1. - distance,
+            "flag": distance > self._threshold,
+            "sentence_flags": sentence_flags.tolist(),
+        }
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the profile has been fed, which it must be to score texts."""
+        return self._profile._ready()
+
+    @property
+    def nbytes(self) -> int:
+        """Roughly the memory taken by the profile, for bounding caches of profiles."""
+        return self._profile.nbytes
+
     @property
     def binary(self):
         return self._profile.binary
 
 
+def report_many(
+    profiles: List[StyleProfile], texts: List[PreprocessedText]
+) -> List[dict]:
+    """
+    Give the report of each text in :param texts against the profile at the same index
+    in :param profiles, the same as StyleProfile.report would give for each pair. Every
+    pair is evaluated together, so scoring many texts costs about as much as scoring
+    one text as long as all of them.
+    """
+    sentence_flags, offsets = _batch_sentence_flags(profiles, texts)
+    distances = segment_mean(sentence_flags.astype(float), offsets)
+
+    return [
+        {
+            "score": 1. - float(distance),
+            "flag": bool(distance > profile._threshold),
+            "sentence_flags": sentence_flags[start:end].tolist(),
+        }
+        for profile, distance, start, end in zip(
+            profiles, distances, offsets, offsets[1:]
+        )
+    ]
+
+
+def score_many(profiles: List[StyleProfile], texts: List[PreprocessedText]) -> ndarray:
+    """
+    Give the score of each text in :param texts against the profile at the same index
+    in :param profiles, like report_many but without the rest of the reports.
+    """
+    sentence_flags, offsets = _batch_sentence_flags(profiles, texts)
+
+    return 1. - segment_mean(sentence_flags.astype(float), offsets)
+
+
+def _batch_sentence_flags(profiles, texts):
+    if len(texts) == 0:
+        return np.zeros(0, dtype=bool), np.zeros(1, dtype=int)
+
+    ragged_texts = RaggedArray.from_arrays([text.data for text in texts])
+    sentence_flags = batch_sentence_flags(
+        [profile._profile for profile in profiles], ragged_texts
+    )
+
+    return sentence_flags, ragged_texts.offsets
+
+
 class TextProcessor:
-    def __init__(self):
-        with (resource_stream("notebooks.resources", "pca_components.npy")) as f:
+    def __init__(self, dtype=DEFAULT_DTYPE):
+        """
+        :param dtype: The dtype of the features of the processed texts.
+        """
+        self._dtype = dtype
+
+        # Note: These are imported here rather than with the module, because they pull
+        #       in spacy, pandas and torchtext, and importing notebooks for
+        #       StyleProfile or PreprocessedText should not have to pay for them.
+        from notebooks.feature_extractors import (
+            ComponentsExtractor,
+            FeatureConcatenator,
+            FeatureSelector,
+            FunctionWordCounter,
+            POS2GramCounter,
+        )
+        from notebooks.segmenters import Sentencizer
+        from notebooks.utils import load_nlp, SENTENCE_COMPONENTS, POS_COMPONENTS
+
+        with (open_binary("notebooks.resources", "pca_components.npy")) as f:
             pca_components = np.load(f)
 
-        with (resource_stream("notebooks.resources", "lda_components.npy")) as f:
+        with (open_binary("notebooks.resources", "lda_components.npy")) as f:
             lda_components = np.load(f)
 
-        with (resource_stream("notebooks.resources", "chosen_features.p")) as f:
+        with (open_binary("notebooks.resources", "chosen_features.p")) as f:
             chosen_columns = pickle.load(f)
 
-        self._segmenter = Sentencizer()
+        # Each text is parsed once, and the sentences handed to the extractors carry
+        # the POS tags from that parse. Nothing reads the parser or NER output.
+        nlp = load_nlp(components=SENTENCE_COMPONENTS + POS_COMPONENTS)
+
+        self._segmenter = Sentencizer(nlp=nlp, tag=True)
         self._feature_extractor = ComponentsExtractor(
             ComponentsExtractor(
                 FeatureSelector(
                     FeatureConcatenator(
-                        POS2GramCounter(),
+                        POS2GramCounter(nlp=nlp),
                         FunctionWordCounter(),
                     ),
                     chosen_columns,
@@ -111,6 +239,41 @@ class TextProcessor:
         )
         # self._feature_extractor = FeatureConcatenator(CommaCounter(), WordCounter())
 
-    def __call__(self, text: str) -> PreprocessedText:
-        segments = self._segmenter(text)
-        return PreprocessedText(self._feature_extractor(segments), segments)
+    def __call__(self, text: str, boundaries=None) -> PreprocessedText:
+        """
+        :param boundaries: Character offsets in :param text that no sentence may cross,
+        such as the starts of its paragraphs.
+        """
+        segments = self._segmenter(text, boundaries=boundaries)
+        sentences = [str(segment) for segment in segments]
+
+        return PreprocessedText(
+            self._feature_extractor(segments), sentences, dtype=self._dtype,
+            sentence_starts=[segment.start for segment in segments],
+        )
+
+    def batch(self, texts: List[str], boundaries=None) -> List[PreprocessedText]:
+        """
+        Process each of :param texts like calling the TextProcessor on it would, but
+        parse the texts together and extract features from all of their sentences at
+        once.
+
+        :param boundaries: The boundaries of each text, if any.
+        """
+        segment_lists = list(self._segmenter.pipe(texts, boundaries=boundaries))
+        segments = [
+            segment for segment_list in segment_lists for segment in segment_list
+        ]
+
+        features = self._feature_extractor(segments)
+        offsets = np.cumsum([0] + [len(segment_list) for segment_list in segment_lists])
+
+        return [
+            PreprocessedText(
+                features[start:end],
+                [str(segment) for segment in segment_list],
+                dtype=self._dtype,
+                sentence_starts=[segment.start for segment in segment_list],
+            )
+            for segment_list, start, end in zip(segment_lists, offsets, offsets[1:])
+        ]
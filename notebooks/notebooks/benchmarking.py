@@ -98,6 +98,72 @@ def _single_version(func, guesses: ndarray, labels: ndarray):
     return func(guesses[None, :], labels[None, :])[0]
 
 
+# Note: A scoring function can also score every cutoff of a sorted set of distances at
+#       once through a cutoff_scores attribute, see SimpleThresholder. cutoff_scores
+#       takes the labels of the distances sorted in ascending order and gives the score
+#       for flagging all but the first k of them, for each k from 0 to the number of
+#       labels. Only the confusion counts change from one cutoff to the next, so this
+#       is linear in the number of labels instead of quadratic.
+def cutoff_counts(sorted_labels: ndarray):
+    """
+    Give the true positive, false positive, true negative and false negative counts for
+    flagging all but the first k of :param sorted_labels, for k from 0 to
+    len(sorted_labels).
+    """
+    unflagged_counts = np.arange(len(sorted_labels) + 1)
+    # unflagged_positives[k] is the number of positives among the first k labels.
+    unflagged_positives = np.concatenate([[0], np.cumsum(sorted_labels)])
+
+    false_negatives = unflagged_positives
+    true_negatives = unflagged_counts - unflagged_positives
+    true_positives = unflagged_positives[-1] - unflagged_positives
+    false_positives = len(sorted_labels) - unflagged_counts - true_positives
+
+    return true_positives, false_positives, true_negatives, false_negatives
+
+
+def _scores_cutoffs(count_scores):
+    """
+    Give the decorated scoring function a cutoff_scores attribute that scores the
+    confusion counts from cutoff_counts with :param count_scores.
+    """
+
+    def decorate(func):
+        def cutoff_scores(sorted_labels: ndarray):
+            return count_scores(*cutoff_counts(sorted_labels))
+
+        func.cutoff_scores = cutoff_scores
+
+        return func
+
+    return decorate
+
+
+def _correct_count_scores(
+    true_positives, false_positives, true_negatives, false_negatives
+):
+    return true_positives + true_negatives
+
+
+def _accuracy_scores(true_positives, false_positives, true_negatives, false_negatives):
+    label_count = true_positives[0] + false_positives[0]
+
+    return (true_positives + true_negatives) / label_count
+
+
+def _balanced_accuracy_scores(
+    true_positives, false_positives, true_negatives, false_negatives
+):
+    positive_count = true_positives[0] + false_negatives[0]
+    negative_count = false_positives[0] + true_negatives[0]
+
+    true_positive_rate = true_positives / positive_count
+    true_negative_rate = true_negatives / negative_count
+
+    return (true_positive_rate + true_negative_rate) / 2.0
+
+
+@_scores_cutoffs(_correct_count_scores)
 def correct_counts(guesses: ndarray, labels: ndarray):
     correct_classifications = guesses == labels
 
@@ -108,6 +174,7 @@ def correct_count(guesses: ndarray, labels: ndarray) -> int:
     return _single_version(correct_counts, guesses, labels)
 
 
+@_scores_cutoffs(_accuracy_scores)
 def accuracies(guesses: ndarray, labels: ndarray):
     correct_counts_ = correct_counts(guesses, labels)
 
@@ -118,6 +185,7 @@ def accuracy(guesses: ndarray, labels: ndarray) -> float:
     return _single_version(accuracies, guesses, labels)
 
 
+@_scores_cutoffs(_balanced_accuracy_scores)
 def balanced_accuracies(guesses: ndarray, labels: ndarray):
     true_positives = np.logical_and(guesses, labels)
     true_positive_counts = np.sum(true_positives, axis=1)
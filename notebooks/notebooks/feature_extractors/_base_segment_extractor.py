@@ -21,16 +21,23 @@ class BaseSegmentExtractor(BaseFeatureExtractor):
         Turn :param segments into a feature matrix of size (n_segments, feature_dim)
         """
         if isinstance(segments, pd.DataFrame):
-            if show_loading:
-                segment_list = tqdm(segments["text"])
-            else:
-                segment_list = segments["text"]
             return pd.DataFrame(
-                [self._segment_extract(segment) for segment in segment_list],
+                self._batch_extract(segments["text"], show_loading),
                 index=segments.index,
             )
 
-        return np.array([self._segment_extract(segment) for segment in segments])
+        return np.array(self._batch_extract(segments, show_loading))
+
+    def _batch_extract(self, segments, show_loading: bool):
+        """
+        Extract features from every segment in :param segments, giving a list (or
+        matrix) with one row of features per segment. Extractors that can process many
+        segments more efficiently at once should override this.
+        """
+        if show_loading:
+            segments = tqdm(segments)
+
+        return [self._segment_extract(segment) for segment in segments]
 
     @abstractmethod
     def _segment_extract(self, segment: str) -> List[float]:
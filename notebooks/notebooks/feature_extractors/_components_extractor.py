@@ -1,15 +1,67 @@
-from notebooks.feature_extractors import BaseFeatureExtractor
+from notebooks.feature_extractors import BaseFeatureExtractor, FeatureSelector
 import pandas as pd
 import numpy as np
 from numpy import ndarray
 
 
 class ComponentsExtractor(BaseFeatureExtractor):
+    """
+    Projects the features from another extractor onto a set of components.
+
+    Any chain of ComponentsExtractors and FeatureSelectors directly beneath this one is
+    compiled into a single projection of the raw features when it is constructed, so
+    extraction does one matrix product no matter how long the chain is.
+    """
+
     def __init__(self, extractor, components: ndarray):
-        self._extractor = extractor
-        self._components = components
+        self._extractor, self._columns, self._components = _compile(
+            extractor, components
+        )
+        # Full projections of the raw features, by raw feature dimension.
+        self._projections = {}
 
     def _extract(self, segments: pd.DataFrame, show_loading: bool):
-        raw_features = self._extractor(segments)
+        raw_features = self._extractor(segments, show_loading=show_loading)
+
+        return raw_features.dot(self._projection(raw_features.shape[1]))
+
+    def _projection(self, feature_dim) -> ndarray:
+        """Give the (feature_dim, n_components) matrix to project raw features with."""
+        if self._columns is None:
+            return self._components
+
+        if feature_dim not in self._projections:
+            # Selecting columns and then projecting them is the same as projecting with
+            # the component rows scattered to the selected columns, and zeros elsewhere.
+            projection = np.zeros([feature_dim, self._components.shape[1]])
+            np.add.at(projection, self._columns, self._components)
+
+            self._projections[feature_dim] = projection
+
+        return self._projections[feature_dim]
+
+
+def _compile(extractor, components: ndarray):
+    """
+    Fold the ComponentsExtractors and FeatureSelectors under a projection onto
+    :param components into it. Returns the innermost extractor, the columns of its
+    features that are selected (None for all of them) and the components to project
+    those columns onto.
+    """
+    columns = None
+
+    while True:
+        if isinstance(extractor, FeatureSelector):
+            inner_columns = np.asarray(extractor._columns)
+            columns = inner_columns if columns is None else inner_columns[columns]
+            extractor = extractor._extractor
+        elif isinstance(extractor, ComponentsExtractor):
+            inner_components = extractor._components
+            if columns is not None:
+                inner_components = inner_components[:, columns]
 
-        return raw_features.dot(self._components)
+            components = inner_components.dot(components)
+            columns = extractor._columns
+            extractor = extractor._extractor
+        else:
+            return extractor, columns, components
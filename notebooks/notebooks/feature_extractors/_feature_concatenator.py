@@ -1,3 +1,4 @@
+import numpy as np
 from notebooks.feature_extractors import BaseSegmentExtractor
 from typing import List
 
@@ -6,6 +7,21 @@ class FeatureConcatenator(BaseSegmentExtractor):
     def __init__(self, *feature_extractors):
         self._feature_extractors = feature_extractors
 
+    def _batch_extract(self, segments, show_loading):
+        # Each extractor gets the whole batch so that batched extractors stay batched.
+        segments = list(segments)
+
+        if len(segments) == 0:
+            return []
+
+        return np.concatenate(
+            [
+                np.array(feature_extractor._batch_extract(segments, show_loading))
+                for feature_extractor in self._feature_extractors
+            ],
+            axis=1,
+        )
+
     def _segment_extract(self, segment: str) -> List[float]:
         return sum(
             [
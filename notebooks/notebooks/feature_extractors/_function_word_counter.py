@@ -1,24 +1,81 @@
+import re
+
+import numpy as np
+from tqdm import tqdm
 from notebooks.feature_extractors import BaseSegmentExtractor
-from pkg_resources import resource_stream
+from importlib.resources import open_binary
 from typing import List
 
+# A word with a space before it and a space, comma or period after it. Function words
+# have none of those characters, so each match is at most one function word, counted as
+# " word ", " word," or " word.".
+_WORD_PATTERN = re.compile(r"(?<= )[^ ,.]+(?=[ ,.])")
+# A capitalized word followed by a space anywhere in the segment, counted as "Word ".
+_CAPITALIZED_PATTERN = re.compile(r"[A-Z][a-z]*(?= )")
+
 
-# TODO: Tests
 class FunctionWordCounter(BaseSegmentExtractor):
     def __init__(self):
-        with (resource_stream("notebooks.resources", "filtered_function_words.txt")) as f:
+        with (open_binary("notebooks.resources", "filtered_function_words.txt")) as f:
             data = f.read().decode("utf-8")
             self._words = list(filter(lambda s: len(s) > 0, data.split(sep="\n")))
 
+        for word in self._words:
+            if re.fullmatch("[a-z]+", word) is None:
+                raise ValueError(f"Function words must be lowercase letters: {word}")
+
+        self._columns = {word: column for column, word in enumerate(self._words)}
+        self._capitalized_columns = {
+            word.capitalize(): column for column, word in enumerate(self._words)
+        }
+
+    def _batch_extract(self, segments, show_loading):
+        segments = list(segments)
+        word_count = len(self._words)
+
+        if show_loading:
+            segments = tqdm(segments)
+
+        # Every match is turned into a flat index into the (n_segments, n_words) count
+        # matrix, so the whole batch is counted with a single bincount.
+        indices = [
+            row * word_count + column
+            for row, segment in enumerate(segments)
+            for column in self._matched_columns(segment)
+        ]
+
+        counts = np.bincount(
+            np.array(indices, dtype=int), minlength=len(segments) * word_count
+        )
+
+        return counts.reshape(len(segments), word_count).astype(float)
+
     def _segment_extract(self, segment: str) -> List[float]:
-        counts = []
+        return self._batch_extract([segment], False)[0].tolist()
 
-        for word in self._words:
-            normal_count = segment.count(" " + word + " ")
-            punct_word = segment.count(" " + word + ",")
-            start_word = segment.count(word.capitalize() + " ")
-            end_word = segment.count(" " + word + ".")
+    def _matched_columns(self, segment: str):
+        """Yield the column of the function word for every match in :param segment."""
+        # Matches of " word " can share a space with the match before them. These were
+        # never both counted, so a match that starts on the trailing space of a counted
+        # match of the same word is skipped.
+        counted_ends = {}
+
+        for match in _WORD_PATTERN.finditer(segment):
+            column = self._columns.get(match.group())
+
+            if column is None:
+                continue
+
+            if segment[match.end()] == " ":
+                if counted_ends.get(column) == match.start() - 1:
+                    continue
+
+                counted_ends[column] = match.end()
+
+            yield column
 
-            counts.append(float(normal_count + punct_word + start_word + end_word))
+        for match in _CAPITALIZED_PATTERN.finditer(segment):
+            column = self._capitalized_columns.get(match.group())
 
-        return counts
+            if column is not None:
+                yield column
@@ -1,3 +1,4 @@
+import numpy as np
 from notebooks.feature_extractors import BaseSegmentExtractor
 from typing import List
 
@@ -7,6 +8,22 @@ class Normalizer(BaseSegmentExtractor):
         self._feature_extractor = feature_extractor
         self._count_extractor = count_extractor
 
+    def _batch_extract(self, segments, show_loading):
+        segments = list(segments)
+
+        if len(segments) == 0:
+            return []
+
+        features = np.array(
+            self._feature_extractor._batch_extract(segments, show_loading), dtype=float
+        )
+        counts = np.array(
+            self._count_extractor._batch_extract(segments, False), dtype=float
+        )[:, :1]
+
+        # Segments with a count of 0 are left as they are.
+        return np.divide(features, counts, out=features, where=counts != 0)
+
     def _segment_extract(self, segment: str) -> List[float]:
         segment_features = self._feature_extractor._segment_extract(segment)
         count = self._count_extractor._segment_extract(segment)[0]
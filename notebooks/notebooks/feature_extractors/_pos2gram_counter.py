@@ -2,7 +2,8 @@ from typing import List
 
 import numpy as np
 from numpy import ndarray
-from pkg_resources import resource_stream
+from importlib.resources import open_binary
+from tqdm import tqdm
 from notebooks import utils
 
 from notebooks.feature_extractors import BaseSegmentExtractor
@@ -30,29 +31,108 @@ posVector = [
 
 Phi_size = len(posVector) * len(posVector)
 
-# TODO: Tests
+# Maps each POS tag to its index in posVector.
+_pos_ids = {tag: index for index, tag in enumerate(posVector)}
+
+
 class POS2GramCounter(BaseSegmentExtractor):
-    def __init__(self, best=30):
-        self.sorted_indices = np.load(
-            resource_stream("notebooks.resources", "best_bigrams.npy")
-        )[:best]
-        self._nlp = utils.default_nlp()
-
-    def _segment_extract(self, segment):
-        posArr = [token.pos_ for token in self._nlp(segment)]
-
-        Phi = np.zeros(Phi_size)
-
-        k = 0
-
-        for i in range(len(posArr) - 1):
-            if i == 0:
-                l = posVector.index(str(posArr[i]))
-                k = posVector.index(str(posArr[i + 1]))
-                Phi[l * len(posVector) + k] += 1
-            else:
-                l = posVector.index(str(posArr[i + 1]))
-                Phi[k * len(posVector) + l] += 1
-                k = l
-
-        return Phi.tolist()
+    """
+    Counts each bigram of POS tags in a segment. The count for the bigram (first,
+    second) is in column posVector.index(first) * len(posVector) +
+    posVector.index(second).
+    """
+
+    def __init__(self, best=None, nlp=None, batch_size=256, n_process=1):
+        """
+        :param best: If given, only the counts of the best :param best bigrams from the
+        best_bigrams resource are extracted, best first. All bigrams are counted
+        otherwise.
+        :param nlp: The spacy pipeline used to tag segments that were not already tagged
+        by the segmenter, a tagger-only pipeline is loaded on first use if not given.
+        :param batch_size: The number of segments spacy tags at a time when extracting
+        from many segments.
+        :param n_process: The number of processes spacy tags with when extracting from
+        many segments.
+        """
+        self._columns = None
+        if best is not None:
+            self._columns = np.load(
+                open_binary("notebooks.resources", "best_bigrams.npy")
+            )[:best]
+
+        self._nlp = nlp
+        self._batch_size = batch_size
+        self._n_process = n_process
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = utils.load_nlp(components=utils.POS_COMPONENTS)
+
+        return self._nlp
+
+    def _batch_extract(self, segments, show_loading):
+        segments = list(segments)
+
+        # Segments from a tagging segmenter were already parsed along with the rest of
+        # the text, so only plain strings are streamed through the pipeline.
+        untagged = [segment for segment in segments if not _is_tagged(segment)]
+        docs = iter([])
+        if len(untagged) > 0:
+            docs = self.nlp.pipe(
+                untagged, batch_size=self._batch_size, n_process=self._n_process
+            )
+
+        id_arrays = (
+            _pos_id_array(segment.pos_tags)
+            if _is_tagged(segment)
+            else _pos_id_array(token.pos_ for token in next(docs))
+            for segment in segments
+        )
+
+        if show_loading:
+            id_arrays = tqdm(id_arrays, total=len(segments))
+
+        return self._count_bigrams(list(id_arrays))
+
+    def _segment_extract(self, segment) -> List[float]:
+        if _is_tagged(segment):
+            pos_ids = _pos_id_array(segment.pos_tags)
+        else:
+            pos_ids = _pos_id_array(token.pos_ for token in self.nlp(segment))
+
+        return self._count_bigrams([pos_ids])[0].tolist()
+
+    def _count_bigrams(self, id_arrays) -> ndarray:
+        """
+        Count the bigrams of each array of POS ids in :param id_arrays, giving a matrix
+        with a row of counts for each array.
+        """
+        if len(id_arrays) == 0:
+            feature_dim = Phi_size if self._columns is None else len(self._columns)
+            return np.zeros([0, feature_dim])
+
+        lengths = np.array([len(pos_ids) for pos_ids in id_arrays])
+        pos_ids = np.concatenate(id_arrays)
+        rows = np.repeat(np.arange(len(id_arrays)), lengths)
+
+        # Bigrams that cross from one segment into the next are dropped.
+        within_segment = rows[:-1] == rows[1:]
+        bigrams = pos_ids[:-1] * len(posVector) + pos_ids[1:]
+        flat_indices = rows[:-1][within_segment] * Phi_size + bigrams[within_segment]
+
+        counts = np.bincount(flat_indices, minlength=len(id_arrays) * Phi_size)
+        counts = counts.reshape(len(id_arrays), Phi_size).astype(float)
+
+        if self._columns is not None:
+            return counts[:, self._columns]
+
+        return counts
+
+
+def _pos_id_array(pos_tags) -> ndarray:
+    return np.fromiter((_pos_ids[str(tag)] for tag in pos_tags), dtype=int)
+
+
+def _is_tagged(segment):
+    return getattr(segment, "pos_tags", None) is not None
@@ -1,4 +1,10 @@
 from notebooks.profiles._base_profile import BaseProfile  # noqa: F401
 from notebooks.profiles._euclidean_profile import EuclideanProfile  # noqa: F401
 from notebooks.profiles._naive_bayes_profile import NaiveBayesProfile  # noqa: F401
-from notebooks.profiles._voting_profile import VotingProfile  # noqa: F401
+from notebooks.profiles._voting_profile import (  # noqa: F401
+    VotingProfile,
+    batch_sentence_flags,
+)
+from notebooks.profiles._streaming_voting_profile import (  # noqa: F401
+    StreamingVotingProfile,
+)
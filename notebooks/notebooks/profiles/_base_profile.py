@@ -1,23 +1,46 @@
-from notebooks.structures import PaddedArray
+from notebooks.structures import PaddedArray, RaggedArray
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 from numpy import ndarray
-import pandas as pd
 import numpy as np
+import sys
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # Note: Profile implementations currently do not have to handle empty input edge cases
 #       because PaddedArray does not allow them.
+# Note: Numpy, PaddedArray and RaggedArray input is handed to profiles as the rows of
+#       every text stacked into one (num_segments, feature_dim) array, along with the
+#       offsets of each text's first row and the total row count at the end, which is
+#       how a RaggedArray stores them. Text i is then values[offsets[i]:offsets[i + 1]].
+#       Only DataFrame input goes through pandas.
 # TODO: Docstrings for each of the public functions.
 class BaseProfile(ABC):
+    # The dtype that array input is converted to before it is fed or compared, which
+    # profiles that take a dtype set. None keeps the dtype of the input.
+    _dtype = None
+
     @abstractmethod
-    def _feed(self, author_texts: PaddedArray):
+    def _feed(self, author_texts: "pd.DataFrame"):
         pass
 
-    def feed(self, author_texts):
-        author_texts, _, _ = self._pad_texts(author_texts)
+    def _feed_array(self, values: ndarray, offsets: ndarray):
+        """
+        Feed the texts in :param values split at :param offsets. Profiles that can work
+        on arrays directly should override this, by default the texts are fed to _feed
+        as a DataFrame.
+        """
+        self._feed(_texts_frame(values, offsets))
 
-        self._feed(author_texts)
+    def feed(self, author_texts):
+        if is_dataframe(author_texts):
+            self._feed(author_texts)
+        else:
+            values, offsets, _ = self._split_texts(author_texts)
+            self._feed_array(values, offsets)
 
     @abstractmethod
     def _reset(self):
@@ -27,9 +50,17 @@ class BaseProfile(ABC):
         self._reset()
 
     @abstractmethod
-    def _distances(self, suspect_texts: PaddedArray) -> ndarray:
+    def _distances(self, suspect_texts: "pd.DataFrame"):
         pass
 
+    def _distances_array(self, values: ndarray, offsets: ndarray) -> ndarray:
+        """
+        Give the distance of each text in :param values split at :param offsets.
+        Profiles that can work on arrays directly should override this, by default the
+        texts are passed to _distances as a DataFrame.
+        """
+        return self._distances(_texts_frame(values, offsets)).to_numpy()
+
     @abstractmethod
     def _ready(self) -> bool:
         pass
@@ -37,67 +68,63 @@ class BaseProfile(ABC):
     def distances(self, suspect_texts):
         assert self._ready(), "you must feed profile before calling distances"
 
-        suspect_texts, single, is_numpy = self._pad_texts(suspect_texts)
+        if is_dataframe(suspect_texts):
+            return self._distances(suspect_texts)
 
-        distances_ = self._distances(suspect_texts)
+        values, offsets, single = self._split_texts(suspect_texts)
+
+        distances_ = self._distances_array(values, offsets)
 
         if single:
             return distances_[0]
 
-        if is_numpy:
-            return distances_.to_numpy()
-
         return distances_
 
-    def _pad_texts(self, texts) -> pd.DataFrame:
-        """Pad texts and also return True if input was single text"""
-        if isinstance(texts, pd.DataFrame):
-            return texts, False, False
-
-        if isinstance(texts, PaddedArray):
-            texts = [array[:length] for array, length in zip(texts.data, texts.lengths)]
-
-            level0, level1 = zip(
-                *[
-                    ([index] * len(array), np.arange(len(array)))
-                    for index, array in enumerate(texts)
-                ]
-            )
-            level0, level1 = sum(level0, []), np.concatenate(level1)
-
-            return (
-                pd.DataFrame(
-                    np.concatenate(texts),
-                    index=pd.MultiIndex.from_tuples(zip(level0, level1)),
-                ),
-                False,
-                True,
-            )
+    def _split_texts(self, texts):
+        """
+        Stack the segments of :param texts into one array and give the offsets of each
+        text in it. Also return True if input was single text.
+        """
+        if isinstance(texts, (RaggedArray, PaddedArray)):
+            # The unpadded rows are used as they are, so padding is never built.
+            values = np.asarray(texts.values, dtype=self._dtype)
+
+            return values, texts.offsets, False
+
+        texts = np.asarray(texts, dtype=self._dtype)
 
         # TODO: Input checking to ensure that data is either 2-D or 3-D
         if texts.ndim == 2:
             # The general distances function will still work if we just treat the input
             # as a set of 1 text.
-            indices = zip([0] * len(texts), np.arange(len(texts)))
-            return (
-                pd.DataFrame(texts, index=pd.MultiIndex.from_tuples(indices)),
-                True,
-                False,
-            )
-
-        level0, level1 = zip(
-            *[
-                ([index] * len(array), np.arange(len(array)))
-                for index, array in enumerate(texts)
-            ]
-        )
-        level0, level1 = sum(level0, []), np.concatenate(level1)
+            return texts, np.array([0, len(texts)]), True
+
+        num_texts, num_segments, feature_dim = texts.shape
 
         return (
-            pd.DataFrame(
-                np.concatenate(texts),
-                index=pd.MultiIndex.from_tuples(zip(level0, level1)),
-            ),
+            texts.reshape(num_texts * num_segments, feature_dim),
+            np.arange(num_texts + 1) * num_segments,
             False,
-            True,
         )
+
+
+def is_dataframe(texts) -> bool:
+    """Give whether :param texts is a pandas DataFrame, without importing pandas."""
+    # If pandas was never imported, nothing can have made a DataFrame.
+    pd = sys.modules.get("pandas")
+
+    return pd is not None and isinstance(texts, pd.DataFrame)
+
+
+def _texts_frame(values: ndarray, offsets: ndarray) -> "pd.DataFrame":
+    """
+    Give the DataFrame for the texts in :param values split at :param offsets, indexed
+    by (text, segment).
+    """
+    import pandas as pd
+
+    lengths = np.diff(offsets)
+    texts = np.repeat(np.arange(len(lengths)), lengths)
+    segments = np.arange(len(values)) - np.repeat(offsets[:-1], lengths)
+
+    return pd.DataFrame(values, index=pd.MultiIndex.from_arrays([texts, segments]))
@@ -1,8 +1,13 @@
 import pickle
 from io import BytesIO
 import numpy as np
-import pandas as pd
+from typing import TYPE_CHECKING
 from notebooks.profiles import BaseProfile
+from notebooks.structures import segment_mean
+from notebooks import serialization
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class EuclideanProfile(BaseProfile):
@@ -11,31 +16,45 @@ class EuclideanProfile(BaseProfile):
     the suspect data.
     """
 
-    def __init__(self, bytesIO = None):
+    def __init__(self, bytesIO=None, dtype=None):
+        """
+        :param dtype: The dtype that fed and suspect texts are converted to. Their dtype
+        is kept if not given.
+        """
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._mean = None
+        self._count = 0
+
         if bytesIO is not None:
-            state_dict = pickle.load(bytesIO)
+            buffer = serialization.as_buffer(bytesIO)
 
-            if state_dict["mean"] is not None:
-                mean_bytes = BytesIO(state_dict["mean"])
-                mean_bytes.seek(0)
-                self._mean = np.load(mean_bytes)
+            if serialization.is_serialized(buffer):
+                state_dict = serialization.loads(buffer, kind="EuclideanProfile")
             else:
-                self._mean = None
+                # Profiles were pickled before, with the mean saved by np.save.
+                state_dict = pickle.loads(buffer)
+                if state_dict["mean"] is not None:
+                    state_dict["mean"] = np.load(BytesIO(state_dict["mean"]))
+
+            self._mean = state_dict["mean"]
+            if self._mean is not None:
+                self._mean = np.asarray(self._mean, dtype=self._dtype)
 
             self._count = state_dict["count"]
-        else:
-            self._mean = None
-            self._count = 0
 
-    def _feed(self, author_texts: pd.DataFrame):
+    def _feed(self, author_texts: "pd.DataFrame"):
+        # Texts are not told apart when feeding, so the frame is fed as one text.
+        self._feed_array(author_texts.to_numpy(), np.array([0, len(author_texts)]))
+
+    def _feed_array(self, values, offsets):
         """
-        Feed :param author_texts into the profile, which will be compared to the suspect
+        Feed :param values into the profile, which will be compared to the suspect
         data later.
         """
         if self._mean is not None:
             # We can add to the old mean by doing a weighted average between the old
             # mean and the new mean.
-            next_mean, next_count = self._author_mean(author_texts)
+            next_mean, next_count = self._author_mean(values)
 
             new_count = self._count + next_count
 
@@ -43,14 +62,14 @@ class EuclideanProfile(BaseProfile):
             next_weight = next_count / new_count
 
             self._mean = old_weight * self._mean + next_weight * next_mean
-            self.count = new_count
+            self._count = new_count
         else:
-            self._mean, self._count = self._author_mean(author_texts)
+            self._mean, self._count = self._author_mean(values)
 
     def _ready(self):
         return self._mean is not None
 
-    def _distances(self, suspect_texts: pd.DataFrame):
+    def _distances(self, suspect_texts: "pd.DataFrame"):
         """
         Get the distance from the profile to each set of observations from :param
         suspect_texts. :param suspect_texts is expected to be a (num_essays,
@@ -62,36 +81,28 @@ class EuclideanProfile(BaseProfile):
 
         return np.sqrt((suspect_diffs * suspect_diffs).sum(axis=1))
 
-    def _author_mean(self, author_texts: pd.DataFrame):
-        mean = author_texts.mean()
-        count = len(author_texts)
+    def _distances_array(self, values, offsets):
+        suspect_diffs = self._mean - segment_mean(values, offsets)
+
+        return np.sqrt(np.sum(suspect_diffs * suspect_diffs, axis=1))
+
+    def _author_mean(self, values):
+        mean = np.mean(values, axis=0)
+        count = len(values)
 
         return mean, count
 
     def _reset(self):
-        # WTF: This passes even though count is not reset, because the count is not
-        #      considered on first feed and simply reassigned. We may want to add edge
-        #      case testing here or refactor to something that doesn't contain this
-        #      loophole.
         self._mean = None
+        self._count = 0
 
     @property
-    def binary(self):
-        mean_bytes = BytesIO()
-
-        if self._mean is not None:
-            np.save(mean_bytes, self._mean)
-
-            mean_bytes = mean_bytes.getvalue()
-        else:
-            mean_bytes = None
+    def nbytes(self):
+        """The number of bytes taken by the arrays in the profile."""
+        return 0 if self._mean is None else self._mean.nbytes
 
-        state_dict = {"mean": mean_bytes, "count": self._count}
-
-        state_bytes = BytesIO()
-
-        pickle.dump(state_dict, state_bytes)
-
-        state_bytes.seek(0)
+    @property
+    def binary(self):
+        state_dict = {"mean": self._mean, "count": self._count}
 
-        return state_bytes
+        return BytesIO(serialization.dumps("EuclideanProfile", state_dict))
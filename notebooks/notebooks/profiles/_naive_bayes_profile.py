@@ -1,34 +1,54 @@
 from notebooks.profiles import BaseProfile
+from notebooks.structures import segment_mean
 import numpy as np
-from scipy.stats import norm
 
 
 # Note: Classes like this aren't going to completely follow Bayes rule or perfectly
 #       calculate the normal PDF, because they don't have to. They just have to
 #       calculate something proportional so that a good threshold can be found.
 class NaiveBayesProfile(BaseProfile):
-    def __init__(self):
+    def __init__(self, dtype=None):
+        """
+        :param dtype: The dtype that fed and suspect texts are converted to. Their dtype
+        is kept if not given.
+        """
+        self._dtype = None if dtype is None else np.dtype(dtype)
         self._author_mean = None
         self._author_std = None
 
     def _feed(self, author_texts):
-        self._author_mean = author_texts.mean()
-        self._author_std = author_texts.std()
+        # Texts are not told apart when feeding, so the frame is fed as one text.
+        self._feed_array(author_texts.to_numpy(), np.array([0, len(author_texts)]))
+
+    def _feed_array(self, values, offsets):
+        self._author_mean = np.mean(values, axis=0)
+        self._author_std = np.std(values, axis=0, ddof=1)
 
     def _distances(self, suspect_texts):
+        from scipy.stats import norm
+
         z_scores = (suspect_texts - self._author_mean) / self._author_std
 
         densities = z_scores.copy()
         densities[:] = norm.pdf(densities[:])
 
         log_densities = np.log(densities)
-        
+
         segment_distances = log_densities.sum(axis=1)
 
         group_distances = segment_distances.groupby(level=-2).mean()
 
         return group_distances
 
+    def _distances_array(self, values, offsets):
+        from scipy.stats import norm
+
+        z_scores = (values - self._author_mean) / self._author_std
+
+        log_densities = np.log(norm.pdf(z_scores))
+
+        return segment_mean(np.sum(log_densities, axis=1), offsets)
+
     def _ready(self):
         return self._author_mean is not None
 
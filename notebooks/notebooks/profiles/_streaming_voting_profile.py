@@ -0,0 +1,117 @@
+from notebooks.profiles import VotingProfile
+from notebooks.structures import QuantileSketch
+from notebooks import serialization
+import numpy as np
+from io import BytesIO
+
+
+class StreamingVotingProfile(VotingProfile):
+    """
+    A VotingProfile that keeps a fixed size summary of the sentences it is fed instead
+    of the sentences themselves: their sum and count for the mean, and a QuantileSketch
+    of their leave one out distances for the threshold.
+
+    Each sentence's leave one out distance is measured against the sentences fed up to
+    and including its own feed, where VotingProfile measures it against every sentence
+    fed so far. Fed everything at once with fewer than k sentences, both profiles give
+    the same flags. Otherwise each distance is off from the one VotingProfile measures
+    by at most how far the mean of the other sentences moved since its feed, so the
+    threshold is within roughly 1 / k in rank of the threshold of a VotingProfile fed
+    the same sentences, and then off by at most the largest of those moves.
+    """
+
+    def __init__(self, p=None, k=200, bytesIO=None, dtype=None):
+        """
+        :param p: The fraction of the author's own sentences that should fall under the
+        threshold.
+        :param k: The size of the quantile sketch, see QuantileSketch.
+        :param dtype: The dtype that sentences are converted to. The sum of the
+        sentences is kept in float64 whatever it is, since it only grows.
+        """
+        super().__init__(p=p, dtype=dtype)
+        self._k = k
+        self._reset()
+
+        if bytesIO is not None:
+            buffer = serialization.as_buffer(bytesIO)
+            state_dict = serialization.loads(buffer, kind="StreamingVotingProfile")
+            self._load_state(state_dict)
+
+    def _load_state(self, state_dict):
+        self._p = state_dict["p"]
+        self._k = state_dict["k"]
+
+        if state_dict["sum"] is not None:
+            self._sum = state_dict["sum"]
+            self._count = state_dict["count"]
+            self._mean = self._sum / self._count
+            self._threshold = state_dict["threshold"]
+
+            levels = [state_dict[f"level{i}"] for i in range(state_dict["levels"])]
+            self._sketch = QuantileSketch.from_state(
+                {
+                    "k": self._k,
+                    "levels": levels,
+                    "compactions": state_dict["compactions"].tolist(),
+                }
+            )
+
+    def _feed_array(self, values, offsets):
+        sentences = values
+
+        if self._sum is not None:
+            self._sum = self._sum + np.sum(sentences, axis=0, dtype=np.float64)
+        else:
+            self._sum = np.sum(sentences, axis=0, dtype=np.float64)
+        self._count += len(sentences)
+
+        # Leave one out distances of the new sentences from everything fed so far. The
+        # very first sentence has nothing else to be measured against, and is left out.
+        if self._count > 1:
+            other_means = (self._sum - sentences) / (self._count - 1)
+            self._sketch.update(np.linalg.norm(sentences - other_means, axis=1))
+
+        # Note: Until there is a distance, no sentence is far enough to be flagged.
+        self._threshold = (
+            self._sketch.quantile(self._p) if self._sketch.count else np.inf
+        )
+        self._mean = self._sum / self._count
+
+    def _ready(self):
+        return self._sum is not None
+
+    def _reset(self):
+        self._sum = None
+        self._count = 0
+        self._mean = None
+        self._threshold = None
+        self._sketch = QuantileSketch(k=self._k)
+
+    @property
+    def nbytes(self):
+        """The number of bytes taken by the arrays in the profile."""
+        arrays = [self._sum, self._mean]
+        array_bytes = sum(array.nbytes for array in arrays if array is not None)
+
+        return array_bytes + self._sketch.nbytes
+
+    @property
+    def binary(self):
+        state_dict = {"p": self._p, "k": self._k, "sum": None}
+
+        if self._sum is not None:
+            sketch_state = self._sketch.state
+
+            state_dict.update(
+                {
+                    "sum": self._sum,
+                    "count": self._count,
+                    "threshold": self._threshold,
+                    "compactions": np.array(sketch_state["compactions"]),
+                    "levels": len(sketch_state["levels"]),
+                }
+            )
+            for i, level in enumerate(sketch_state["levels"]):
+                state_dict[f"level{i}"] = level
+
+        return BytesIO(serialization.dumps("StreamingVotingProfile", state_dict))
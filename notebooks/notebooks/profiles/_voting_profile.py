@@ -1,41 +1,66 @@
 from notebooks.profiles import BaseProfile
+from notebooks.structures import RaggedArray, segment_mean
+from notebooks import serialization
 import numpy as np
-import pandas as pd
+from numpy import ndarray
 import math
 from io import BytesIO
 import pickle
+from typing import List
 
 
 class VotingProfile(BaseProfile):
-    def __init__(self, p=None, bytesIO=None):
+    def __init__(self, p=None, bytesIO=None, dtype=None):
+        """
+        :param p: The fraction of the author's own sentences that should fall under the
+        threshold.
+        :param dtype: The dtype to keep the author's sentences in, float32 halves the
+        size of the profile. The dtype of the fed sentences is kept if not given.
+        """
+        self._p = p
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._mean = None
+        self._threshold = None
+        self._author_sentences = None
+
         if bytesIO is not None:
-            state_dict = pickle.load(bytesIO)
-
-            if state_dict["mean"] is not None:
-                mean_bytes = BytesIO(state_dict["mean"])
-                sentences_bytes = BytesIO(state_dict["sentences"])
-                mean_bytes.seek(0)
-                sentences_bytes.seek(0)
-                self._mean = np.load(mean_bytes)
-                self._author_sentences = np.load(sentences_bytes)
-                self._threshold = state_dict["threshold"]
-                self._p = state_dict["p"]
+            buffer = serialization.as_buffer(bytesIO)
+
+            if serialization.is_serialized(buffer):
+                self._load_state(serialization.loads(buffer, kind="VotingProfile"))
             else:
-                self._p = p
-                self._mean = None
-                self._threshold = None
-                self._author_sentences = None
-        else:
-            self._p = p
-            self._mean = None
-            self._threshold = None
-            self._author_sentences = None
+                self._load_pickle(buffer)
+
+    def _load_state(self, state_dict):
+        if state_dict["mean"] is not None:
+            # Converting only copies profiles that were saved with another dtype.
+            self._mean = np.asarray(state_dict["mean"], dtype=self._dtype)
+            self._author_sentences = np.asarray(
+                state_dict["sentences"], dtype=self._dtype
+            )
+            self._threshold = state_dict["threshold"]
+            self._p = state_dict["p"]
+
+    def _load_pickle(self, buffer):
+        """Load the pickled state that profiles were stored as before."""
+        state_dict = pickle.loads(buffer)
+
+        if state_dict["mean"] is not None:
+            state_dict["mean"] = np.load(BytesIO(state_dict["mean"]))
+            state_dict["sentences"] = np.load(BytesIO(state_dict["sentences"]))
+
+        self._load_state(state_dict)
 
     def _feed(self, author_texts):
+        # Texts are not told apart when feeding, so the frame is fed as one text.
+        self._feed_array(author_texts.to_numpy(), np.array([0, len(author_texts)]))
+
+    def _feed_array(self, values, offsets):
         if self._author_sentences is not None:
-            self._author_sentences = np.concatenate([self._author_sentences, author_texts.to_numpy()])
+            self._author_sentences = np.concatenate([self._author_sentences, values])
         else:
-            self._author_sentences = author_texts.to_numpy()
+            # The sentences are copied since values may be a view of the caller's array.
+            self._author_sentences = np.array(values)
 
         excluded_distances = self._excluded_distances(self._author_sentences)
 
@@ -44,15 +69,27 @@ class VotingProfile(BaseProfile):
         self._threshold = sorted_distances[math.floor(len(sorted_distances) * self._p)]
 
         self._mean = np.mean(self._author_sentences, axis=0)
-    
+
     def _distances(self, suspect_texts):
         flags = self.sentence_flags(suspect_texts)
 
         return flags.groupby(level=-2).mean()
 
+    def _distances_array(self, values, offsets):
+        flags = self.sentence_flags(values)
+
+        return segment_mean(flags.astype(float), offsets)
+
     def sentence_flags(self, suspect_texts):
+        """
+        Flag each sentence in :param suspect_texts that is further than the threshold
+        from the author's mean. A DataFrame of flags is given for a DataFrame, and a
+        1-D array of flags for a (num_sentences, feature_dim) array.
+        """
         if isinstance(suspect_texts, np.ndarray):
-            suspect_texts = pd.DataFrame(suspect_texts)
+            return np.linalg.norm(self._mean - suspect_texts, axis=1) > self._threshold
+
+        import pandas as pd
 
         diffs = self._mean - suspect_texts
 
@@ -69,38 +106,59 @@ class VotingProfile(BaseProfile):
         self._mean = None
 
     def _excluded_distances(self, matrix):
+        """
+        Give the distance from each row of :param matrix to the mean of all the other
+        rows.
+        """
         count = len(matrix)
-        result = np.zeros(shape=[count])
 
-        for i in range(count):
-            other_sentences = np.delete(matrix, i, axis=0)
-            other_mean = np.mean(other_sentences, axis=0)
+        # The mean without row i is (total - row_i) / (count - 1), so every leave one
+        # out mean comes from the same total.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            other_means = (np.sum(matrix, axis=0) - matrix) / (count - 1)
 
-            result[i] = np.linalg.norm(matrix[i] - other_mean)
+        return np.linalg.norm(matrix - other_means, axis=1)
 
-        return result
+    @property
+    def nbytes(self):
+        """The number of bytes taken by the arrays in the profile."""
+        arrays = [self._mean, self._author_sentences]
+
+        return sum(array.nbytes for array in arrays if array is not None)
 
     @property
     def binary(self):
-        mean_bytes = BytesIO()
-        sentences_bytes = BytesIO()
+        state_dict = {
+            "mean": self._mean,
+            "sentences": self._author_sentences,
+            "threshold": self._threshold,
+            "p": self._p,
+        }
 
-        if self._mean is not None:
-            np.save(mean_bytes, self._mean)
-            np.save(sentences_bytes, self._author_sentences)
+        return BytesIO(serialization.dumps("VotingProfile", state_dict))
 
-            mean_bytes = mean_bytes.getvalue()
-            sentences_bytes = sentences_bytes.getvalue()
-        else:
-            mean_bytes = None
-            sentences_bytes = None
 
-        state_dict = {"mean": mean_bytes, "sentences": sentences_bytes, "threshold": self._threshold, "p": self._p}
+def batch_sentence_flags(profiles: List[VotingProfile], texts: RaggedArray) -> ndarray:
+    """
+    Flag the sentences of each text in :param texts against the profile at the same
+    index in :param profiles, like calling sentence_flags on each pair would, but with
+    every sentence measured against its own profile in one pass. Gives the flags of
+    every sentence in the order of texts.values.
+    """
+    assert len(profiles) == len(texts), "there must be a profile for each text"
+    assert all(
+        profile._ready() for profile in profiles
+    ), "you must feed profiles before flagging sentences"
+
+    if len(profiles) == 0:
+        return np.zeros(0, dtype=bool)
 
-        state_bytes = BytesIO()
+    means = np.stack([profile._mean for profile in profiles])
+    thresholds = np.array([profile._threshold for profile in profiles])
 
-        pickle.dump(state_dict, state_bytes)
+    # The index of the profile that each sentence is measured against.
+    owners = np.repeat(np.arange(len(profiles)), texts.lengths)
 
-        state_bytes.seek(0)
+    distances = np.linalg.norm(texts.values - means[owners], axis=1)
 
-        return state_bytes
+    return distances > thresholds[owners]
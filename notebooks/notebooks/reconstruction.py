@@ -1,11 +1,62 @@
+from copy import deepcopy
+from itertools import groupby
+from typing import Dict, List, Tuple
+
+import numpy as np
 from docx import Document
+from docx.enum.text import WD_COLOR_INDEX
+from docx.text.run import Run
+
+# The color that highlighted sentences are marked with.
+HIGHLIGHT_COLOR = WD_COLOR_INDEX.GRAY_25
+# What the paragraphs of a document are joined with, which keeps sentences from running
+# from the end of one paragraph into the next.
+PARAGRAPH_SEPARATOR = "\n"
+
+
+class DocumentText:
+    """
+    The text of a word document with its paragraphs joined by a separator, along with
+    the character offset that each paragraph starts at in the text.
+    """
+
+    def __init__(self, document: Document, separator=PARAGRAPH_SEPARATOR):
+        # Joining builds the text in one pass, where adding the paragraphs one by one
+        # can copy the text so far for every paragraph.
+        paragraphs = [paragraph.text for paragraph in document.paragraphs]
+        lengths = np.array([len(paragraph) for paragraph in paragraphs], dtype=int)
+
+        self._text = separator.join(paragraphs)
+        self._paragraph_starts = np.cumsum(lengths + len(separator)) - (
+            lengths + len(separator)
+        )
+        self._separator = separator
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def paragraph_starts(self) -> np.ndarray:
+        """The character offset of each paragraph in text."""
+        return self._paragraph_starts
+
+    @property
+    def separator(self) -> str:
+        return self._separator
+
+    def paragraphs_of(self, offsets) -> np.ndarray:
+        """Give the index of the paragraph that each of the :param offsets is in."""
+        return np.searchsorted(self._paragraph_starts, offsets, side="right") - 1
 
 
 class WordReconstructable:
-    # @Hayden: The only hard requirement I have here is that you take in this word
-    # document class from the docx library and act on it. You can change the function
-    # signatures for the other methods if you have to, but I'd prefer not if it can be
-    # helped, and try to tell me about how you're changing them as soon as possible.
+    """
+    Highlights sentences in a word document while keeping its paragraphs and the
+    formatting of their runs, by splitting the runs wherever a stretch of sentences
+    that are all highlighted or all not starts.
+    """
+
     def __init__(self, document: Document):
         self._document = document
 
@@ -17,20 +68,13 @@ class WordReconstructable:
         modified and replaced later. The values in the dictionary are the paragraphs as
         strings.
         """
-        # @Hayden: When parsing word docs for the backend I used document.paragraphs,
-        # and the actual paragraph text could be retrieved with paragraph.text. See
-        # https://python-docx.readthedocs.io/en/latest/api/document.html
-        #
-        # @Hayden: To generate the keys you could simply get the paragraphs into a list
-        # and use the index of each paragraph as its key. The following code would do
-        # that.
-        #
-        # return dict(enumerate(paragraph_list))
-        #
-        # The reason that we return a dictionary instead of a list is because I feel
-        # it's less rigid and prone to error, and because it opens the door for only
-        # supplying some of the paragraphs to be highlighted instead of all of them.
-        return {"dummy-key": "dummy value", "dummy-key2": "dummy value 2"}
+        # The reason that we return a dictionary instead of a list is because it's less
+        # rigid and prone to error, and because it opens the door for only supplying
+        # some of the paragraphs to be highlighted instead of all of them.
+        return {
+            key: paragraph.text
+            for key, paragraph in enumerate(self._document.paragraphs)
+        }
 
     @property
     def keys(self):
@@ -38,7 +82,7 @@ class WordReconstructable:
         Return the keys that would be used to uniquely identify paragraphs from the
         paragraphs property.
         """
-        return ["dummy-key", "dummy-key2"]
+        return list(range(len(self._document.paragraphs)))
 
     def highlight(self, annotated_paragraphs):
         """
@@ -48,13 +92,172 @@ class WordReconstructable:
         Each paragraph is represented as a list of tuples. The first item in the tuple
         is a sentence within the paragraph and the second item tells whether this
         sentence should be highlighted. annotated_paragraphs should be a dictionary, and
-        the keys should match those from the paragraphs property.
+        the keys should match those from the paragraphs property. The sentences of a
+        paragraph are joined as they are, so they should include any whitespace between
+        them, like the ones from annotate_paragraphs do.
         """
-        # The docx library seems to work with text runs, which was similar to the libary
-        # that Noah and I were looking at for the frontend. See the first example in
-        # https://python-docx.readthedocs.io/en/latest/
-        pass
+        paragraphs = self._document.paragraphs
+
+        for key, annotated_sentences in annotated_paragraphs.items():
+            paragraph = paragraphs[key]
+
+            runs = _text_runs(paragraph)
+            if runs is None:
+                # Note: Where the text cannot be matched to the runs, the paragraph is
+                # left as it is rather than risk changing what it says.
+                continue
+
+            _highlight_runs(paragraph, runs, merge_runs(annotated_sentences))
 
     @property
     def document(self):
         return self._document
+
+
+def _text_runs(paragraph):
+    """
+    Give the run elements that the text of :param paragraph is made of, in order, or
+    None if its text is not made of its runs alone.
+    """
+    # Newer versions of python-docx count the text of hyperlinks in the text of a
+    # paragraph, and older ones do not.
+    for path in ["./w:r | ./w:hyperlink/w:r", "./w:r"]:
+        runs = paragraph._p.xpath(path)
+        if "".join(Run(r, paragraph).text for r in runs) == paragraph.text:
+            return runs
+
+    return None
+
+
+def _highlight_runs(paragraph, runs, pieces):
+    """
+    Highlight the flagged :param pieces of :param paragraph, which add up to the text
+    of its :param runs. A run that holds parts of more than one piece is split into a
+    copy of the run for each part, so every part keeps the run's formatting.
+    """
+    piece_ends = np.cumsum([len(text) for text, _ in pieces]).tolist()
+    piece_index = 0
+    run_start = 0
+
+    for r in runs:
+        text = Run(r, paragraph).text
+        run_end = run_start + len(text)
+
+        # The parts of the run that each piece covers, as (start, end, highlighted).
+        parts = []
+        start = run_start
+        while start < run_end:
+            while piece_ends[piece_index] <= start:
+                piece_index += 1
+            end = min(piece_ends[piece_index], run_end)
+            parts.append((start, end, pieces[piece_index][1]))
+            start = end
+
+        if len(parts) == 1:
+            if parts[0][2]:
+                Run(r, paragraph).font.highlight_color = HIGHLIGHT_COLOR
+        elif parts:
+            for start, end, highlighted in parts:
+                part = deepcopy(r)
+                r.addprevious(part)
+                part_run = Run(part, paragraph)
+                part_run.text = text[start - run_start : end - run_start]
+                if highlighted:
+                    part_run.font.highlight_color = HIGHLIGHT_COLOR
+            r.getparent().remove(r)
+
+        run_start = run_end
+
+
+def merge_runs(annotated_sentences) -> List[Tuple[str, bool]]:
+    """
+    Join consecutive sentences in :param annotated_sentences, a sequence of (sentence,
+    highlighted) tuples, that are highlighted the same way, so that each can be written
+    as a single run.
+    """
+    return [
+        ("".join(text for text, _ in group), bool(highlighted))
+        for highlighted, group in groupby(annotated_sentences, key=lambda pair: pair[1])
+    ]
+
+
+def annotate_paragraphs(
+    paragraphs: Dict,
+    sentences: List[str],
+    flags,
+    separator="",
+    starts=None,
+) -> Dict[object, List[Tuple[str, bool]]]:
+    """
+    Map the :param flags of :param sentences, which were split from the text of
+    :param paragraphs joined by :param separator, back onto the paragraphs. Gives the
+    annotated paragraphs for WordReconstructable.highlight, where each paragraph is
+    split into as few pieces as its flags allow and the pieces add up to exactly the
+    paragraph's text.
+
+    The whitespace after a sentence is flagged along with it, and a sentence that spans
+    paragraphs is flagged in each of them.
+
+    :param starts: The character offset of each sentence in the joined text, such as
+    the sentence_starts of a PreprocessedText. If they are not given, each sentence is
+    searched for in the text, and sentences that cannot be found are left out.
+    """
+    keys = list(paragraphs)
+    text_length = sum(len(paragraphs[key]) for key in keys)
+    text_length += len(separator) * max(len(keys) - 1, 0)
+
+    if starts is not None:
+        starts = np.asarray(starts).tolist()
+        found_flags = [bool(flag) for flag in flags]
+    else:
+        starts, found_flags = _find_sentences(
+            separator.join(paragraphs[key] for key in keys), sentences, flags
+        )
+
+    # Each sentence's flag covers the text up to the next sentence, and the text before
+    # the first sentence is not flagged.
+    bounds = np.array([0] + starts + [text_length])
+    char_flags = np.repeat([False] + found_flags, np.diff(bounds))
+
+    annotated_paragraphs = {}
+    paragraph_start = 0
+
+    for key in keys:
+        paragraph = paragraphs[key]
+        paragraph_flags = char_flags[paragraph_start : paragraph_start + len(paragraph)]
+
+        # The pieces of the paragraph start wherever its flags change.
+        piece_starts = [0] + (np.flatnonzero(np.diff(paragraph_flags)) + 1).tolist()
+        piece_ends = piece_starts[1:] + [len(paragraph)]
+
+        annotated_paragraphs[key] = [
+            (paragraph[start:end], bool(paragraph_flags[start]))
+            for start, end in zip(piece_starts, piece_ends)
+            if end > start
+        ]
+
+        paragraph_start += len(paragraph) + len(separator)
+
+    return annotated_paragraphs
+
+
+def _find_sentences(text, sentences, flags):
+    """
+    Give the offset in :param text of each of :param sentences that can be found in it,
+    and the flag of each of those sentences.
+    """
+    # Every sentence is found after the previous one, so the text is searched once.
+    starts = []
+    found_flags = []
+    position = 0
+
+    for sentence, flag in zip(sentences, flags):
+        start = text.find(sentence, position)
+        if start == -1:
+            continue
+
+        starts.append(start)
+        found_flags.append(bool(flag))
+        position = start + len(sentence)
+
+    return starts, found_flags
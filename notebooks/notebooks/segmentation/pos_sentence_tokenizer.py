@@ -1,11 +1,11 @@
 from tqdm import tqdm
 
-from notebooks.utils import default_nlp
+from notebooks.utils import load_nlp, SENTENCE_COMPONENTS, POS_COMPONENTS
 
 
 class POSSentenceTokenizer:
     def __init__(self, nlp=None):
-        self.nlp = nlp or default_nlp()
+        self.nlp = nlp or load_nlp(components=SENTENCE_COMPONENTS + POS_COMPONENTS)
 
     def tokenize_list(self, sentences: str, show_loading=False):
         if show_loading:
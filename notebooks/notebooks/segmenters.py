@@ -1,6 +1,127 @@
-from notebooks.utils import split_into_sentences
+from itertools import repeat
+
+import numpy as np
+
+from notebooks.utils import (
+    split_into_sentences,
+    load_nlp,
+    SENTENCE_COMPONENTS,
+    POS_COMPONENTS,
+)
+
+
+class TaggedSegment(str):
+    """
+    A segment of text that also carries the POS tags of its tokens, so that extractors
+    which need the tags do not have to parse the segment again, and the character
+    offset it starts at in the text it was split from. It otherwise behaves exactly like
+    the string it was made from.
+    """
+
+    def __new__(cls, text: str, pos_tags, start=None):
+        segment = super().__new__(cls, text)
+        segment.pos_tags = pos_tags
+        segment.start = start
+
+        return segment
+
+    def __reduce__(self):
+        return TaggedSegment, (str(self), self.pos_tags, self.start)
 
 
 class Sentencizer:
-    def __call__(self, text: str):
-        return list(split_into_sentences(text))
+    def __init__(self, nlp=None, tag=False):
+        """
+        :param nlp: The spacy pipeline to split texts with, the default pipeline is used
+        if this is not given.
+        :param tag: If True, sentences are returned as TaggedSegments tagged from the
+        same parse that split them.
+        """
+        self._nlp = nlp
+        self._tag = tag
+
+    def __call__(self, text: str, boundaries=None):
+        """
+        Split :param text into sentences.
+
+        :param boundaries: Character offsets in :param text that no sentence may cross,
+        such as where each paragraph starts. A sentence that does is split there.
+        """
+        if not self._tag and boundaries is None:
+            return list(split_into_sentences(text, nlp=self._nlp))
+
+        return self._segments(self._get_nlp()(text), boundaries)
+
+    def pipe(self, texts, batch_size=32, boundaries=None):
+        """
+        Split each of :param texts like calling the Sentencizer on it would, but parse
+        the texts :param batch_size at a time. :param boundaries gives the boundaries
+        for each text, if any.
+        """
+        if boundaries is None:
+            boundaries = repeat(None)
+
+        docs = self._get_nlp().pipe(texts, batch_size=batch_size)
+
+        for doc, text_boundaries in zip(docs, boundaries):
+            yield self._segments(doc, text_boundaries)
+
+    def _get_nlp(self):
+        if self._nlp is not None:
+            return self._nlp
+
+        if self._tag:
+            return load_nlp(components=SENTENCE_COMPONENTS + POS_COMPONENTS)
+
+        return load_nlp(components=SENTENCE_COMPONENTS)
+
+    def _segments(self, doc, boundaries=None):
+        sentences = doc.sents
+        if boundaries is not None:
+            sentences = _split_at(doc, np.asarray(boundaries))
+
+        if not self._tag:
+            return [sentence.text for sentence in sentences]
+
+        return [
+            TaggedSegment(
+                sentence.text,
+                [token.pos_ for token in sentence],
+                start=sentence.start_char,
+            )
+            for sentence in sentences
+        ]
+
+
+def _split_at(doc, boundaries):
+    """
+    Give the sentences of :param doc, with any sentence that crosses one of the sorted
+    character offsets in :param boundaries split at the first token from there on.
+    Whitespace at either end of a part is left out, and parts that are only whitespace
+    are dropped.
+    """
+    for sentence in doc.sents:
+        first = np.searchsorted(boundaries, sentence.start_char, side="right")
+        last = np.searchsorted(boundaries, sentence.end_char, side="left")
+
+        if first == last:
+            yield sentence
+            continue
+
+        starts = [sentence.start]
+        token = sentence.start
+
+        for boundary in boundaries[first:last]:
+            while token < sentence.end and doc[token].idx < boundary:
+                token += 1
+
+            starts.append(token)
+
+        for start, end in zip(starts, starts[1:] + [sentence.end]):
+            while start < end and doc[start].is_space:
+                start += 1
+            while end > start and doc[end - 1].is_space:
+                end -= 1
+
+            if end > start:
+                yield doc[start:end]
@@ -0,0 +1,254 @@
+"""
+A compact binary format for the objects that are stored as blobs, like
+PreprocessedText and the profiles. Arrays are stored as their raw buffers and decoded
+with np.frombuffer, so loading an array does not copy it.
+
+Everything is little endian. A serialized object is laid out as
+
+    magic       3 bytes, b"NBF"
+    version     uint8
+    kind        uint16 length, then that many bytes of utf-8
+    count       uint16, the number of fields
+    fields      count of (name, tag, value), where name is a uint8 length and utf-8
+
+and each value depends on its tag:
+
+    b"N"        None, with no value
+    b"i"        int64
+    b"f"        float64
+    b"s"        uint32 length, then utf-8
+    b"t"        a table of strings, as a uint32 count, a uint32 byte length for each
+                string, and then the utf-8 of every string back to back
+    b"a"        an array, as a uint8 length and numpy dtype string, a uint8 number of
+                dimensions, a uint64 for each dimension, padding up to the next multiple
+                of 8 bytes from the start of the buffer, and the C-ordered data
+
+Older blobs were pickled dicts, which never start with the magic bytes, so
+is_serialized tells the two apart.
+"""
+
+import struct
+from io import BytesIO
+
+import numpy as np
+from numpy import ndarray
+
+MAGIC = b"NBF"
+VERSION = 1
+
+# Arrays start at multiples of this from the start of the buffer, so that they are
+# aligned for any dtype when the buffer itself is.
+_ALIGNMENT = 8
+
+_UINT8 = struct.Struct("<B")
+_UINT16 = struct.Struct("<H")
+_UINT32 = struct.Struct("<I")
+_UINT64 = struct.Struct("<Q")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+
+
+class SerializationError(Exception):
+    pass
+
+
+def as_buffer(data):
+    """
+    Give the bytes-like object behind :param data, which is either a BytesIO or already
+    bytes-like, without copying it.
+    """
+    if isinstance(data, BytesIO):
+        # getvalue does not copy a BytesIO that has not been written to, unlike
+        # getbuffer. Slicing does copy, but is only needed if data was partly read.
+        buffer = data.getvalue()
+
+        return buffer if data.tell() == 0 else buffer[data.tell() :]
+
+    return data
+
+
+def is_serialized(buffer) -> bool:
+    """Give whether :param buffer is in this format rather than a pickle."""
+    return bytes(buffer[: len(MAGIC)]) == MAGIC
+
+
+def dumps(kind: str, fields: dict) -> bytes:
+    """
+    Serialize the :param fields of an object of :param kind, which is stored so that
+    readers can check what they are loading. Values must be None, ints, floats,
+    strings, lists of strings or numpy arrays.
+    """
+    writer = _Writer()
+
+    writer.write(MAGIC)
+    writer.write(_UINT8.pack(VERSION))
+    writer.write_text(kind, _UINT16)
+    writer.write(_UINT16.pack(len(fields)))
+
+    for name, value in fields.items():
+        writer.write_text(name, _UINT8)
+        writer.write_value(value)
+
+    return writer.getvalue()
+
+
+def loads(buffer, kind: str = None) -> dict:
+    """
+    Give the fields serialized in :param buffer. Arrays are read-only views of the
+    buffer. If :param kind is given, the buffer must hold an object of that kind.
+    """
+    if not is_serialized(buffer):
+        raise SerializationError("buffer is not in the serialization format")
+
+    reader = _Reader(buffer)
+    reader.offset = len(MAGIC)
+
+    version = reader.read(_UINT8)
+    if version != VERSION:
+        raise SerializationError(f"unsupported serialization version {version}")
+
+    stored_kind = reader.read_text(_UINT16)
+    if kind is not None and stored_kind != kind:
+        raise SerializationError(f"expected a {kind} but found a {stored_kind}")
+
+    count = reader.read(_UINT16)
+
+    return {reader.read_text(_UINT8): reader.read_value() for _ in range(count)}
+
+
+def kind_of(buffer) -> str:
+    """Give the kind of object serialized in :param buffer."""
+    if not is_serialized(buffer):
+        raise SerializationError("buffer is not in the serialization format")
+
+    reader = _Reader(buffer)
+    reader.offset = len(MAGIC) + _UINT8.size
+
+    return reader.read_text(_UINT16)
+
+
+class _Writer:
+    def __init__(self):
+        self._chunks = []
+        self._length = 0
+
+    def write(self, data):
+        self._chunks.append(data)
+        self._length += len(data)
+
+    def write_text(self, text: str, length_struct: struct.Struct):
+        encoded = text.encode("utf-8")
+        self.write(length_struct.pack(len(encoded)))
+        self.write(encoded)
+
+    def write_value(self, value):
+        if value is None:
+            self.write(b"N")
+        elif isinstance(value, (bool, np.bool_)):
+            raise SerializationError("booleans are not supported")
+        elif isinstance(value, (int, np.integer)):
+            self.write(b"i")
+            self.write(_INT64.pack(int(value)))
+        elif isinstance(value, (float, np.floating)):
+            self.write(b"f")
+            self.write(_FLOAT64.pack(float(value)))
+        elif isinstance(value, str):
+            self.write(b"s")
+            self.write_text(value, _UINT32)
+        elif isinstance(value, ndarray):
+            self._write_array(value)
+        elif isinstance(value, (list, tuple)):
+            self._write_table(value)
+        else:
+            raise SerializationError(f"cannot serialize {type(value).__name__}")
+
+    def _write_table(self, strings):
+        encoded = [string.encode("utf-8") for string in strings]
+        lengths = np.array([len(string) for string in encoded], dtype="<u4")
+
+        self.write(b"t")
+        self.write(_UINT32.pack(len(encoded)))
+        self.write(lengths.tobytes())
+        self.write(b"".join(encoded))
+
+    def _write_array(self, array: ndarray):
+        if array.dtype.hasobject:
+            raise SerializationError("arrays of objects are not supported")
+
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+
+        self.write(b"a")
+        self.write_text(array.dtype.str, _UINT8)
+        self.write(_UINT8.pack(array.ndim))
+        for dim in array.shape:
+            self.write(_UINT64.pack(dim))
+
+        self.write(b"\x00" * (-self._length % _ALIGNMENT))
+        # A byte view avoids copying the array into a bytes object before joining.
+        self.write(array.reshape(-1).view(np.uint8).data)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+class _Reader:
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer).cast("B")
+        self.offset = 0
+
+    def read(self, fixed_struct: struct.Struct):
+        (value,) = fixed_struct.unpack_from(self._buffer, self.offset)
+        self.offset += fixed_struct.size
+
+        return value
+
+    def read_bytes(self, length) -> memoryview:
+        data = self._buffer[self.offset : self.offset + length]
+        if len(data) != length:
+            raise SerializationError("buffer ended unexpectedly")
+
+        self.offset += length
+
+        return data
+
+    def read_text(self, length_struct: struct.Struct) -> str:
+        return str(self.read_bytes(self.read(length_struct)), "utf-8")
+
+    def read_value(self):
+        tag = bytes(self.read_bytes(1))
+
+        if tag == b"N":
+            return None
+        if tag == b"i":
+            return self.read(_INT64)
+        if tag == b"f":
+            return self.read(_FLOAT64)
+        if tag == b"s":
+            return self.read_text(_UINT32)
+        if tag == b"t":
+            return self._read_table()
+        if tag == b"a":
+            return self._read_array()
+
+        raise SerializationError(f"unknown tag {tag!r}")
+
+    def _read_table(self):
+        count = self.read(_UINT32)
+        lengths = np.frombuffer(self.read_bytes(count * 4), dtype="<u4")
+        data = self.read_bytes(int(lengths.sum()))
+
+        ends = np.cumsum(lengths).tolist()
+        starts = [0] + ends[:-1]
+
+        return [str(data[start:end], "utf-8") for start, end in zip(starts, ends)]
+
+    def _read_array(self) -> ndarray:
+        dtype = np.dtype(self.read_text(_UINT8))
+        ndim = self.read(_UINT8)
+        shape = tuple(self.read(_UINT64) for _ in range(ndim))
+
+        self.offset += -self.offset % _ALIGNMENT
+        count = int(np.prod(shape))
+        data = self.read_bytes(count * dtype.itemsize)
+
+        return np.frombuffer(data, dtype=dtype, count=count).reshape(shape)
@@ -0,0 +1,262 @@
+"""
+A featurization server, so that one warm TextProcessor can serve many processes
+instead of each of them loading spacy and the feature resources.
+
+Start it with
+
+    python -m notebooks.server /path/to/featurization.sock
+
+and process texts from any other process with FeaturizationClient. Texts that arrive
+while the processor is busy are processed together in a single batch.
+
+Every message on the socket is a 4 byte big endian length followed by that many bytes.
+A request is the number of boundaries in the text as a 4 byte big endian integer, the
+boundaries as 4 byte big endian character offsets, and then the text encoded as utf-8.
+A response starts with a status byte, followed by the binary of the PreprocessedText
+when the status is _OK, or an utf-8 error message when it is _ERROR.
+"""
+
+import argparse
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from io import BytesIO
+
+_HEADER = struct.Struct("!I")
+
+_OK = b"\x00"
+_ERROR = b"\x01"
+
+
+class FeaturizationError(Exception):
+    pass
+
+
+class FeaturizationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves a TextProcessor on a Unix socket. Each connection is handled on its own
+    thread, which hands its texts to a single batching thread that owns the processor.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, processor=None, max_batch_size=16, max_wait=0.01):
+        """
+        :param path: The path of the Unix socket to listen on.
+        :param processor: The TextProcessor to serve, which is loaded if not given. Any
+        object with a batch method that maps a list of texts and their boundaries to a
+        list of PreprocessedTexts works.
+        :param max_batch_size: The most texts to process in one batch.
+        :param max_wait: The longest time in seconds to wait for more texts to batch
+        with the first one.
+        """
+        if processor is None:
+            from notebooks import TextProcessor
+
+            processor = TextProcessor()
+
+        self._processor = processor
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._requests = queue.Queue()
+
+        self._batch_thread = threading.Thread(target=self._batch_loop, daemon=True)
+        self._batch_thread.start()
+
+        super().__init__(path, _FeaturizationHandler)
+
+    def process(self, text: str, boundaries=None):
+        """
+        Process :param text, with the sentence :param boundaries the TextProcessor
+        takes, as part of the next batch and wait for the result.
+        """
+        future = Future()
+        self._requests.put((text, boundaries, future))
+
+        return future.result()
+
+    def server_close(self):
+        super().server_close()
+
+        self._requests.put(None)
+        self._batch_thread.join()
+
+    def _batch_loop(self):
+        while True:
+            batch = self._next_batch()
+
+            if batch is None:
+                return
+
+            texts, boundaries, futures = zip(*batch)
+
+            try:
+                results = self._processor.batch(
+                    list(texts), boundaries=list(boundaries)
+                )
+            except Exception as error:
+                if len(batch) == 1:
+                    futures[0].set_exception(error)
+                    continue
+
+                # Process the texts one at a time, so that a text the processor fails
+                # on does not fail the others that happened to be batched with it.
+                for text, text_boundaries, future in batch:
+                    self._process_single(text, text_boundaries, future)
+            else:
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+
+    def _process_single(self, text, boundaries, future):
+        try:
+            result = self._processor.batch([text], boundaries=[boundaries])[0]
+            future.set_result(result)
+        except Exception as error:
+            future.set_exception(error)
+
+    def _next_batch(self):
+        """
+        Wait for a request and then collect any others that arrive within max_wait.
+        Gives None once the server is closed.
+        """
+        request = self._requests.get()
+        if request is None:
+            return None
+
+        batch = [request]
+        deadline = time.monotonic() + self._max_wait
+
+        while len(batch) < self._max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            try:
+                request = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+
+            if request is None:
+                # Put the sentinel back so the loop stops after this batch.
+                self._requests.put(None)
+                break
+
+            batch.append(request)
+
+        return batch
+
+
+class _FeaturizationHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                text, boundaries = decode_request(receive_message(self.request))
+            except ConnectionError:
+                return
+
+            try:
+                response = _OK + self.server.process(text, boundaries).binary.getvalue()
+            except Exception as error:
+                response = _ERROR + repr(error).encode("utf-8")
+
+            send_message(self.request, response)
+
+
+class FeaturizationClient:
+    """
+    Processes texts with a FeaturizationServer. It is called like a TextProcessor, and
+    opens a new connection for each text so that it can be shared between threads.
+    """
+
+    def __init__(self, path, timeout=None):
+        """
+        :param path: The path of the server's Unix socket.
+        :param timeout: The longest time in seconds to wait for a text to be processed,
+        or None to wait indefinitely.
+        """
+        self._path = path
+        self._timeout = timeout
+
+    def __call__(self, text: str, boundaries=None):
+        from notebooks import PreprocessedText
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(self._timeout)
+            connection.connect(self._path)
+
+            send_message(connection, encode_request(text, boundaries))
+            response = receive_message(connection)
+
+        if response[:1] != _OK:
+            raise FeaturizationError(response[1:].decode("utf-8"))
+
+        return PreprocessedText(BytesIO(response[1:]))
+
+
+def encode_request(text: str, boundaries=None) -> bytes:
+    boundaries = [] if boundaries is None else [int(offset) for offset in boundaries]
+
+    return (
+        _HEADER.pack(len(boundaries))
+        + struct.pack(f"!{len(boundaries)}I", *boundaries)
+        + text.encode("utf-8")
+    )
+
+
+def decode_request(payload: bytes):
+    """Give the text and boundaries in :param payload, with None for no boundaries."""
+    (count,) = _HEADER.unpack_from(payload)
+    boundaries = struct.unpack_from(f"!{count}I", payload, _HEADER.size)
+    text = payload[_HEADER.size * (count + 1) :].decode("utf-8")
+
+    return text, list(boundaries) if count else None
+
+
+def send_message(connection, payload: bytes):
+    connection.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def receive_message(connection) -> bytes:
+    (length,) = _HEADER.unpack(_receive_exactly(connection, _HEADER.size))
+
+    return _receive_exactly(connection, length)
+
+
+def _receive_exactly(connection, size) -> bytes:
+    chunks = []
+
+    while size > 0:
+        chunk = connection.recv(min(size, 1 << 16))
+        if not chunk:
+            raise ConnectionError("connection closed mid message")
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", help="The path of the Unix socket to listen on.")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait", type=float, default=0.01)
+    args = parser.parse_args()
+
+    # A socket left behind by a server that did not shut down cleanly.
+    if os.path.exists(args.path):
+        os.remove(args.path)
+
+    with FeaturizationServer(
+        args.path, max_batch_size=args.max_batch_size, max_wait=args.max_wait
+    ) as server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
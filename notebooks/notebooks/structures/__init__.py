@@ -4,3 +4,11 @@ from notebooks.structures._padded_array import (  # noqa: F401
     EmptyListException,
     EmptyArrayException,
 )
+from notebooks.structures._ragged_array import (  # noqa: F401
+    RaggedArray,
+    segment_sum,
+    segment_mean,
+    segment_var,
+    segment_norm,
+)
+from notebooks.structures._quantile_sketch import QuantileSketch  # noqa: F401
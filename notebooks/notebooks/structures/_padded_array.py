@@ -2,62 +2,125 @@ import numpy as np
 from numpy import ndarray
 from typing import List
 
+from notebooks.structures._ragged_array import RaggedArray, segment_mean
+
 
-# Note: In the future padded array operations can be optimized, because they can treat
-#       the data as not padded if necessary. A boolean attribute telling whether the
-#       data is actually padded would accomplish this.
 # Note: We technically shouldn't expose data because it makes too many promises about
 #       internal data. However, making it private would cost a lot of convenience and
 #       I don't currently see it being a problem.
 class PaddedArray:
     """
     Pads arrays with zeroes so that they are all of shape (max_length, feature_dim).
+
+    The arrays are kept unpadded, as the rows of every array stacked into one
+    (num_rows, feature_dim) array of values and the offsets of each array's first row
+    followed by the total row count, so array i is values[offsets[i]:offsets[i + 1]].
+    The padded data is only built the first time it is asked for, so code that can
+    work on the values and offsets never pays for the padding.
     """
 
-    # TODO: Decide during benchmarking if this needs optimizing and if so optimize for
-    #       special cases.
-    def __init__(self, arrays: List[ndarray]):
+    def __init__(self, arrays: List[ndarray], dtype=np.float64):
         """
         :param arrays: A list of numpy arrays to pad.
+        :param dtype: The dtype of the padded data.
         """
         if len(arrays) == 0:
             raise EmptyListException("arrays parameter must not be empty")
 
-        for array in arrays:
-            if array.size == 0:
-                raise EmptyArrayException("Found an empty array")
+        lengths = np.array([len(array) for array in arrays])
+
+        self._init(np.concatenate(arrays), _offsets(lengths), dtype)
 
-        lengths = [array.shape[0] for array in arrays]
+    @classmethod
+    def from_ragged(cls, values: ndarray, offsets: ndarray, dtype=None):
+        """
+        Make a PaddedArray of the arrays in :param values split at :param offsets,
+        without splitting them into separate arrays first.
+        :param values: The rows of every array stacked into one (num_rows, feature_dim)
+        array.
+        :param offsets: The index of each array's first row in :param values, followed
+        by the total row count.
+        :param dtype: The dtype of the padded data, the dtype of :param values is kept
+        if not given, in which case :param values is not copied.
+        """
+        if len(offsets) < 2:
+            raise EmptyListException("offsets parameter must give at least one array")
 
-        # Arrays should be padded to max length by feature dimension
-        max_length = max(lengths)
-        # TODO: This line may need to change if emtpy arrays are supported
-        feature_dim = arrays[0].shape[1]
+        padded_array = cls.__new__(cls)
+        padded_array._init(values, np.asarray(offsets), dtype)
 
-        # We pad with zeros, not supporting any other type of padding
-        data = np.zeros([len(arrays), max_length, feature_dim])
+        return padded_array
 
-        for index, (array, length) in enumerate(zip(arrays, lengths)):
-            data[index, 0:length] = array
+    def _init(self, values, offsets, dtype):
+        lengths = np.diff(offsets)
 
-        self._data = data
-        self._lengths = np.array(lengths)
+        # TODO: Empty arrays may need to be supported.
+        if np.any(lengths == 0) or values.size == 0:
+            raise EmptyArrayException("Found an empty array")
+
+        # Rows outside of the arrays are dropped, so that offsets always start at 0 and
+        # end at the row count.
+        self._values = np.asarray(values[offsets[0] : offsets[-1]], dtype=dtype)
+        self._offsets = offsets - offsets[0]
+        self._lengths = lengths
+        self._data = None
 
     @property
     def data(self) -> ndarray:
         """The padded data."""
+        if self._data is None:
+            self._data = self._pad()
+
         return self._data
 
+    @property
+    def values(self) -> ndarray:
+        """The rows of every array stacked into one (num_rows, feature_dim) array."""
+        return self._values
+
+    @property
+    def offsets(self) -> ndarray:
+        """The index of each array's first row in values, and the total row count."""
+        return self._offsets
+
+    @property
+    def ragged(self) -> RaggedArray:
+        """The arrays as a RaggedArray of the values, without the padding."""
+        return RaggedArray(self._values, self._offsets)
+
     @property
     def lengths(self) -> ndarray:
         """The lengths of each array"""
         return self._lengths
 
+    def _pad(self) -> ndarray:
+        num_arrays = len(self._lengths)
+        feature_dim = self._values.shape[1]
+
+        # We pad with zeros, not supporting any other type of padding
+        data = np.zeros(
+            [num_arrays, self._lengths.max(), feature_dim], dtype=self._values.dtype
+        )
+
+        # Every row is scattered to its array and its position within the array at
+        # once.
+        arrays = np.repeat(np.arange(num_arrays), self._lengths)
+        positions = np.arange(len(arrays)) - np.repeat(
+            self._offsets[:-1], self._lengths
+        )
+        data[arrays, positions] = self._values
+
+        return data
+
 
 def padded_mean(padded_array: PaddedArray):
     """Give the mean of the :param padded_array along axis 1"""
-    # Lengths are reshaped so that they align with the first dimension
-    return np.sum(padded_array.data, axis=1) / padded_array.lengths[..., None]
+    # The padding adds nothing to the sums, so the mean can skip it altogether.
+    return segment_mean(padded_array.values, padded_array.offsets)
+
+
+def _offsets(lengths: ndarray) -> ndarray:
+    return np.concatenate([[0], np.cumsum(lengths)])
 
 
 class EmptyListException(Exception):
@@ -0,0 +1,120 @@
+import math
+
+import numpy as np
+from numpy import ndarray
+
+
+class QuantileSketch:
+    """
+    A mergeable summary of a stream of numbers that answers quantile queries in
+    bounded memory, following the KLL sketch. Items are kept in levels, where an item on
+    level h stands for 2 ** h items of the stream. When a level overflows it is sorted
+    and every other item is promoted to the level above, so the sketch holds
+    O(k log(n / k)) items for a stream of n numbers and the rank of any quantile is off
+    by roughly n / k.
+    While fewer than k numbers have been added, quantiles are exact.
+    """
+
+    def __init__(self, k=200):
+        """
+        :param k: The capacity of the top level. Larger values give more accurate
+        quantiles at the cost of memory.
+        """
+        self._k = k
+        self._levels = [np.zeros(0)]
+        # The number of times each level has been compacted, used to alternate which
+        # half of a level is promoted so that the errors cancel out.
+        self._compactions = [0]
+
+    @property
+    def count(self) -> int:
+        """The number of items that have been added to the sketch."""
+        return sum(len(items) * 2**level for level, items in enumerate(self._levels))
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes taken by the items in the sketch."""
+        return sum(items.nbytes for items in self._levels)
+
+    def update(self, values: ndarray):
+        """Add each of :param values to the sketch."""
+        self._levels[0] = np.concatenate([self._levels[0], np.ravel(values)])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch"):
+        """Add every item summarized by :param other to this sketch."""
+        for level, items in enumerate(other._levels):
+            self._grow(level)
+            self._levels[level] = np.concatenate([self._levels[level], items])
+
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        """
+        Give the item at index floor(n * :param q) of the n added items if they were
+        sorted.
+        """
+        items = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2**level) for level, items in enumerate(self._levels)]
+        )
+
+        order = np.argsort(items, kind="stable")
+        cumulative_weights = np.cumsum(weights[order])
+
+        rank = math.floor(self.count * q)
+        index = np.searchsorted(cumulative_weights, rank, side="right")
+
+        return float(items[order][min(index, len(items) - 1)])
+
+    @property
+    def state(self) -> dict:
+        """The contents of the sketch, which can be given back to from_state."""
+        return {
+            "k": self._k,
+            "levels": list(self._levels),
+            "compactions": list(self._compactions),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "QuantileSketch":
+        sketch = cls(k=state["k"])
+        sketch._levels = list(state["levels"])
+        sketch._compactions = list(state["compactions"])
+
+        return sketch
+
+    def _capacity(self, level) -> int:
+        # Lower levels get geometrically smaller capacities than the top level.
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self._k * (2.0 / 3.0) ** depth))
+
+    def _grow(self, level):
+        while len(self._levels) <= level:
+            self._levels.append(np.zeros(0))
+            self._compactions.append(0)
+
+    def _compress(self):
+        level = 0
+
+        while level < len(self._levels):
+            items = self._levels[level]
+
+            if len(items) > self._capacity(level):
+                self._grow(level + 1)
+
+                items = np.sort(items)
+                # An odd item out stays on this level so that the total weight of the
+                # sketch is unchanged.
+                even_length = len(items) - len(items) % 2
+                compacted, kept = items[:even_length], items[even_length:]
+
+                offset = self._compactions[level] % 2
+                self._compactions[level] += 1
+
+                self._levels[level + 1] = np.concatenate(
+                    [self._levels[level + 1], compacted[offset::2]]
+                )
+                self._levels[level] = kept
+
+            level += 1
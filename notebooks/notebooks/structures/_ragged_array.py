@@ -0,0 +1,203 @@
+from io import BytesIO
+from typing import List
+
+import numpy as np
+from numpy import ndarray
+
+from notebooks import serialization
+
+
+class RaggedArray:
+    """
+    A sequence of arrays of different lengths, such as the sentence features of many
+    texts, stored as the rows of every array stacked into one (num_rows, ...) array of
+    values and the offsets of each array's first row followed by the total row count.
+    Array i is values[offsets[i]:offsets[i + 1]].
+
+    Reductions over each array are done on all of them at once, and slicing gives views
+    of the values rather than copies.
+    """
+
+    def __init__(self, values: ndarray, offsets: ndarray):
+        """
+        :param values: The rows of every array stacked into one array.
+        :param offsets: The index of each array's first row in :param values, followed
+        by the total row count. Rows outside of the arrays are dropped.
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+
+        if offsets.ndim != 1 or len(offsets) == 0:
+            raise ValueError("offsets must be a non-empty 1-D array")
+        if np.any(np.diff(offsets) < 0):
+            raise ValueError("offsets must not decrease")
+
+        self._values = values[offsets[0] : offsets[-1]]
+        self._offsets = offsets - offsets[0]
+
+    @classmethod
+    def from_arrays(cls, arrays: List[ndarray]) -> "RaggedArray":
+        """Stack :param arrays, which must agree on every dimension but the first."""
+        lengths = [len(array) for array in arrays]
+
+        return cls(np.concatenate(arrays), np.concatenate([[0], np.cumsum(lengths)]))
+
+    @classmethod
+    def from_binary(cls, data) -> "RaggedArray":
+        """
+        Load the RaggedArray in :param data, a BytesIO or bytes-like object given by
+        binary. The values are a read-only view of :param data.
+        """
+        fields = serialization.loads(serialization.as_buffer(data), kind="RaggedArray")
+
+        return cls(fields["values"], fields["offsets"])
+
+    @property
+    def values(self) -> ndarray:
+        """The rows of every array stacked into one array."""
+        return self._values
+
+    @property
+    def offsets(self) -> ndarray:
+        """The index of each array's first row in values, and the total row count."""
+        return self._offsets
+
+    @property
+    def lengths(self) -> ndarray:
+        """The length of each array."""
+        return np.diff(self._offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return self._values.nbytes + self._offsets.nbytes
+
+    @property
+    def binary(self) -> BytesIO:
+        fields = {"values": self._values, "offsets": self._offsets}
+
+        return BytesIO(serialization.dumps("RaggedArray", fields))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        for start, end in zip(self._offsets[:-1], self._offsets[1:]):
+            yield self._values[start:end]
+
+    def __getitem__(self, index):
+        """
+        Give array :param index when it is an integer, and a RaggedArray of the chosen
+        arrays when it is a slice, a sequence of indices or a boolean mask. Integers
+        and slices with a step of 1 give views of the values.
+        """
+        if isinstance(index, (int, np.integer)):
+            if not -len(self) <= index < len(self):
+                raise IndexError(
+                    f"index {index} is out of range for {len(self)} arrays"
+                )
+
+            index = index % len(self)
+
+            return self._values[self._offsets[index] : self._offsets[index + 1]]
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+
+            if step == 1:
+                return RaggedArray(
+                    self._values, self._offsets[start : max(start, stop) + 1]
+                )
+
+        indices = np.arange(len(self))[index]
+        starts = self._offsets[indices]
+        lengths = self._offsets[indices + 1] - starts
+
+        # The rows of every chosen array, gathered in one go.
+        rows = np.arange(lengths.sum()) + np.repeat(
+            starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths
+        )
+
+        return RaggedArray(
+            self._values[rows], np.concatenate([[0], np.cumsum(lengths)])
+        )
+
+    def sum(self) -> ndarray:
+        """Give the sum of each array along its first axis."""
+        return segment_sum(self._values, self._offsets)
+
+    def mean(self) -> ndarray:
+        """Give the mean of each array along its first axis."""
+        return segment_mean(self._values, self._offsets)
+
+    def var(self, ddof=0) -> ndarray:
+        """Give the variance of each array along its first axis."""
+        return segment_var(self._values, self._offsets, ddof=ddof)
+
+    def norm(self) -> ndarray:
+        """Give the euclidean norm of each array along its first axis."""
+        return segment_norm(self._values, self._offsets)
+
+
+def segment_sum(values: ndarray, offsets: ndarray) -> ndarray:
+    """
+    Give the sum of the rows of :param values between each pair of consecutive
+    :param offsets, along axis 0. Empty segments sum to zero.
+    """
+    lengths = np.diff(offsets)
+    starts = offsets[:-1]
+
+    if np.all(lengths > 0):
+        return np.add.reduceat(values[: offsets[-1]], starts, axis=0)
+
+    # reduceat gives the row at the offset of an empty segment rather than zeros, so
+    # only the other segments are reduced. Each of those still ends at the start of
+    # the next one, since only empty segments are skipped in between.
+    sums = np.zeros((len(lengths),) + values.shape[1:], dtype=values.dtype)
+
+    filled = lengths > 0
+    if np.any(filled):
+        sums[filled] = np.add.reduceat(values[: offsets[-1]], starts[filled], axis=0)
+
+    return sums
+
+
+def segment_mean(values: ndarray, offsets: ndarray) -> ndarray:
+    """
+    Give the mean of the rows of :param values between each pair of consecutive
+    :param offsets, along axis 0.
+    """
+    lengths = np.diff(offsets)
+
+    return segment_sum(values, offsets) / _align(lengths, values)
+
+
+def segment_var(values: ndarray, offsets: ndarray, ddof=0) -> ndarray:
+    """
+    Give the variance of the rows of :param values between each pair of consecutive
+    :param offsets, along axis 0, with :param ddof delta degrees of freedom.
+    """
+    lengths = np.diff(offsets)
+    means = segment_mean(values, offsets)
+
+    # The deviations are taken from the means rather than using the mean of the
+    # squares, which loses precision when the variance is small next to the mean. They
+    # are computed in place, since allocating them costs as much as reducing them.
+    deviations = np.repeat(means, lengths, axis=0)
+    np.subtract(values[offsets[0] : offsets[-1]], deviations, out=deviations)
+    np.multiply(deviations, deviations, out=deviations)
+
+    return segment_sum(deviations, offsets - offsets[0]) / _align(
+        lengths - ddof, values
+    )
+
+
+def segment_norm(values: ndarray, offsets: ndarray) -> ndarray:
+    """
+    Give the euclidean norm of the rows of :param values between each pair of
+    consecutive :param offsets, along axis 0.
+    """
+    return np.sqrt(segment_sum(values * values, offsets))
+
+
+def _align(lengths: ndarray, values: ndarray) -> ndarray:
+    """Reshape :param lengths so that they divide the segment reductions of values."""
+    return lengths.reshape([-1] + [1] * (values.ndim - 1))
@@ -11,19 +11,26 @@ class SimpleThresholder(BaseThresholder):
 
     def __init__(self, score_func):
         """
-        :param score_func: The benchmarking function to use for choosing the cutoff.
+        :param score_func: The benchmarking function to use for choosing the cutoff. If
+        it has a cutoff_scores attribute, like the functions in benchmarking, every
+        cutoff is scored from the sorted labels in one pass. Otherwise it is called on
+        the classifications for every cutoff at once, which takes quadratic memory.
         """
         self._score_func = score_func
 
     def _threshold(self, distances: ndarray, labels: ndarray) -> float:
-        sorted_distances = np.sort(distances)
+        order = np.argsort(distances, kind="stable")
         # We should also check if all distances should be flagged
-        sorted_distances = np.insert(sorted_distances, 0, -1.0)
+        sorted_distances = np.insert(distances[order], 0, -1.0)
 
-        # classifications[i] should be the classifications for the ith sorted distance
-        classifications = distances[None, :] > sorted_distances[:, None]
+        if hasattr(self._score_func, "cutoff_scores"):
+            scores = self._cutoff_scores(sorted_distances, labels[order])
+        else:
+            # classifications[i] should be the classifications for the ith sorted
+            # distance
+            classifications = distances[None, :] > sorted_distances[:, None]
 
-        scores = self._score_func(classifications, labels[None, :])
+            scores = self._score_func(classifications, labels[None, :])
 
         best_index = np.argmax(scores)
 
@@ -41,3 +48,18 @@ class SimpleThresholder(BaseThresholder):
         # We want the median of the cutoff and the next distance, since this should
         # generalize a bit better.
         return (best_cutoff + after_cutoff) / 2
+
+    def _cutoff_scores(self, sorted_distances: ndarray, sorted_labels: ndarray):
+        """
+        Score flagging every distance greater than each of :param sorted_distances,
+        where :param sorted_labels are the labels of the distances in sorted order.
+        """
+        # Scores by the number of distances left unflagged.
+        count_scores = self._score_func.cutoff_scores(sorted_labels)
+
+        # Distances tied with a cutoff are all left unflagged along with it.
+        unflagged_counts = np.searchsorted(
+            sorted_distances[1:], sorted_distances, side="right"
+        )
+
+        return count_scores[unflagged_counts]
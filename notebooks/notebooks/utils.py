@@ -1,45 +1,105 @@
 import os
+import threading
 from collections import Counter
 from os.path import join
 
-import spacy
-from torchtext.vocab import Vocab
-import pandas as pd
-
-
-class POSVocab(Vocab):
-    def __init__(self):
-        # Note, this seems to preserve order but come back here if models stop working
-        # after using a different vocab instance
-        pos_glossary = {
-            "ADJ",
-            "ADP",
-            "ADV`",
-            "AUX",
-            "CONJ",
-            "CCONJ",
-            "DET",
-            "INTJ",
-            "NOUN",
-            "NUM",
-            "PART",
-            "PRON",
-            "PROPN",
-            "PUNCT",
-            "SCONJ",
-            "SYM",
-            "VERB"
-            # "X", We are not including "other" because that is handled by <UNK> with
-            # the torchtext vocab.
-            # "EOL", We'll let the models treat EOL and SPACE tokens as unknown.
-            # "SPACE",
-        }
-
-        super().__init__(Counter(pos_glossary))
+
+def __getattr__(name):
+    # POSVocab is only defined when it is first used, since it subclasses torchtext's
+    # Vocab and importing torchtext is slow.
+    if name == "POSVocab":
+        return _pos_vocab_class()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _pos_vocab_class():
+    global POSVocab
+
+    if "POSVocab" not in globals():
+        from torchtext.vocab import Vocab
+
+        class POSVocab(Vocab):
+            def __init__(self):
+                # Note, this seems to preserve order but come back here if models
+                # stop working after using a different vocab instance
+                pos_glossary = {
+                    "ADJ",
+                    "ADP",
+                    "ADV`",
+                    "AUX",
+                    "CONJ",
+                    "CCONJ",
+                    "DET",
+                    "INTJ",
+                    "NOUN",
+                    "NUM",
+                    "PART",
+                    "PRON",
+                    "PROPN",
+                    "PUNCT",
+                    "SCONJ",
+                    "SYM",
+                    "VERB",
+                    # "X", We are not including "other" because that is handled by
+                    # <UNK> with the torchtext vocab.
+                    # "EOL", We'll let the models treat EOL and SPACE tokens as
+                    # unknown.
+                    # "SPACE",
+                }
+
+                super().__init__(Counter(pos_glossary))
+
+    return POSVocab
+
+
+# The components each kind of consumer needs from en_core_web_sm. The tagger listens to
+# the shared tok2vec layer, and senter gives sentence boundaries without running the
+# parser.
+SENTENCE_COMPONENTS = ("tok2vec", "senter")
+POS_COMPONENTS = ("tok2vec", "tagger", "attribute_ruler")
+
+_nlp_registry = {}
+_nlp_registry_lock = threading.Lock()
+
+
+def load_nlp(model="en_core_web_sm", components=None):
+    """
+    Get the spacy pipeline for :param model, which is loaded on first use and shared by
+    every later caller in the process.
+
+    :param components: The names of the pipeline components to run, all others are
+    disabled. Components that are disabled by default (like senter) are enabled if they
+    are asked for. If None, the default pipeline of the model is used.
+    """
+    key = (model, None if components is None else frozenset(components))
+
+    with _nlp_registry_lock:
+        if key not in _nlp_registry:
+            _nlp_registry[key] = _load_nlp(model, components)
+
+        return _nlp_registry[key]
+
+
+def _load_nlp(model, components):
+    import spacy
+
+    nlp = spacy.load(model)
+
+    if components is None:
+        return nlp
+
+    for name in nlp.component_names:
+        if name in components and name in nlp.disabled:
+            nlp.enable_pipe(name)
+        elif name not in components and name not in nlp.disabled:
+            nlp.disable_pipe(name)
+
+    return nlp
 
 
 def split_text(text: str, sentences_per_split, nlp=None):
-    nlp = nlp or default_nlp()
+    nlp = nlp or load_nlp(components=SENTENCE_COMPONENTS)
     doc = nlp(text)
 
     splits = []
@@ -58,11 +118,11 @@ def split_text(text: str, sentences_per_split, nlp=None):
 
 
 def default_nlp():
-    return spacy.load("en_core_web_sm")
+    return load_nlp()
 
 
 def split_into_sentences(text: str, nlp=None):
-    nlp = nlp or default_nlp()
+    nlp = nlp or load_nlp(components=SENTENCE_COMPONENTS)
 
     doc = nlp(text)
 
@@ -83,18 +143,20 @@ def init_data_dir(project_path):
 
 
 def tokenize(sentence: str, nlp=None):
-    nlp = nlp or default_nlp()
+    nlp = nlp or load_nlp(components=POS_COMPONENTS)
 
     return [str(token.pos_) for token in nlp(sentence)]
 
 
 def pos_tag(sentence: list, pos_vocab=None):
-    pos_vocab = pos_vocab or POSVocab()
+    pos_vocab = pos_vocab or _pos_vocab_class()()
 
     return [pos_vocab[token] for token in sentence]
 
 
 def extract_author_texts(author, df):
+    import pandas as pd
+
     excluded_text, new_df = df.loc[(author, 0)], df.drop(index=(author, 0))
 
     try:
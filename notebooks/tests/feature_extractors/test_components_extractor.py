@@ -0,0 +1,64 @@
+from notebooks.feature_extractors import (
+    ComponentsExtractor,
+    FeatureSelector,
+    FeatureConcatenator,
+    CommaCounter,
+    WordCounter,
+    CharCounter,
+)
+from tests import tutils
+import numpy as np
+import pandas as pd
+
+
+class TestComponentsExtractor:
+    segments = ["A sentence, with commas, in it.", "hi", "one, two, three, four"]
+
+    raw_extractor = FeatureConcatenator(CommaCounter(), WordCounter(), CharCounter())
+
+    def test_components_extractor_should_project_features(self):
+        components = np.array([[1.0, 0.5], [2.0, -1.0], [0.0, 0.1]])
+        extractor = ComponentsExtractor(self.raw_extractor, components)
+
+        features = extractor(self.segments)
+
+        expected_features = self.raw_extractor(self.segments).dot(components)
+        assert tutils.npclose(features, expected_features)
+
+    def test_components_extractor_should_compile_chains(self):
+        columns = [2, 0]
+        first_components = np.array([[1.0, 2.0, 3.0], [-1.0, 0.5, 0.0]])
+        second_components = np.array([[0.5], [2.0], [-1.0]])
+
+        extractor = ComponentsExtractor(
+            ComponentsExtractor(
+                FeatureSelector(self.raw_extractor, columns), first_components
+            ),
+            second_components,
+        )
+
+        features = extractor(self.segments)
+
+        raw_features = self.raw_extractor(self.segments)
+        expected_features = (
+            raw_features[:, columns].dot(first_components).dot(second_components)
+        )
+        assert extractor._extractor is self.raw_extractor
+        assert tutils.npclose(features, expected_features)
+
+    def test_components_extractor_should_keep_dataframe_index(self):
+        segments = pd.DataFrame(
+            self.segments,
+            columns=["text"],
+            index=pd.MultiIndex.from_tuples([(0, 0), (0, 1), (1, 0)]),
+        )
+        extractor = ComponentsExtractor(
+            FeatureSelector(self.raw_extractor, [1]), np.array([[2.0, 3.0]])
+        )
+
+        features = extractor(segments)
+
+        assert features.index.equals(segments.index)
+        assert tutils.npclose(
+            features.to_numpy(), np.array([[12.0, 18.0], [2.0, 3.0], [8.0, 12.0]])
+        )
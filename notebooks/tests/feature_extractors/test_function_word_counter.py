@@ -0,0 +1,54 @@
+from notebooks.feature_extractors import FunctionWordCounter
+from tests import tutils
+import numpy as np
+import pytest
+
+
+def counts_of(features, function_word_counter, words):
+    return features[:, [function_word_counter._words.index(word) for word in words]]
+
+
+class TestFunctionWordCounter:
+    segment_sets = [
+        ["I went to the store, and the dog came.", "The cat is at the door"],
+        ["we saw the the the cats", "They, the ones over there, left the."],
+        ["NASA A man and a dog", "xthe thex the"],
+    ]
+
+    words = ["the", "and", "a", "i"]
+
+    expected_count_sets = [
+        np.array([[2.0, 1.0, 0.0, 1.0], [2.0, 0.0, 0.0, 0.0]]),
+        # Repeated words share the spaces between them and are only counted every
+        # other time, the same as counting " the " with str.count.
+        np.array([[2.0, 0.0, 0.0, 0.0], [2.0, 0.0, 0.0, 0.0]]),
+        # "Word " is counted anywhere, even at the end of another word.
+        np.array([[0.0, 1.0, 3.0, 0.0], [0.0, 0.0, 0.0, 0.0]]),
+    ]
+
+    @pytest.mark.parametrize(
+        "segments, expected_counts", zip(segment_sets, expected_count_sets)
+    )
+    def test_function_word_counter_should_count_function_words(
+        self, segments, expected_counts
+    ):
+        function_word_counter = FunctionWordCounter()
+
+        features = function_word_counter(segments)
+
+        assert features.shape == (len(segments), len(function_word_counter._words))
+        assert features.dtype == float
+        assert tutils.npequal(
+            counts_of(features, function_word_counter, self.words), expected_counts
+        )
+
+    @pytest.mark.parametrize("segments", segment_sets)
+    def test_segment_and_batch_extraction_should_agree(self, segments):
+        function_word_counter = FunctionWordCounter()
+
+        features = function_word_counter(segments)
+
+        for segment, segment_features in zip(segments, features):
+            assert function_word_counter._segment_extract(segment) == list(
+                segment_features
+            )
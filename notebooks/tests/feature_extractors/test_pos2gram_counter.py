@@ -0,0 +1,89 @@
+from notebooks.feature_extractors import POS2GramCounter
+from notebooks.feature_extractors._pos2gram_counter import posVector
+from notebooks.segmenters import TaggedSegment
+from tests import tutils
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+
+
+def bigram_column(first, second):
+    return posVector.index(first) * len(posVector) + posVector.index(second)
+
+
+class MockNLP:
+    """Tags words ending in a period as PUNCT and everything else as NOUN."""
+
+    def __init__(self):
+        self.pipe_calls = []
+
+    def __call__(self, text):
+        return [
+            SimpleNamespace(pos_="PUNCT" if word.endswith(".") else "NOUN")
+            for word in text.split()
+        ]
+
+    def pipe(self, texts, batch_size, n_process):
+        texts = list(texts)
+        self.pipe_calls.append((texts, batch_size, n_process))
+
+        return (self(text) for text in texts)
+
+
+class TestPOS2GramCounter:
+    def test_pos2gram_counter_should_count_tagged_bigrams(self):
+        pos2gram_counter = POS2GramCounter()
+
+        features = pos2gram_counter(
+            [
+                TaggedSegment("The dog ran.", ["DET", "NOUN", "VERB", "PUNCT"]),
+                TaggedSegment("Run run run", ["VERB", "VERB", "VERB"]),
+                TaggedSegment("Hi", ["INTJ"]),
+            ]
+        )
+
+        expected_features = np.zeros([3, len(posVector) ** 2])
+        expected_features[0, bigram_column("DET", "NOUN")] = 1.0
+        expected_features[0, bigram_column("NOUN", "VERB")] = 1.0
+        expected_features[0, bigram_column("VERB", "PUNCT")] = 1.0
+        expected_features[1, bigram_column("VERB", "VERB")] = 2.0
+
+        assert tutils.npequal(features, expected_features)
+        assert features.dtype == float
+
+    def test_pos2gram_counter_should_pipe_untagged_segments_in_one_batch(self):
+        nlp = MockNLP()
+        pos2gram_counter = POS2GramCounter(nlp=nlp, batch_size=7, n_process=2)
+
+        segments = pd.DataFrame(
+            ["one two three.", "four five", "six."],
+            columns=["text"],
+            index=pd.MultiIndex.from_tuples([(0, 0), (0, 1), (1, 0)]),
+        )
+
+        features = pos2gram_counter(segments)
+
+        expected_features = np.zeros([3, len(posVector) ** 2])
+        expected_features[0, bigram_column("NOUN", "NOUN")] = 1.0
+        expected_features[0, bigram_column("NOUN", "PUNCT")] = 1.0
+        expected_features[1, bigram_column("NOUN", "NOUN")] = 1.0
+
+        assert tutils.npequal(features.to_numpy(), expected_features)
+        assert features.index.equals(segments.index)
+        assert nlp.pipe_calls == [(["one two three.", "four five", "six."], 7, 2)]
+
+    def test_pos2gram_counter_should_only_extract_best_bigrams(self):
+        pos2gram_counter = POS2GramCounter(best=5)
+        all_pos2gram_counter = POS2GramCounter()
+
+        segments = [
+            TaggedSegment("", []),
+            TaggedSegment("a b c d", ["DET", "NOUN", "DET", "NOUN"]),
+            TaggedSegment("a b c", ["PRON", "VERB", "ADV"]),
+        ]
+
+        features = pos2gram_counter(segments)
+        all_features = all_pos2gram_counter(segments)
+
+        assert features.shape == (3, 5)
+        assert tutils.npequal(features, all_features[:, pos2gram_counter._columns])
@@ -1,5 +1,7 @@
-from notebooks.profiles import EuclideanProfile
+from notebooks.profiles import EuclideanProfile, VotingProfile, NaiveBayesProfile
+from notebooks.structures import PaddedArray, RaggedArray
 import numpy as np
+import pandas as pd
 import pytest
 from tests import tutils
 
@@ -57,3 +59,95 @@ class TestBaseProfile:
         profile = EuclideanProfile()
         with pytest.raises(AssertionError):
             _ = profile.distances(suspect_text)
+
+
+class TestArrayInput:
+    profile_types = [EuclideanProfile, lambda: VotingProfile(p=0.7), NaiveBayesProfile]
+
+    author_text = np.random.default_rng(0).normal(size=[40, 5])
+    suspect_arrays = [
+        np.random.default_rng(length).normal(size=[length, 5])
+        for length in [3, 7, 1, 12]
+    ]
+
+    @staticmethod
+    def _frame(arrays):
+        index = [
+            (text, row)
+            for text, array in enumerate(arrays)
+            for row in range(len(array))
+        ]
+        return pd.DataFrame(
+            np.concatenate(arrays), index=pd.MultiIndex.from_tuples(index)
+        )
+
+    @pytest.mark.parametrize("profile_type", profile_types)
+    def test_padded_array_distances_should_match_dataframe_distances(
+        self, profile_type
+    ):
+        profile = profile_type()
+        profile.feed(self.author_text)
+
+        distances = profile.distances(PaddedArray(self.suspect_arrays))
+        expected_distances = profile.distances(self._frame(self.suspect_arrays))
+
+        assert isinstance(distances, np.ndarray)
+        assert tutils.npclose(distances, np.ravel(expected_distances))
+
+    @pytest.mark.parametrize("profile_type", profile_types)
+    def test_ragged_array_distances_should_match_padded_array_distances(
+        self, profile_type
+    ):
+        profile = profile_type()
+        profile.feed(
+            RaggedArray.from_arrays([self.author_text[:10], self.author_text[10:]])
+        )
+
+        distances = profile.distances(RaggedArray.from_arrays(self.suspect_arrays))
+        expected_distances = profile.distances(PaddedArray(self.suspect_arrays))
+
+        assert tutils.npclose(distances, expected_distances)
+
+    @pytest.mark.parametrize("profile_type", profile_types)
+    def test_single_text_distance_should_be_a_number(self, profile_type):
+        profile = profile_type()
+        profile.feed(self._frame([self.author_text]))
+
+        distance = profile.distances(self.suspect_arrays[1])
+        expected_distance = profile.distances(self._frame(self.suspect_arrays[1:2]))
+
+        assert np.ndim(distance) == 0
+        assert tutils.npclose(float(distance), float(np.ravel(expected_distance)[0]))
+
+
+class TestDtype:
+    profile_types = [EuclideanProfile, lambda **kwargs: VotingProfile(p=0.7, **kwargs)]
+
+    author_text = np.random.default_rng(0).normal(size=[40, 5])
+    suspect_texts = PaddedArray(
+        [
+            np.random.default_rng(length).normal(size=[length, 5])
+            for length in [3, 7, 12]
+        ]
+    )
+
+    @pytest.mark.parametrize("profile_type", profile_types)
+    def test_float32_distances_should_match_float64_distances(self, profile_type):
+        profile = profile_type(dtype=np.float64)
+        profile.feed(self.author_text)
+        float32_profile = profile_type(dtype=np.float32)
+        float32_profile.feed(self.author_text)
+
+        distances = float32_profile.distances(self.suspect_texts)
+
+        assert float32_profile._mean.dtype == np.float32
+        assert tutils.npclose(distances, profile.distances(self.suspect_texts))
+
+    def test_loaded_profile_should_convert_to_its_dtype(self):
+        profile = VotingProfile(p=0.7)
+        profile.feed(self.author_text)
+
+        loaded_profile = VotingProfile(bytesIO=profile.binary, dtype=np.float32)
+
+        assert loaded_profile._author_sentences.dtype == np.float32
+        assert loaded_profile.nbytes == profile.nbytes // 2
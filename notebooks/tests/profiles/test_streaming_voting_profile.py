@@ -0,0 +1,82 @@
+from notebooks.profiles import VotingProfile, StreamingVotingProfile
+import numpy as np
+from tests import tutils
+
+
+class TestStreamingVotingProfile:
+    def test_single_feed_should_match_voting_profile(self):
+        rng = np.random.default_rng(0)
+        author_text = rng.normal(size=[120, 15])
+        suspect_texts = rng.normal(size=[4, 30, 15]) + np.arange(4)[:, None, None]
+
+        profile = VotingProfile(p=0.7)
+        streaming_profile = StreamingVotingProfile(p=0.7)
+        profile.feed(author_text)
+        streaming_profile.feed(author_text)
+
+        assert tutils.npclose(
+            streaming_profile.distances(suspect_texts),
+            profile.distances(suspect_texts),
+        )
+
+    def test_many_feeds_should_stay_close_to_voting_profile(self):
+        rng = np.random.default_rng(1)
+        suspect_texts = rng.normal(size=[6, 40, 15]) + 0.3 * np.arange(6)[:, None, None]
+
+        profile = VotingProfile(p=0.7)
+        streaming_profile = StreamingVotingProfile(p=0.7)
+        for _ in range(40):
+            author_text = rng.normal(size=[rng.integers(20, 80), 15])
+            profile.feed(author_text)
+            streaming_profile.feed(author_text)
+
+        distances = profile.distances(suspect_texts)
+        streaming_distances = streaming_profile.distances(suspect_texts)
+
+        assert np.max(np.abs(streaming_distances - distances)) <= 0.05
+
+    def test_first_feed_of_one_sentence_should_not_spoil_the_threshold(self):
+        rng = np.random.default_rng(4)
+        suspect_text = rng.normal(size=[30, 15])
+
+        profile = StreamingVotingProfile(p=0.7)
+        profile.feed(rng.normal(size=[1, 15]))
+
+        assert not np.any(profile.sentence_flags(suspect_text))
+
+        profile.feed(rng.normal(size=[100, 15]))
+
+        assert np.isfinite(profile._threshold)
+        assert profile._sketch.count == 100
+        assert np.any(profile.sentence_flags(suspect_text * 3))
+
+    def test_binary_should_be_smaller_than_voting_profile(self):
+        rng = np.random.default_rng(2)
+        profile = VotingProfile(p=0.7)
+        streaming_profile = StreamingVotingProfile(p=0.7)
+
+        for _ in range(50):
+            author_text = rng.normal(size=[50, 15])
+            profile.feed(author_text)
+            streaming_profile.feed(author_text)
+
+        size = len(profile.binary.getvalue())
+        streaming_size = len(streaming_profile.binary.getvalue())
+
+        assert streaming_size * 10 < size
+
+    def test_profile_should_load_from_binary(self):
+        rng = np.random.default_rng(3)
+        suspect_text = rng.normal(size=[30, 15])
+
+        profile = StreamingVotingProfile(p=0.7)
+        profile.feed(rng.normal(size=[500, 15]))
+        loaded_profile = StreamingVotingProfile(bytesIO=profile.binary)
+
+        assert tutils.npclose(
+            loaded_profile.distances(suspect_text), profile.distances(suspect_text)
+        )
+        assert tutils.npequal(
+            loaded_profile.sentence_flags(suspect_text),
+            profile.sentence_flags(suspect_text),
+        )
@@ -1,6 +1,8 @@
 from notebooks.profiles import VotingProfile
 import pytest
 import pandas as pd
+import numpy as np
+from tests import tutils
 
 
 class TestVotingProfile:
@@ -31,3 +33,20 @@ class TestVotingProfile:
 
         profile.feed(author_text)
         distances = profile.distances(suspect_text)
+
+    def test_voting_profile_should_threshold_on_leave_one_out_distances(self):
+        profile = VotingProfile(p=0.7)
+
+        # The leave one out distances are 3.0, 0.0 and 3.0, so the threshold is 3.0.
+        profile.feed(np.array([[0.0, 0.0], [2.0, 0.0], [4.0, 0.0]]))
+        distance = profile.distances(np.array([[2.0, 0.0], [5.5, 0.0], [-1.5, 0.0]]))
+
+        assert tutils.npclose(float(distance), 2.0 / 3.0)
+
+    def test_nbytes_should_count_the_author_sentences(self):
+        profile = VotingProfile(p=0.7)
+
+        profile.feed(np.zeros([10, 4]))
+        profile.feed(np.zeros([5, 4]))
+
+        assert profile.nbytes == (15 * 4 + 4) * 8
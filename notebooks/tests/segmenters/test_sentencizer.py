@@ -1,4 +1,6 @@
-from notebooks.segmenters import Sentencizer
+import spacy
+
+from notebooks.segmenters import Sentencizer, TaggedSegment
 
 
 class TestSentencizer:
@@ -18,3 +20,59 @@ class TestSentencizer:
             "But because he was square, he lost out on four awesome chicks.",
             "So he cried his way home, and by the end of the night, it was 2 a.m.",
         ]
+
+    def test_tagging_sentencizer_should_tag_from_a_single_parse(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        calls = []
+
+        def tracked_nlp(text):
+            calls.append(text)
+            return nlp(text)
+
+        sentencizer = Sentencizer(nlp=tracked_nlp, tag=True)
+
+        sentences = sentencizer("I am sentence one. I am two.")
+
+        assert sentences == ["I am sentence one.", "I am two."]
+        assert all(isinstance(sentence, TaggedSegment) for sentence in sentences)
+        assert [len(sentence.pos_tags) for sentence in sentences] == [5, 4]
+        assert len(calls) == 1
+
+    def test_pipe_should_split_each_text(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+
+        sentencizer = Sentencizer(nlp=nlp, tag=True)
+
+        sentence_lists = list(sentencizer.pipe(["One. Two.", "Three."]))
+
+        assert sentence_lists == [["One.", "Two."], ["Three."]]
+        assert all(
+            isinstance(sentence, TaggedSegment)
+            for sentences in sentence_lists
+            for sentence in sentences
+        )
+
+    def test_sentences_should_be_split_at_boundaries(self):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        text = "Introduction\nThe essay is here. It ends\nNext para."
+
+        sentencizer = Sentencizer(nlp=nlp, tag=True)
+
+        sentences = sentencizer(text, boundaries=[0, 13, 40])
+        sentence_lists = list(
+            sentencizer.pipe([text, text], boundaries=[[0, 13], None])
+        )
+
+        assert sentences == [
+            "Introduction",
+            "The essay is here.",
+            "It ends",
+            "Next para.",
+        ]
+        assert [sentence.start for sentence in sentences] == [0, 13, 32, 40]
+        assert all(text[s.start :].startswith(s) for s in sentences)
+        assert sentence_lists[0] == sentences[:2] + ["It ends\nNext para."]
+        assert len(sentence_lists[1]) == 2
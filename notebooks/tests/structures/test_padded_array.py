@@ -1,6 +1,7 @@
 from notebooks.structures import (
     PaddedArray,
     padded_mean,
+    segment_mean,
     EmptyListException,
     EmptyArrayException,
 )
@@ -86,6 +87,45 @@ class TestPaddedArray:
 
         assert np.array_equal(padded_array.lengths, expected_lengths)
 
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_padded_data_should_have_the_given_dtype(self, dtype):
+        padded_array = PaddedArray(self.array_sets[1], dtype=dtype)
+
+        assert padded_array.data.dtype == dtype
+        assert np.array_equal(padded_array.data, self.expected_data_set[1])
+
+
+class TestFromRagged:
+    values = np.arange(24, dtype=float).reshape(8, 3)
+
+    offset_sets = [np.array([0, 8]), np.array([0, 2, 3, 8]), np.array([1, 4, 6])]
+
+    @pytest.mark.parametrize("offsets", offset_sets)
+    def test_from_ragged_should_match_padding_the_split_arrays(self, offsets):
+        arrays = [self.values[start:end] for start, end in zip(offsets, offsets[1:])]
+
+        padded_array = PaddedArray.from_ragged(self.values, offsets)
+        expected = PaddedArray(arrays)
+
+        assert np.array_equal(padded_array.data, expected.data)
+        assert np.array_equal(padded_array.lengths, expected.lengths)
+        assert np.array_equal(padded_array.offsets, expected.offsets)
+        assert np.array_equal(padded_array.values, expected.values)
+
+    def test_from_ragged_should_not_pad_until_data_is_used(self):
+        padded_array = PaddedArray.from_ragged(self.values, self.offset_sets[1])
+
+        assert padded_array._data is None
+        assert np.shares_memory(padded_array.values, self.values)
+        assert tutils.npequal(
+            padded_mean(padded_array), segment_mean(self.values, self.offset_sets[1])
+        )
+        assert padded_array._data is None
+
+    def test_from_ragged_should_not_accept_empty_arrays(self):
+        with pytest.raises(EmptyArrayException):
+            _ = PaddedArray.from_ragged(self.values, np.array([0, 3, 3, 8]))
+
 
 # TODO: In the case of non-padded numpy arrays the dimensions should be asserted.
 class TestPaddedArrayEdgeCases:
@@ -129,3 +169,28 @@ class TestPaddedMean:
         means = padded_mean(padded_array)
 
         assert tutils.npclose(means, expected_means)
+
+
+class TestSegmentMean:
+    value_sets = [
+        np.array([[4.0, -5.0], [2.0, 2.0], [1.0, 2.0], [3.0, 4.0], [2.0, 0.0]]),
+        np.array([1.0, 0.0, 1.0, 1.0]),
+    ]
+
+    offset_sets = [np.array([0, 2, 5]), np.array([0, 1, 4])]
+
+    expected_mean_sets = [
+        np.array([[3.0, -1.5], [2.0, 2.0]]),
+        np.array([1.0, 0.6667]),
+    ]
+
+    @pytest.mark.parametrize(
+        "values, offsets, expected_means",
+        zip(value_sets, offset_sets, expected_mean_sets),
+    )
+    def test_segment_mean_gives_mean_of_each_segment(
+        self, values, offsets, expected_means
+    ):
+        means = segment_mean(values, offsets)
+
+        assert tutils.npclose(means, expected_means)
@@ -0,0 +1,41 @@
+from notebooks.structures import QuantileSketch
+import numpy as np
+import math
+import pytest
+
+
+class TestQuantileSketch:
+    @pytest.mark.parametrize("q", [0.0, 0.25, 0.7, 0.99])
+    def test_quantiles_should_be_exact_under_capacity(self, q):
+        values = np.random.default_rng(0).normal(size=150)
+        sketch = QuantileSketch(k=200)
+
+        sketch.update(values[:100])
+        sketch.update(values[100:])
+
+        assert sketch.quantile(q) == np.sort(values)[math.floor(150 * q)]
+
+    @pytest.mark.parametrize("q", [0.1, 0.5, 0.7, 0.9])
+    def test_quantile_ranks_should_be_close_over_capacity(self, q):
+        values = np.random.default_rng(1).gamma(2.0, size=20000)
+        sketch = QuantileSketch(k=200)
+
+        for chunk in np.array_split(values, 50):
+            sketch.update(chunk)
+
+        rank = np.searchsorted(np.sort(values), sketch.quantile(q)) / len(values)
+
+        assert sketch.count == len(values)
+        assert abs(rank - q) < 0.01
+        assert sum(len(level) for level in sketch._levels) < 400
+
+    def test_merged_sketches_should_count_both_streams(self):
+        rng = np.random.default_rng(2)
+        first, second = QuantileSketch(k=50), QuantileSketch(k=50)
+
+        first.update(rng.uniform(0.0, 1.0, size=1000))
+        second.update(rng.uniform(1.0, 2.0, size=1000))
+        first.merge(second)
+
+        assert first.count == 2000
+        assert abs(first.quantile(0.5) - 1.0) < 0.05
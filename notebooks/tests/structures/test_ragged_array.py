@@ -0,0 +1,112 @@
+from notebooks.structures import (
+    RaggedArray,
+    segment_sum,
+    segment_mean,
+    segment_var,
+    segment_norm,
+)
+from tests import tutils
+import numpy as np
+import pytest
+
+
+class TestSegmentReductions:
+    arrays = [
+        np.array([[4.0, -5.0], [2.0, 2.0]]),
+        np.zeros([0, 2]),
+        np.array([[1.0, 2.0], [3.0, 4.0], [2.0, 0.0]]),
+        np.array([[-1.5, 0.5]]),
+    ]
+    values = np.concatenate(arrays)
+    offsets = np.array([0, 2, 2, 5, 6])
+
+    @pytest.mark.parametrize(
+        "reduction, expected_reduction",
+        [
+            (segment_sum, lambda array: np.sum(array, axis=0)),
+            (segment_mean, lambda array: np.mean(array, axis=0)),
+            (segment_var, lambda array: np.var(array, axis=0)),
+            (segment_norm, lambda array: np.linalg.norm(array, axis=0)),
+        ],
+    )
+    def test_reductions_should_match_reducing_each_segment(
+        self, reduction, expected_reduction
+    ):
+        filled = [0, 2, 3]
+
+        with np.errstate(invalid="ignore"):
+            reduced = reduction(self.values, self.offsets)
+
+        assert reduced.shape == (4, 2)
+        assert tutils.npclose(
+            reduced[filled],
+            np.array([expected_reduction(self.arrays[i]) for i in filled]),
+        )
+
+    def test_empty_segments_should_sum_to_zero(self):
+        sums = segment_sum(self.values, np.array([0, 0, 2, 2, 6, 6]))
+
+        assert tutils.npequal(sums[[0, 2, 4]], np.zeros([3, 2]))
+        assert tutils.npequal(sums[[1, 3]], [[6.0, -3.0], [4.5, 6.5]])
+
+    def test_var_should_use_delta_degrees_of_freedom(self):
+        var = segment_var(self.values, np.array([0, 2, 6]), ddof=1)
+
+        assert tutils.npclose(var, np.array([[2.0, 24.5], [3.7292, 3.2292]]))
+
+
+class TestRaggedArray:
+    arrays = [
+        np.arange(6.0).reshape(3, 2),
+        np.ones([1, 2]),
+        -np.arange(4.0).reshape(2, 2),
+    ]
+
+    @pytest.mark.parametrize(
+        "index, expected_ids",
+        [
+            (slice(1, None), [1, 2]),
+            (slice(None, None, -1), [2, 1, 0]),
+            (slice(2, 1), []),
+            ([2, 0], [2, 0]),
+            (np.array([True, False, True]), [0, 2]),
+        ],
+    )
+    def test_indexing_should_choose_arrays(self, index, expected_ids):
+        ragged_array = RaggedArray.from_arrays(self.arrays)
+
+        chosen = ragged_array[index]
+
+        assert isinstance(chosen, RaggedArray)
+        assert len(chosen) == len(expected_ids)
+        for array, i in zip(chosen, expected_ids):
+            assert tutils.npequal(array, self.arrays[i])
+
+    def test_integer_index_should_give_a_view_of_the_array(self):
+        ragged_array = RaggedArray.from_arrays(self.arrays)
+
+        assert tutils.npequal(ragged_array[-1], self.arrays[2])
+        assert np.shares_memory(ragged_array[0], ragged_array.values)
+        with pytest.raises(IndexError):
+            _ = ragged_array[3]
+
+    def test_slices_should_be_views_with_offsets_from_zero(self):
+        ragged_array = RaggedArray.from_arrays(self.arrays)
+
+        sliced = ragged_array[1:]
+
+        assert tutils.npequal(sliced.offsets, [0, 1, 3])
+        assert np.shares_memory(sliced.values, ragged_array.values)
+        assert tutils.npequal(sliced.mean(), ragged_array.mean()[1:])
+
+    def test_ragged_array_should_load_from_its_binary(self):
+        ragged_array = RaggedArray.from_arrays(self.arrays)[1:]
+
+        loaded = RaggedArray.from_binary(ragged_array.binary)
+
+        assert tutils.npequal(loaded.values, ragged_array.values)
+        assert tutils.npequal(loaded.offsets, ragged_array.offsets)
+
+    def test_decreasing_offsets_should_not_be_accepted(self):
+        with pytest.raises(ValueError):
+            _ = RaggedArray(np.zeros([4, 2]), np.array([0, 3, 2, 4]))
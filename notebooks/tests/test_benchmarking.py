@@ -64,3 +64,15 @@ class TestBalancedAccuracy:
         accuracy = bench.balanced_accuracy(guesses, labels)
 
         assert accuracy == expected_accuracy
+
+
+class TestCutoffCounts:
+    def test_cutoff_counts_should_count_each_cutoff(self):
+        sorted_labels = np.array([False, True, False, True])
+
+        counts = bench.cutoff_counts(sorted_labels)
+
+        assert np.array_equal(
+            counts,
+            [[2, 2, 1, 1, 0], [2, 1, 1, 0, 0], [0, 1, 1, 2, 2], [0, 0, 1, 1, 2]],
+        )
@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# The longest a cold import of the backend-facing API may take, in seconds. This is
+# mostly numpy, and is generous so that it only fails when something heavy sneaks in.
+IMPORT_BUDGET = 1.5
+
+HEAVY_MODULES = ["spacy", "torch", "torchtext", "pandas", "scipy", "pkg_resources"]
+
+IMPORT_SCRIPT = f"""
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from notebooks import StyleProfile, PreprocessedText, TextProcessor
+elapsed = time.perf_counter() - start
+
+heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+@pytest.fixture(scope="module")
+def cold_import():
+    # A fresh interpreter, since this one has already imported everything.
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output.splitlines()[-1])
+
+
+class TestImportTime:
+    def test_public_api_should_not_import_heavy_dependencies(self, cold_import):
+        assert cold_import["heavy"] == []
+
+    def test_public_api_should_import_within_budget(self, cold_import):
+        assert cold_import["elapsed"] < IMPORT_BUDGET
+
+    @pytest.mark.parametrize(
+        "module", ["notebooks.profiles", "notebooks.serialization", "notebooks.utils"]
+    )
+    def test_submodules_should_import_first(self, module):
+        # Submodules that import from the package must not go through the lazy
+        # public API while it is still being imported.
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
@@ -0,0 +1,160 @@
+import docx
+import pytest
+from docx.oxml import OxmlElement
+
+from notebooks.reconstruction import (
+    DocumentText,
+    WordReconstructable,
+    annotate_paragraphs,
+    merge_runs,
+    HIGHLIGHT_COLOR,
+)
+from tests import tutils
+
+
+class TestAnnotateParagraphs:
+    paragraphs = {0: "One. Two. Three.", 1: "", 2: "Four five. Six"}
+    sentences = ["One.", "Two.", "Three.Four five.", "Six"]
+
+    @pytest.mark.parametrize(
+        "flags, expected",
+        [
+            (
+                [False, True, True, False],
+                {
+                    0: [("One. ", False), ("Two. Three.", True)],
+                    1: [],
+                    2: [("Four five. ", True), ("Six", False)],
+                },
+            ),
+            (
+                [True, True, True, True],
+                {0: [("One. Two. Three.", True)], 1: [], 2: [("Four five. Six", True)]},
+            ),
+        ],
+    )
+    def test_flags_should_map_onto_the_paragraphs(self, flags, expected):
+        annotated = annotate_paragraphs(self.paragraphs, self.sentences, flags)
+
+        assert annotated == expected
+
+    def test_pieces_should_add_up_to_the_paragraphs_with_a_separator(self):
+        sentences = ["One.", "Two.", "Three.", "Four five.", "Six"]
+
+        annotated = annotate_paragraphs(
+            self.paragraphs, sentences, [True, False, True, False, True], separator="\n"
+        )
+
+        assert annotated[0] == [("One. ", True), ("Two. ", False), ("Three.", True)]
+        for key, paragraph in self.paragraphs.items():
+            assert "".join(text for text, _ in annotated[key]) == paragraph
+
+    def test_missing_sentences_should_be_left_out(self):
+        annotated = annotate_paragraphs(
+            {0: "One. Two."}, ["One.", "Missing.", "Two."], [True, False, False]
+        )
+
+        assert annotated == {0: [("One. ", True), ("Two.", False)]}
+
+    def test_starts_should_be_used_instead_of_searching(self):
+        # "Two." appears in the first paragraph as well, and would be found there.
+        paragraphs = {0: "Two. One.", 1: "Two."}
+
+        annotated = annotate_paragraphs(
+            paragraphs,
+            ["Two.", "One.", "Two."],
+            [False, False, True],
+            separator="\n",
+            starts=[0, 5, 10],
+        )
+
+        assert annotated == {0: [("Two. One.", False)], 1: [("Two.", True)]}
+
+
+class TestDocumentText:
+    def test_paragraphs_should_be_joined_with_their_offsets(self):
+        document = docx.Document()
+        for text in ["One. Two.", "", "Three."]:
+            document.add_paragraph(text)
+
+        document_text = DocumentText(document)
+
+        assert document_text.text == "One. Two.\n\nThree."
+        assert tutils.npequal(document_text.paragraph_starts, [0, 10, 11])
+        assert tutils.npequal(
+            document_text.paragraphs_of([0, 9, 10, 11, 16]), [0, 0, 1, 2, 2]
+        )
+
+    def test_empty_document_should_have_no_paragraphs(self):
+        document_text = DocumentText(docx.Document(), separator="")
+
+        assert document_text.text == ""
+        assert len(document_text.paragraph_starts) == 0
+
+
+class TestWordReconstructable:
+    def test_highlight_should_write_a_run_for_each_stretch_of_flags(self):
+        document = docx.Document()
+        for text in ["One. Two. Three.", "Four."]:
+            document.add_paragraph(text)
+        reconstructable = WordReconstructable(document)
+
+        reconstructable.highlight(
+            {0: [("One. ", False), ("Two. ", True), ("Three.", True)]}
+        )
+
+        runs = document.paragraphs[0].runs
+        assert [run.text for run in runs] == ["One. ", "Two. Three."]
+        assert [run.font.highlight_color for run in runs] == [None, HIGHLIGHT_COLOR]
+        assert reconstructable.paragraphs == {0: "One. Two. Three.", 1: "Four."}
+        assert reconstructable.keys == [0, 1]
+
+    def test_highlight_should_keep_the_formatting_and_hyperlinks_of_runs(self):
+        document = docx.Document()
+        paragraph = document.add_paragraph("Hello ")
+        paragraph.add_run("bold part.").bold = True
+        paragraph.add_run(" ")
+        hyperlink = OxmlElement("w:hyperlink")
+        hyperlink_run = OxmlElement("w:r")
+        hyperlink_text = OxmlElement("w:t")
+        hyperlink_text.text = "Link text."
+        hyperlink_run.append(hyperlink_text)
+        hyperlink.append(hyperlink_run)
+        paragraph._p.append(hyperlink)
+        paragraph.add_run(" After.").italic = True
+        text = document.paragraphs[0].text
+        reconstructable = WordReconstructable(document)
+
+        reconstructable.highlight(
+            annotate_paragraphs(
+                reconstructable.paragraphs,
+                ["Hello bold part.", "Link text.", "After."],
+                [True, False, True],
+            )
+        )
+
+        paragraph = document.paragraphs[0]
+        runs = paragraph.runs
+        assert paragraph.text == text
+        assert [run.text for run in runs] == [
+            "Hello ",
+            "bold part.",
+            " ",
+            " ",
+            "After.",
+        ]
+        assert [run.font.highlight_color for run in runs] == [
+            HIGHLIGHT_COLOR,
+            HIGHLIGHT_COLOR,
+            HIGHLIGHT_COLOR,
+            None,
+            HIGHLIGHT_COLOR,
+        ]
+        assert [run.bold for run in runs] == [None, True, None, None, None]
+        assert [run.italic for run in runs] == [None, None, None, True, True]
+        assert paragraph._p.xpath("./w:hyperlink/w:r/w:t")[0].text == "Link text."
+
+    def test_merge_runs_should_join_equal_neighbours(self):
+        merged = merge_runs([("a", 1), ("b", 1), ("c", 0), ("d", 1)])
+
+        assert merged == [("ab", True), ("c", False), ("d", True)]
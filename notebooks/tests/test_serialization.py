@@ -0,0 +1,135 @@
+import pickle
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from notebooks import serialization, PreprocessedText
+from notebooks.profiles import EuclideanProfile, VotingProfile, StreamingVotingProfile
+from tests import tutils
+
+
+class TestSerialization:
+    fields = [
+        {"none": None, "int": -3, "float": 0.25, "str": "ünïcode"},
+        {"strings": ["a", "", "sentence with ✓"], "empty": []},
+        {
+            "matrix": np.arange(12, dtype=np.float32).reshape(3, 4),
+            "empty": np.zeros([0, 5]),
+            "ints": np.arange(7),
+        },
+    ]
+
+    @pytest.mark.parametrize("fields", fields)
+    def test_loads_should_give_back_the_dumped_fields(self, fields):
+        loaded = serialization.loads(serialization.dumps("Kind", fields))
+
+        assert loaded.keys() == fields.keys()
+        for name, value in fields.items():
+            if isinstance(value, np.ndarray):
+                assert loaded[name].dtype == value.dtype
+                assert tutils.npequal(loaded[name], value)
+            else:
+                assert loaded[name] == value
+
+    def test_arrays_should_be_aligned_views_of_the_buffer(self):
+        buffer = serialization.dumps(
+            "Kind", {"s": "odd", "a": np.arange(5, dtype=np.float64)}
+        )
+
+        array = serialization.loads(buffer)["a"]
+
+        assert array.ctypes.data % 8 == 0
+        assert not array.flags.owndata
+        assert not array.flags.writeable
+
+    def test_loads_should_check_the_kind(self):
+        buffer = serialization.dumps("Kind", {})
+
+        assert serialization.kind_of(buffer) == "Kind"
+        with pytest.raises(serialization.SerializationError):
+            serialization.loads(buffer, kind="OtherKind")
+
+    def test_pickles_should_not_be_serialized(self):
+        assert not serialization.is_serialized(pickle.dumps({"mean": None}))
+        assert serialization.is_serialized(serialization.dumps("Kind", {}))
+
+    def test_as_buffer_should_skip_what_was_read(self):
+        data = BytesIO(b"abcdef")
+        data.read(2)
+
+        assert serialization.as_buffer(data) == b"cdef"
+
+
+class TestBinaries:
+    rng = np.random.default_rng(0)
+    author = rng.normal(size=[40, 6])
+    suspect = rng.normal(size=[10, 6])
+
+    @pytest.mark.parametrize(
+        "profile_class, make_profile",
+        [
+            (EuclideanProfile, lambda: EuclideanProfile()),
+            (VotingProfile, lambda: VotingProfile(p=0.7)),
+            (StreamingVotingProfile, lambda: StreamingVotingProfile(p=0.7, k=8)),
+        ],
+    )
+    def test_profiles_should_load_from_their_binary(self, profile_class, make_profile):
+        profile = make_profile()
+        profile.feed(self.author)
+
+        loaded_profile = profile_class(bytesIO=profile.binary)
+
+        assert tutils.npclose(
+            loaded_profile.distances(self.suspect), profile.distances(self.suspect)
+        )
+
+        # A loaded profile can still be fed.
+        profile.feed(self.suspect)
+        loaded_profile.feed(self.suspect)
+
+        assert tutils.npclose(
+            loaded_profile.distances(self.author), profile.distances(self.author)
+        )
+
+    def test_empty_profile_should_load_from_its_binary(self):
+        profile = VotingProfile(bytesIO=VotingProfile(p=0.7).binary, p=0.7)
+
+        assert profile._p == 0.7
+        assert profile._mean is None
+
+    def test_preprocessed_text_should_load_from_its_binary(self):
+        text = PreprocessedText(self.author, [f"sentence {i}" for i in range(40)])
+
+        loaded_text = PreprocessedText(text.binary.getvalue())
+
+        assert loaded_text.sentences == text.sentences
+        assert tutils.npclose(loaded_text.data, text.data)
+        assert loaded_text.sentence_starts is None
+
+    def test_sentence_starts_should_load_from_the_binary(self):
+        text = PreprocessedText(
+            self.suspect, ["a"] * 10, sentence_starts=range(0, 20, 2)
+        )
+
+        loaded_text = PreprocessedText(text.binary)
+
+        assert tutils.npequal(loaded_text.sentence_starts, np.arange(0, 20, 2))
+
+    def test_pickled_binaries_should_still_load(self):
+        data_bytes = BytesIO()
+        np.save(data_bytes, self.author)
+        mean_bytes = BytesIO()
+        np.save(mean_bytes, self.author.mean(axis=0))
+
+        text = PreprocessedText(
+            BytesIO(pickle.dumps({"data": data_bytes.getvalue(), "sentences": ["a"]}))
+        )
+        profile = EuclideanProfile(
+            BytesIO(pickle.dumps({"mean": mean_bytes.getvalue(), "count": 40}))
+        )
+
+        assert tutils.npequal(text.data, self.author)
+        assert text.sentences == ["a"]
+        assert tutils.npequal(profile._mean, self.author.mean(axis=0))
+        assert profile._count == 40
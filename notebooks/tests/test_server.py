@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from notebooks import PreprocessedText
+from notebooks.server import (
+    FeaturizationServer,
+    FeaturizationClient,
+    FeaturizationError,
+)
+from tests import tutils
+
+
+class StubProcessor:
+    """
+    Gives each text a single feature, its length, with its boundaries as the sentence
+    starts, and records the batches.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def batch(self, texts, boundaries=None):
+        self.release.wait()
+        self.batches.append(texts)
+
+        if "fail" in texts:
+            raise ValueError("cannot process")
+
+        return [
+            PreprocessedText(
+                np.array([[float(len(text))]]), [text], sentence_starts=text_boundaries
+            )
+            for text, text_boundaries in zip(texts, boundaries)
+        ]
+
+
+@pytest.fixture
+def served(tmp_path):
+    processor = StubProcessor()
+    path = str(tmp_path / "featurization.sock")
+    server = FeaturizationServer(path, processor=processor, max_wait=0.05)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield processor, FeaturizationClient(path, timeout=10)
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestFeaturizationServer:
+    def test_client_should_get_processed_text(self, served):
+        _, client = served
+
+        preprocessed_text = client("I am a text.")
+
+        assert tutils.npequal(preprocessed_text.data, np.array([[12.0]]))
+        assert preprocessed_text.sentences == ["I am a text."]
+        assert preprocessed_text.sentence_starts is None
+
+    def test_boundaries_should_reach_the_processor(self, served):
+        _, client = served
+
+        preprocessed_text = client("Fïrst.\nSecond.", boundaries=[0, 7])
+
+        assert tutils.npequal(preprocessed_text.sentence_starts, [0, 7])
+
+    def test_concurrent_texts_should_be_batched(self, served):
+        processor, client = served
+        texts = ["a" * length for length in range(1, 9)]
+
+        # Hold the processor so that every text is waiting by the time it is released.
+        processor.release.clear()
+        with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+            futures = [executor.submit(client, text) for text in texts]
+            threading.Timer(0.2, processor.release.set).start()
+            results = [future.result() for future in futures]
+
+        assert [result.sentences for result in results] == [[text] for text in texts]
+        assert len(processor.batches) < len(texts)
+
+    def test_processing_errors_should_reach_the_client(self, served):
+        _, client = served
+
+        with pytest.raises(FeaturizationError):
+            client("fail")
+
+        assert client("ok").sentences == ["ok"]
+
+    def test_failed_text_should_not_fail_its_batch(self, served):
+        processor, client = served
+        texts = ["one", "fail", "three"]
+
+        processor.release.clear()
+        with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+            futures = [executor.submit(client, text) for text in texts]
+            threading.Timer(0.2, processor.release.set).start()
+
+            assert futures[0].result().sentences == ["one"]
+            assert futures[2].result().sentences == ["three"]
+            with pytest.raises(FeaturizationError):
+                futures[1].result()
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from notebooks import StyleProfile, PreprocessedText, report_many, score_many
+
+
+class TestStyleProfile:
+    author_text = PreprocessedText(np.random.default_rng(0).normal(size=[60, 15]))
+    suspect_texts = [
+        PreprocessedText(
+            np.random.default_rng(1).normal(size=[20, 15]) + shift, ["sentence"] * 20
+        )
+        for shift in [0.0, 0.5, 3.0]
+    ]
+
+    @pytest.mark.parametrize("suspect_text", suspect_texts)
+    def test_report_should_match_separate_evaluations(self, suspect_text):
+        profile = StyleProfile()
+        profile.feed(self.author_text)
+
+        report = profile.report(suspect_text)
+
+        assert report["score"] == profile.score(suspect_text)
+        assert report["flag"] == profile.flag(suspect_text)
+        assert report["sentence_flags"] == profile.detailed(suspect_text)[0]
+
+    @pytest.mark.parametrize("suspect_text", suspect_texts)
+    def test_float32_report_should_match_float64_report(self, suspect_text):
+        profile = StyleProfile(dtype=np.float64)
+        profile.feed(self.author_text)
+        float32_profile = StyleProfile(dtype=np.float32)
+        float32_profile.feed(PreprocessedText(self.author_text.data, dtype=np.float32))
+
+        report = profile.report(suspect_text)
+        float32_report = float32_profile.report(
+            PreprocessedText(suspect_text.data, dtype=np.float32)
+        )
+
+        assert float32_report["score"] == pytest.approx(report["score"], abs=0.05)
+        assert float32_report["flag"] == report["flag"]
+
+    def test_profile_should_be_ready_once_fed(self):
+        profile = StyleProfile()
+        assert not profile.is_ready
+
+        profile.feed(self.author_text)
+        assert profile.is_ready
+        assert StyleProfile(profile.binary).is_ready
+
+
+class TestManyProfiles:
+    profiles = []
+    for seed in range(4):
+        profile = StyleProfile()
+        profile.feed(
+            PreprocessedText(np.random.default_rng(seed).normal(size=[30, 15]) + seed)
+        )
+        profiles.append(profile)
+
+    texts = [
+        PreprocessedText(
+            np.random.default_rng(10 + length).normal(size=[length, 15]) + shift,
+            ["sentence"] * length,
+        )
+        for length, shift in [(5, 0.0), (12, 1.0), (1, 2.0), (9, 0.5)]
+    ]
+
+    def test_report_many_should_match_separate_reports(self):
+        reports = report_many(self.profiles, self.texts)
+
+        assert reports == [
+            profile.report(text) for profile, text in zip(self.profiles, self.texts)
+        ]
+
+    def test_score_many_should_match_separate_scores(self):
+        scores = score_many(self.profiles[::-1], self.texts)
+
+        assert scores.tolist() == [
+            profile.score(text)
+            for profile, text in zip(self.profiles[::-1], self.texts)
+        ]
+
+    def test_no_texts_should_give_no_reports(self):
+        assert report_many([], []) == []
+        assert len(score_many([], [])) == 0
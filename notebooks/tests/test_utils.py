@@ -1,4 +1,5 @@
 import pytest
+import spacy
 import pandas as pd
 from notebooks import utils
 from tests import tutils
@@ -139,3 +140,42 @@ from tests import tutils
 # 
 #         assert tutils.npequal(author_texts, expected_author_texts)
 #         assert tutils.npequal(df, expected_dataframe)
+
+
+class TestLoadNLP:
+    @pytest.fixture
+    def loads(self, monkeypatch):
+        loads = []
+
+        def mock_load(model):
+            nlp = spacy.blank("en")
+            nlp.add_pipe("sentencizer")
+            nlp.add_pipe("sentencizer", name="senter")
+            nlp.disable_pipe("senter")
+            loads.append(model)
+            return nlp
+
+        monkeypatch.setattr(spacy, "load", mock_load)
+        monkeypatch.setattr(utils, "_nlp_registry", {})
+
+        return loads
+
+    def test_load_nlp_should_load_each_model_once(self, loads):
+        first = utils.load_nlp("fake_model")
+        second = utils.load_nlp("fake_model")
+
+        assert first is second
+        assert loads == ["fake_model"]
+
+    def test_load_nlp_should_key_by_components(self, loads):
+        full = utils.load_nlp("fake_model")
+        senter = utils.load_nlp("fake_model", components=["senter"])
+
+        assert full is not senter
+        assert utils.load_nlp("fake_model", components=("senter",)) is senter
+        assert loads == ["fake_model", "fake_model"]
+
+    def test_load_nlp_should_only_run_requested_components(self, loads):
+        nlp = utils.load_nlp("fake_model", components=["senter"])
+
+        assert nlp.pipe_names == ["senter"]
@@ -0,0 +1,31 @@
+from notebooks.thresholders import SimpleThresholder
+from notebooks import benchmarking as bench
+import pytest
+import numpy as np
+
+
+class TestSimpleThresholder:
+    score_funcs = [bench.correct_counts, bench.accuracies, bench.balanced_accuracies]
+
+    distance_sets = [
+        np.array([3.2, 5.8, 17.0, 200.11, 31.3, 15.2, 8.9, 49.2]),
+        np.array([2.0, 1.0, 2.0, 3.0, 1.0, 3.0, 3.0, 0.5]),
+        np.array([4.0, 4.0, 4.0, 4.0, 1.0]),
+    ]
+
+    label_sets = [
+        np.array([False, True, False, True, True, False, False, True]),
+        np.array([False, True, True, True, False, False, True, False]),
+        np.array([True, False, True, True, False]),
+    ]
+
+    @pytest.mark.parametrize("score_func", score_funcs)
+    @pytest.mark.parametrize("distances, labels", zip(distance_sets, label_sets))
+    def test_cutoff_scores_should_match_scoring_every_classification(
+        self, score_func, distances, labels
+    ):
+        # Wrapping the function hides its cutoff_scores attribute.
+        slow_thresholder = SimpleThresholder(lambda *args: score_func(*args))
+        thresholder = SimpleThresholder(score_func)
+
+        assert thresholder(distances, labels) == slow_thresholder(distances, labels)